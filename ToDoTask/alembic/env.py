@@ -19,6 +19,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from database.models.base import ExtendedBase
+from database.models import users, todos  # noqa: F401
 target_metadata = ExtendedBase.metadata
 
 
@@ -0,0 +1,47 @@
+"""todos
+
+Revision ID: 8f3a2c71d5e9
+Revises: 561bcf125c84
+Create Date: 2025-05-28 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a2c71d5e9'
+down_revision: Union[str, None] = '561bcf125c84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('todos',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('is_done', sa.Boolean(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_todos_id'), 'todos', ['id'], unique=False)
+    op.create_index('ix_todos_owner_id_is_done_due_date_id', 'todos',
+                    ['owner_id', 'is_done', 'due_date', 'id'], unique=False)
+    op.create_index('ix_todos_owner_id_due_date_id', 'todos',
+                    ['owner_id', 'due_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_owner_id_due_date_id', table_name='todos')
+    op.drop_index('ix_todos_owner_id_is_done_due_date_id', table_name='todos')
+    op.drop_index(op.f('ix_todos_id'), table_name='todos')
+    op.drop_table('todos')
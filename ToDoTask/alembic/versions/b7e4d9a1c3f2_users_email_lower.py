@@ -0,0 +1,33 @@
+"""users email lower
+
+Revision ID: b7e4d9a1c3f2
+Revises: 8f3a2c71d5e9
+Create Date: 2025-06-02 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d9a1c3f2'
+down_revision: Union[str, None] = '8f3a2c71d5e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Создание индекса упадёт, если уже есть email, отличающиеся только регистром:
+    # такие дубликаты нужно разрешить вручную
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.drop_constraint('users_email_key', 'users', type_='unique')
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('users_email_key', 'users', ['email'])
+    op.drop_index('ix_users_email_lower', table_name='users')
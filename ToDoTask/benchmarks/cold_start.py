@@ -0,0 +1,150 @@
+"""Бенчмарк холодного старта воркера.
+
+Каждый замер выполняется в новом процессе, как после выкатки: процесс
+импортирует fast:app, проходит lifespan и сразу получает запросы через
+ASGITransport. Замеряются:
+- import_seconds: импорт приложения;
+- startup_seconds: lifespan до приёма запросов (с прогревом или без);
+- first_response_seconds: первый запрос (вход пользователя);
+- time_to_first_response_seconds: от начала импорта до ответа на первый запрос;
+- first_requests_*_ms: задержки следующих --requests запросов
+  (/auth/me, /todos, /todos/{id}) с перцентилями.
+
+Режимы cold (WARMUP_ENABLED=false) и warm (WARMUP_ENABLED=true) повторяются
+--runs раз, выводятся медианы. Ограничение частоты запросов аутентификации
+в процессах замера отключается.
+
+Запуск из каталога ToDoTask (переменные окружения как у приложения):
+
+    python -m benchmarks.cold_start --runs 5 --requests 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any
+
+import httpx
+
+
+PASSWORD = "ColdStartPassword1234"
+MODES = {"cold": "false", "warm": "true"}
+
+
+def percentile(latencies: list[float], value: float) -> float:
+    """Перцентиль отсортированных задержек в миллисекундах."""
+    return round(latencies[min(int(len(latencies) * value), len(latencies) - 1)] * 1000, 3)
+
+
+async def prepare(email: str, cleanup: bool) -> None:
+    """Регистрация пользователя замера или его удаление."""
+    from asgi_lifespan import LifespanManager
+    from sqlalchemy import delete
+
+    from database.database import get_sessionmaker
+    from database.models.users import User
+    from fast import app
+
+    async with LifespanManager(app):
+        if cleanup:
+            async with get_sessionmaker()() as session:
+                await session.execute(delete(User).where(User.email == email))
+                await session.commit()
+            return
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                     base_url="http://127.0.0.1:8000") as client:
+            response = await client.post("/auth/register", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+
+
+async def measure(email: str, requests: int) -> dict[str, Any]:
+    """Замер холодного старта в текущем процессе."""
+    started: float = time.perf_counter()
+
+    from asgi_lifespan import LifespanManager
+
+    from fast import app
+
+    imported: float = time.perf_counter()
+    async with LifespanManager(app):
+        ready: float = time.perf_counter()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                     base_url="http://127.0.0.1:8000") as client:
+            response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+            first_response: float = time.perf_counter()
+
+            headers: dict[str, str] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            paths: tuple[str, ...] = ("/auth/me", "/todos", "/todos/0")
+            latencies: list[float] = []
+            for index in range(requests):
+                path: str = paths[index % len(paths)]
+                # Лимит разный, чтобы список не отдавался из кэша
+                params: dict[str, int] | None = {"limit": 1 + index % 100} if path == "/todos" else None
+                request_started: float = time.perf_counter()
+                await client.get(path, params=params, headers=headers)
+                latencies.append(time.perf_counter() - request_started)
+
+    latencies.sort()
+    return {
+        "import_seconds": round(imported - started, 4),
+        "startup_seconds": round(ready - imported, 4),
+        "first_response_seconds": round(first_response - ready, 4),
+        "time_to_first_response_seconds": round(first_response - started, 4),
+        "first_requests_p50_ms": percentile(latencies, 0.50),
+        "first_requests_p95_ms": percentile(latencies, 0.95),
+        "first_requests_p99_ms": percentile(latencies, 0.99),
+        "first_requests_max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def run_child(args: list[str], warmup: str = "true") -> str:
+    """Запуск режима бенчмарка в новом процессе и его вывод."""
+    env: dict[str, str] = {**os.environ, "WARMUP_ENABLED": warmup, "RATE_LIMIT_ENABLED": "false"}
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.cold_start", *args],
+                               env=env, capture_output=True, text=True, check=True)
+    return completed.stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Запусков процесса на режим")
+    parser.add_argument("--requests", type=int, default=100, help="Запросов после первого")
+    parser.add_argument("--child", choices=("prepare", "measure", "cleanup"), help=argparse.SUPPRESS)
+    parser.add_argument("--email", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "measure":
+        print(json.dumps(asyncio.run(measure(args.email, args.requests))))
+        return
+    if args.child is not None:
+        asyncio.run(prepare(args.email, cleanup=args.child == "cleanup"))
+        return
+
+    email: str = f"cold-start-{uuid.uuid4().hex[:12]}@example.com"
+    run_child(["--child", "prepare", "--email", email])
+    try:
+        for mode, warmup in MODES.items():
+            samples: list[dict[str, Any]] = [
+                json.loads(run_child(["--child", "measure", "--email", email,
+                                      "--requests", str(args.requests)], warmup).splitlines()[-1])
+                for _ in range(args.runs)
+            ]
+            print(json.dumps({
+                "mode": mode,
+                "runs": args.runs,
+                **{key: round(statistics.median(sample[key] for sample in samples), 4)
+                   for key in samples[0]},
+            }))
+    finally:
+        run_child(["--child", "cleanup", "--email", email])
+
+
+if __name__ == "__main__":
+    main()
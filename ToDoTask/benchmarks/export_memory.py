@@ -0,0 +1,169 @@
+"""Бенчмарк пиковой памяти при выгрузке задач.
+
+Для каждого размера выгрузки создаёт временного пользователя с нужным
+количеством задач и выгружает их в отдельном процессе, чтобы пиковый RSS
+одного замера не влиял на другой. Для сравнения можно замерить наивную
+выгрузку: загрузку всех задач через ORM в список и один JSON ответ.
+
+Запуск из каталога ToDoTask (переменные окружения как у приложения):
+
+    python -m benchmarks.export_memory --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select
+
+from core.config import TODO_EXPORT_FETCH_SIZE
+from database import database
+from database.models.todos import TodoItem
+from database.models.users import User
+from schemas.todos import TodoSchema
+from services.todos import get_todo_service
+
+
+# Количество задач, вставляемых за один запрос при подготовке данных
+SEED_BATCH_SIZE = 5_000
+
+
+def get_peak_rss_kib() -> int:
+    """Пиковый RSS текущего процесса в КиБ (на Linux ru_maxrss уже в КиБ)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def seed(size: int) -> int:
+    """Создание временного пользователя с `size` задачами.
+
+    Args:
+        size (int): Количество задач.
+
+    Returns:
+        int: ID пользователя.
+    """
+    async with database.get_sessionmaker()() as session:
+        owner_id: int = await session.scalar(
+            insert(User)
+            .values(email=f"export-benchmark-{uuid.uuid4().hex}@example.com", password_hash="-")
+            .returning(User.id)
+        )
+        for start in range(0, size, SEED_BATCH_SIZE):
+            await session.execute(insert(TodoItem), [
+                {"owner_id": owner_id, "title": f"Задача {index}", "description": "x" * 100}
+                for index in range(start, min(start + SEED_BATCH_SIZE, size))
+            ])
+        await session.commit()
+    return owner_id
+
+
+async def cleanup(owner_id: int) -> None:
+    """Удаление временного пользователя вместе с задачами.
+
+    Args:
+        owner_id (int): ID пользователя.
+    """
+    async with database.get_sessionmaker()() as session:
+        await session.execute(delete(User).where(User.id == owner_id))
+        await session.commit()
+
+
+async def export(owner_id: int, mode: str, export_format: str, fetch_size: int) -> dict:
+    """Выгрузка задач пользователя с замером памяти.
+
+    Args:
+        owner_id (int): ID пользователя.
+        mode (str): "stream" - потоковая выгрузка сервиса, "full" - загрузка в список.
+        export_format (str): Формат потоковой выгрузки.
+        fetch_size (int): Количество строк, получаемых с сервера за раз.
+
+    Returns:
+        dict: Пиковый RSS до и после выгрузки, её размер и длительность.
+    """
+    database.init_engine()
+    async with database.get_sessionmaker()() as session:
+        # Соединение открываем заранее, чтобы оно не попало в замер
+        await session.execute(select(1))
+        rss_before: int = get_peak_rss_kib()
+        started: float = time.perf_counter()
+
+        exported_bytes: int = 0
+        if mode == "stream":
+            async for chunk in get_todo_service(session).export_todos(owner_id, export_format, fetch_size):
+                exported_bytes += len(chunk)
+        else:
+            todos = (await session.scalars(select(TodoItem).where(TodoItem.owner_id == owner_id))).all()
+            body: bytes = json.dumps(
+                [TodoSchema.model_validate(todo).model_dump(mode="json") for todo in todos]
+            ).encode()
+            exported_bytes = len(body)
+
+        elapsed: float = time.perf_counter() - started
+    await database.engine.dispose()
+
+    return {
+        "rss_before_kib": rss_before,
+        "peak_rss_kib": get_peak_rss_kib(),
+        "exported_bytes": exported_bytes,
+        "seconds": round(elapsed, 3),
+    }
+
+
+def run_export(owner_id: int, mode: str, export_format: str, fetch_size: int,
+               results: multiprocessing.Queue) -> None:
+    """Точка входа дочернего процесса замера."""
+    results.put(asyncio.run(export(owner_id, mode, export_format, fetch_size)))
+
+
+def measure(owner_id: int, mode: str, export_format: str, fetch_size: int) -> dict:
+    """Замер выгрузки в отдельном процессе."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_export, args=(owner_id, mode, export_format, fetch_size, results))
+    process.start()
+    result: dict = results.get()
+    process.join()
+    return result
+
+
+async def prepare(size: int) -> int:
+    database.init_engine()
+    try:
+        return await seed(size)
+    finally:
+        await database.engine.dispose()
+
+
+async def teardown(owner_id: int) -> None:
+    database.init_engine()
+    try:
+        await cleanup(owner_id)
+    finally:
+        await database.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--format", dest="export_format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--fetch-size", type=int, default=TODO_EXPORT_FETCH_SIZE)
+    parser.add_argument("--modes", nargs="+", choices=("stream", "full"), default=["stream", "full"])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        owner_id: int = asyncio.run(prepare(size))
+        try:
+            for mode in args.modes:
+                result: dict = measure(owner_id, mode, args.export_format, args.fetch_size)
+                export_format: str = args.export_format if mode == "stream" else "json"
+                print(json.dumps({"size": size, "mode": mode, "format": export_format,
+                                  "fetch_size": args.fetch_size, **result}))
+        finally:
+            asyncio.run(teardown(owner_id))
+
+
+if __name__ == "__main__":
+    main()
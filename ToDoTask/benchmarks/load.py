@@ -0,0 +1,268 @@
+"""Нагрузочный бенчмарк API аутентификации и задач.
+
+Сценарии выполняются с заданной параллельностью, для каждого считаются
+запросы в секунду и перцентили задержки. По умолчанию приложение fast:app
+вызывается в том же процессе через ASGITransport (с lifespan), с --url
+запросы идут на запущенный сервер.
+
+Результаты записываются в JSON и сравниваются с сохранённым базовым
+замером: если пропускная способность сценария упала или p95 вырос больше
+допуска, бенчмарк завершается с кодом 1.
+
+Сценарии регистрации и входа идут с одного адреса, поэтому ограничение
+частоты запросов аутентификации в режиме ASGI отключается; сервер для --url
+нужно запускать с RATE_LIMIT_ENABLED=false.
+
+Базовый замер хранится в benchmarks/baseline.json. Проверка на регрессию
+(код возврата 1 при регрессии) и обновление базового замера запускаются из
+каталога ToDoTask (переменные окружения как у приложения):
+
+    make bench-check
+    make bench-baseline
+
+или напрямую:
+
+    python -m benchmarks.load --output results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.load --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import sys
+import time
+import uuid
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Iterator
+
+import httpx
+
+# Сценарий выполняет одну операцию (один или несколько запросов) и проверяет ответы
+Scenario = Callable[[httpx.AsyncClient, int], Awaitable[None]]
+
+# Пароль пользователей нагрузочного теста
+PASSWORD = "LoadTestPassword1234"
+SCENARIOS = ("health", "register", "login", "todo_crud")
+
+
+class LoadTest:
+    """Подготовка данных и сценарии нагрузочного теста.
+
+    Args:
+        run_id (str): Уникальный идентификатор запуска для email пользователей.
+    """
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id: str = run_id
+        self.login_emails: list[str] = []
+        self.auth_headers: list[dict[str, str]] = []
+        # Email регистрации уникален и между прогревом и замером
+        self.register_counter: Iterator[int] = itertools.count()
+
+    def email(self, kind: str, index: int) -> str:
+        return f"load-{self.run_id}-{kind}-{index}@example.com"
+
+    async def prepare(self, client: httpx.AsyncClient, users: int) -> None:
+        """Регистрация пользователей для сценариев входа и задач."""
+        for index in range(users):
+            email: str = self.email("user", index)
+            response = await client.post("/auth/register", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+            response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+            self.login_emails.append(email)
+            self.auth_headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+    async def health(self, client: httpx.AsyncClient, index: int) -> None:
+        (await client.get("/health")).raise_for_status()
+
+    async def register(self, client: httpx.AsyncClient, index: int) -> None:
+        response = await client.post(
+            "/auth/register",
+            json={"email": self.email("register", next(self.register_counter)), "password": PASSWORD},
+        )
+        response.raise_for_status()
+
+    async def login(self, client: httpx.AsyncClient, index: int) -> None:
+        email: str = self.login_emails[index % len(self.login_emails)]
+        response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+
+    async def todo_crud(self, client: httpx.AsyncClient, index: int) -> None:
+        headers: dict[str, str] = self.auth_headers[index % len(self.auth_headers)]
+        response = await client.post("/todos", json={"title": f"Задача {index}"}, headers=headers)
+        response.raise_for_status()
+        todo_id: int = response.json()["id"]
+
+        (await client.get(f"/todos/{todo_id}", headers=headers)).raise_for_status()
+        (await client.patch(f"/todos/{todo_id}", json={"is_done": True}, headers=headers)).raise_for_status()
+        (await client.get("/todos", params={"limit": 20}, headers=headers)).raise_for_status()
+        (await client.delete(f"/todos/{todo_id}", headers=headers)).raise_for_status()
+
+    async def cleanup(self) -> None:
+        """Удаление пользователей запуска вместе с задачами (только в режиме ASGI)."""
+        from sqlalchemy import delete
+
+        from database.database import get_sessionmaker
+        from database.models.users import User
+
+        async with get_sessionmaker()() as session:
+            await session.execute(delete(User).where(User.email.like(f"load-{self.run_id}-%")))
+            await session.commit()
+
+
+def percentile(latencies: list[float], value: float) -> float:
+    """Перцентиль отсортированных задержек в миллисекундах."""
+    if not latencies:
+        return 0.0
+    return round(latencies[min(int(len(latencies) * value), len(latencies) - 1)] * 1000, 3)
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, operations: int,
+                       concurrency: int) -> dict[str, Any]:
+    """Выполнение `operations` операций сценария `concurrency` параллельными клиентами."""
+    latencies: list[float] = []
+    errors: int = 0
+    next_index: int = 0
+
+    async def run_client() -> None:
+        nonlocal errors, next_index
+        while next_index < operations:
+            index: int = next_index
+            next_index += 1
+            started: float = time.perf_counter()
+            try:
+                await scenario(client, index)
+            except httpx.HTTPError:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    elapsed: float = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "operations": operations,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    load_test = LoadTest(uuid.uuid4().hex[:12])
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60)
+            )
+        else:
+            from asgi_lifespan import LifespanManager
+
+            from fast import app
+            from src.auth.dependencies import get_auth_rate_limiter
+
+            app.dependency_overrides[get_auth_rate_limiter] = lambda: None
+            await stack.enter_async_context(LifespanManager(app))
+            stack.push_async_callback(load_test.cleanup)
+            client = await stack.enter_async_context(httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://127.0.0.1:8000", timeout=60
+            ))
+
+        await load_test.prepare(client, args.users)
+
+        results: dict[str, Any] = {}
+        for name in args.scenarios:
+            # Прогрев соединений, пулов и кэшей перед замером
+            await run_scenario(client, getattr(load_test, name), args.concurrency, args.concurrency)
+            results[name] = await run_scenario(
+                client, getattr(load_test, name), args.operations, args.concurrency
+            )
+            print(json.dumps({"scenario": name, **results[name]}), file=sys.stderr)
+
+    return {
+        "meta": {
+            "target": args.url or "asgi",
+            "concurrency": args.concurrency,
+            "operations": args.operations,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float,
+            min_delta_ms: float = 1.0) -> list[str]:
+    """Сравнение результатов с базовым замером.
+
+    Args:
+        results (dict[str, Any]): Текущие результаты.
+        baseline (dict[str, Any]): Базовый замер.
+        tolerance (float): Допустимое относительное ухудшение (0.2 - 20%).
+        min_delta_ms (float): Рост p95 меньше этого значения не считается регрессией,
+            чтобы субмиллисекундный шум быстрых сценариев не ронял сравнение.
+
+    Returns:
+        list[str]: Описания регрессий, пустой список - регрессий нет.
+    """
+    regressions: list[str] = []
+    for name, current in results["scenarios"].items():
+        expected: dict[str, Any] | None = baseline["scenarios"].get(name)
+        if expected is None:
+            continue
+        if current["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {current['rps']} < {expected['rps']} - {tolerance:.0%}")
+        if current["p95_ms"] > expected["p95_ms"] * (1 + tolerance) + min_delta_ms:
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > {expected['p95_ms']} ms + {tolerance:.0%}")
+        if current["errors"] > expected["errors"]:
+            regressions.append(f"{name}: errors {current['errors']} > {expected['errors']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="URL запущенного сервера, по умолчанию - ASGI в процессе")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=200, help="Операций на сценарий")
+    parser.add_argument("--users", type=int, default=8, help="Пользователей для входа и задач")
+    parser.add_argument("--output", help="Файл для записи результатов")
+    parser.add_argument("--baseline", help="Файл базового замера для сравнения")
+    parser.add_argument("--save-baseline", help="Сохранить результаты как базовый замер")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    results: dict[str, Any] = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline: dict[str, Any] = json.load(file)
+        for key in ("target", "concurrency", "operations"):
+            if baseline["meta"].get(key) != results["meta"][key]:
+                print(f"Внимание: {key} базового замера {baseline['meta'].get(key)} "
+                      f"отличается от текущего {results['meta'][key]}", file=sys.stderr)
+
+        regressions: list[str] = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("REGRESSION:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+        print("Регрессий нет", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
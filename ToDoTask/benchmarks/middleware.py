@@ -0,0 +1,122 @@
+"""Микро-бенчмарк накладных расходов middleware на запрос.
+
+Сравнивает приложение без middleware, прежний стек (TrustedHostMiddleware
+и функция-middleware через BaseHTTPMiddleware со временем обработки
+и метриками) и RequestContextMiddleware. Запросы передаются в ASGI приложение
+напрямую, без сети и HTTP сервера, поэтому разница во времени - это стоимость
+самих middleware.
+
+Запуск из каталога ToDoTask (переменные окружения как у приложения):
+
+    python -m benchmarks.middleware --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import UNMATCHED_ROUTE, observe_request, update_runtime_gauges
+from core.middleware import RequestContextMiddleware
+
+
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+SCOPE: dict[str, Any] = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"127.0.0.1:8000"), (b"user-agent", b"benchmark")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> Response:
+        return PlainTextResponse("pong")
+
+    return app
+
+
+def create_base_http_app() -> FastAPI:
+    """Прежний стек middleware."""
+    app = create_app()
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=ALLOWED_HOSTS)
+
+    @app.middleware("http")
+    async def add_process_time_header(request: Request, call_next: Any) -> Response:
+        start_time = time.perf_counter()
+        response: Response = await call_next(request)
+        process_time: float = time.perf_counter() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        route: Any = request.scope.get("route")
+        observe_request(request.method, getattr(route, "path_format", UNMATCHED_ROUTE),
+                        response.status_code, process_time)
+        update_runtime_gauges()
+        return response
+
+    return app
+
+
+def create_asgi_app() -> FastAPI:
+    """Стек с RequestContextMiddleware."""
+    app = create_app()
+    app.add_middleware(RequestContextMiddleware, allowed_hosts=ALLOWED_HOSTS)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """Среднее время запроса в микросекундах."""
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        pass
+
+    # Прогрев: построение стека middleware и первые вызовы
+    for _ in range(100):
+        await app(dict(SCOPE), receive, send)
+
+    started: float = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def run(requests: int) -> None:
+    baseline: float | None = None
+    for name, app in (("none", create_app()), ("base_http", create_base_http_app()),
+                      ("asgi", create_asgi_app())):
+        per_request: float = await measure(app, requests)
+        if baseline is None:
+            baseline = per_request
+        print(json.dumps({
+            "middleware": name,
+            "requests": requests,
+            "us_per_request": round(per_request, 2),
+            "overhead_us": round(per_request - baseline, 2),
+        }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
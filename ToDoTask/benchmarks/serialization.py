@@ -0,0 +1,122 @@
+"""Бенчмарк сериализации ответов с большими списками задач.
+
+Сравнивает три способа вернуть уже собранную TodoListResponseSchema:
+- default: стандартный JSONResponse FastAPI, повторная валидация по
+  response_model и jsonable_encoder;
+- orjson: FastJSONResponse как класс ответа по умолчанию, повторная
+  валидация остаётся;
+- fast: обработчик возвращает FastJSONResponse(schema), схема сериализуется
+  один раз через pydantic-core.
+
+Запросы передаются в ASGI приложение напрямую, без сети и HTTP сервера.
+
+Запуск из каталога ToDoTask (переменные окружения как у приложения):
+
+    python -m benchmarks.serialization --sizes 10 100 1000 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timezone
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from core.responses import FastJSONResponse
+from schemas.todos import TodoListResponseSchema, TodoSchema
+
+
+SCOPE: dict[str, Any] = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/todos",
+    "raw_path": b"/todos",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"127.0.0.1:8000")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+def build_page(size: int) -> TodoListResponseSchema:
+    now: datetime = datetime.now(timezone.utc)
+    return TodoListResponseSchema(
+        items=[
+            TodoSchema(id=index, title=f"Задача {index}", description="Описание задачи " * 4,
+                       is_done=index % 2 == 0, due_date=date(2025, 1, 1 + index % 28),
+                       created_at=now, updated_at=now)
+            for index in range(size)
+        ],
+        next_cursor="eyJpZCI6IDEwMDB9",
+    )
+
+
+def create_app(page: TodoListResponseSchema, mode: str) -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse if mode == "default" else FastJSONResponse)
+
+    if mode == "fast":
+        @app.get("/todos", response_model=TodoListResponseSchema)
+        async def list_todos_fast() -> FastJSONResponse:
+            return FastJSONResponse(page)
+    else:
+        @app.get("/todos", response_model=TodoListResponseSchema)
+        async def list_todos() -> TodoListResponseSchema:
+            return page
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> tuple[float, int]:
+    """Среднее время запроса в микросекундах и размер тела ответа."""
+    body_size: int = 0
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal body_size
+        if message["type"] == "http.response.body":
+            body_size = len(message["body"])
+
+    for _ in range(10):
+        await app(dict(SCOPE), receive, send)
+
+    started: float = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000, body_size
+
+
+async def run(sizes: list[int], requests: int) -> None:
+    for size in sizes:
+        page: TodoListResponseSchema = build_page(size)
+        baseline: float | None = None
+        for mode in ("default", "orjson", "fast"):
+            per_request, body_size = await measure(create_app(page, mode), requests)
+            if baseline is None:
+                baseline = per_request
+            print(json.dumps({
+                "mode": mode,
+                "todos": size,
+                "body_bytes": body_size,
+                "us_per_request": round(per_request, 2),
+                "speedup": round(baseline / per_request, 2),
+            }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Микро-бенчмарки примитивов UserService и валидации схем.
+
+Каждый примитив замеряется отдельно. Хеширование замеряется для каждого
+набора параметров argon2 напрямую и с параметрами из конфигурации через
+UserService и PasswordHashingPool, как в запросах (вместе с передачей задачи
+в пул), токены - для каждого алгоритма JWT. Бенчмарки не входят
+в обычный запуск тестов (testpaths = tests) и запускаются явно:
+
+    python -m pytest benchmarks/test_micro.py --benchmark-json=micro.json
+
+Сравнение с сохранённым запуском:
+
+    python -m pytest benchmarks/test_micro.py --benchmark-autosave
+    python -m pytest benchmarks/test_micro.py --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Iterator, cast
+
+import pytest
+from argon2 import Parameters, PasswordHasher, Type
+from argon2.profiles import RFC_9106_LOW_MEMORY
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import PASSWORD_HASH_TIME_COST, PASSWORD_HASH_MEMORY_COST, \
+    PASSWORD_HASH_PARALLELISM, PASSWORD_HASHING_EXECUTOR, PASSWORD_HASHING_WORKERS, \
+    PASSWORD_HASHING_QUEUE_SIZE
+from core.hashing import PasswordHashingPool
+from core.tokens import JWTKeys, AccessTokenVerifier
+from schemas.users import LoginUserRequestSchema, TokenSchema
+from services.users import UserService
+
+
+PASSWORD = "SuperSecretPassword1234"
+# Наборы параметров argon2: из конфигурации, значения по умолчанию argon2-cffi
+# и минимум OWASP
+ARGON2_PARAMETER_SETS = {
+    "config": Parameters(type=Type.ID, version=19, salt_len=16, hash_len=32,
+                         time_cost=PASSWORD_HASH_TIME_COST, memory_cost=PASSWORD_HASH_MEMORY_COST,
+                         parallelism=PASSWORD_HASH_PARALLELISM),
+    "rfc9106_low_memory": RFC_9106_LOW_MEMORY,
+    "owasp_minimum": Parameters(type=Type.ID, version=19, salt_len=16, hash_len=32,
+                                time_cost=2, memory_cost=19_456, parallelism=1),
+}
+# Алгоритмы подписи JWT с общим секретом
+JWT_ALGORITHMS = ("HS256", "HS384", "HS512")
+
+
+@pytest.fixture(params=ARGON2_PARAMETER_SETS, scope="module")
+def password_hasher(request: pytest.FixtureRequest) -> PasswordHasher:
+    return PasswordHasher.from_parameters(ARGON2_PARAMETER_SETS[request.param])
+
+
+class UnusedSession:
+    """Заглушка сессии: замеряемые методы к базе данных не обращаются."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise AssertionError(f"Бенчмарк не должен обращаться к сессии: {name}")
+
+
+@pytest.fixture(scope="module")
+def event_loop_runner() -> Iterator[asyncio.Runner]:
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture(scope="module")
+def hashing_pool() -> Iterator[PasswordHashingPool]:
+    # Пул с теми же параметрами, что и в приложении
+    pool = PasswordHashingPool(PASSWORD_HASHING_EXECUTOR, PASSWORD_HASHING_WORKERS, PASSWORD_HASHING_QUEUE_SIZE)
+    yield pool
+    pool.shutdown()
+
+
+def create_user_service(hashing_pool: PasswordHashingPool, algorithm: str = "HS256") -> UserService:
+    jwt_keys = JWTKeys(secret_key="benchmark-secret-key-" + "x" * 43, algorithm=algorithm,
+                       access_token_expire_minutes=30, refresh_token_expire_minutes=60 * 24 * 7)
+    return UserService(
+        db=cast(AsyncSession, UnusedSession()),
+        hashing_pool=hashing_pool,
+        jwt_keys=jwt_keys,
+        token_verifier=AccessTokenVerifier(jwt_keys, cache_size=10_000),
+    )
+
+
+@pytest.fixture(params=JWT_ALGORITHMS, scope="module")
+def user_service(request: pytest.FixtureRequest, hashing_pool: PasswordHashingPool) -> UserService:
+    return create_user_service(hashing_pool, request.param)
+
+
+@pytest.mark.benchmark(group="hash_password", min_rounds=5)
+def test_hash_password(benchmark, password_hasher: PasswordHasher):
+    benchmark(password_hasher.hash, PASSWORD)
+
+
+@pytest.mark.benchmark(group="verify_password", min_rounds=5)
+def test_verify_password(benchmark, password_hasher: PasswordHasher):
+    password_hash = password_hasher.hash(PASSWORD)
+    assert benchmark(password_hasher.verify, password_hash, PASSWORD)
+
+
+@pytest.mark.benchmark(group="hash_password", min_rounds=5)
+def test_user_service_hash_password(benchmark, event_loop_runner: asyncio.Runner,
+                                    hashing_pool: PasswordHashingPool):
+    user_service = create_user_service(hashing_pool)
+    password_hash = benchmark(lambda: event_loop_runner.run(user_service.hash_password(PASSWORD)))
+    assert password_hash.startswith("$argon2id$")
+
+
+@pytest.mark.benchmark(group="verify_password", min_rounds=5)
+def test_user_service_verify_password(benchmark, event_loop_runner: asyncio.Runner,
+                                      hashing_pool: PasswordHashingPool):
+    user_service = create_user_service(hashing_pool)
+    password_hash = event_loop_runner.run(user_service.hash_password(PASSWORD))
+    assert benchmark(lambda: event_loop_runner.run(user_service.verify_password(PASSWORD, password_hash)))
+
+
+@pytest.mark.benchmark(group="generate_token")
+def test_generate_token(benchmark, user_service: UserService):
+    token = benchmark(user_service.generate_token, 1)
+    assert token.access_token
+
+
+@pytest.mark.benchmark(group="verify_access_token")
+def test_verify_access_token_uncached(benchmark, user_service: UserService):
+    access_token = user_service.generate_token(1).access_token
+
+    def verify() -> int:
+        # Каждый раунд - промах кэша с проверкой подписи
+        user_service.token_verifier.cache.clear()
+        return user_service.get_user_id_from_access_token(access_token)
+
+    assert benchmark(verify) == 1
+
+
+@pytest.mark.benchmark(group="verify_access_token")
+def test_verify_access_token_cached(benchmark, user_service: UserService):
+    access_token = user_service.generate_token(1).access_token
+    user_service.get_user_id_from_access_token(access_token)
+    assert benchmark(user_service.get_user_id_from_access_token, access_token) == 1
+
+
+@pytest.mark.benchmark(group="schemas")
+def test_login_schema_validate_json(benchmark):
+    body = b'{"email": "user@example.com", "password": "SuperSecretPassword1234"}'
+    login_data = benchmark(LoginUserRequestSchema.model_validate_json, body)
+    assert login_data.email == "user@example.com"
+
+
+@pytest.mark.benchmark(group="schemas")
+def test_token_schema_dump_json(benchmark):
+    expires_at = datetime.now(timezone.utc)
+    data = {"access_token": "a" * 160, "access_token_expires_at": expires_at,
+            "refresh_token": "r" * 160, "refresh_token_expires_at": expires_at,
+            "token_type": "bearer"}
+
+    def validate_and_dump() -> str:
+        return TokenSchema.model_validate(data).model_dump_json()
+
+    assert benchmark(validate_and_dump)
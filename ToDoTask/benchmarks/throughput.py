@@ -0,0 +1,127 @@
+"""Бенчмарк пропускной способности при разном количестве воркеров.
+
+Для каждого количества воркеров запускает launcher.py, нагружает эндпоинт
+из нескольких процессов-клиентов в течение заданного времени и выводит
+количество запросов в секунду и перцентили задержки. Клиенты работают
+в отдельных процессах, чтобы генератор нагрузки не стал узким местом.
+На машине с одним ядром разницы между режимами не будет.
+
+Запуск из каталога ToDoTask (переменные окружения как у приложения):
+
+    python -m benchmarks.throughput --workers 1 4 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def wait_until_ready(base_url: str, timeout: float = 30) -> None:
+    """Ожидание готовности сервера."""
+    deadline: float = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Сервер {base_url} не запустился за {timeout} секунд")
+
+
+async def generate_load(url: str, concurrency: int, duration: float) -> list[float]:
+    """Отправка запросов `concurrency` параллельными соединениями.
+
+    Returns:
+        list[float]: Задержки успешных запросов в секундах.
+    """
+    latencies: list[float] = []
+    deadline: float = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        async def run_connection() -> None:
+            while time.monotonic() < deadline:
+                started: float = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(run_connection() for _ in range(concurrency)))
+    return latencies
+
+
+def run_client(url: str, concurrency: int, duration: float, results: multiprocessing.Queue) -> None:
+    """Точка входа процесса-клиента."""
+    results.put(asyncio.run(generate_load(url, concurrency, duration)))
+
+
+def measure(workers: int, port: int, path: str, clients: int, concurrency: int,
+            duration: float) -> dict:
+    """Замер пропускной способности сервера с `workers` воркерами."""
+    base_url: str = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "launcher.py", "--workers", str(workers), "--bind", f"127.0.0.1:{port}"],
+        env={**os.environ, "DEBUG_MODE": "false"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(base_url)
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(target=run_client, args=(base_url + path, concurrency, duration, results))
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        latencies: list[float] = sorted(
+            latency for _ in processes for latency in results.get()
+        )
+        for process in processes:
+            process.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    def percentile(value: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(int(len(latencies) * value), len(latencies) - 1)] * 1000, 2)
+
+    return {
+        "workers": workers,
+        "path": path,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": percentile(0.5),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--clients", type=int, default=2, help="Количество процессов-клиентов")
+    parser.add_argument("--concurrency", type=int, default=32, help="Соединений на клиента")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    for workers in dict.fromkeys(args.workers):
+        print(json.dumps(measure(workers, args.port, args.path, args.clients,
+                                 args.concurrency, args.duration)))
+
+
+if __name__ == "__main__":
+    main()
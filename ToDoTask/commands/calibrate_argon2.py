@@ -0,0 +1,109 @@
+"""Подбор параметров argon2 под текущую машину.
+
+Параметры подбираются так, чтобы проверка пароля занимала около заданного
+времени: при максимальном объёме памяти увеличивается количество проходов,
+пока медиана проверки не достигнет цели. Если даже один проход дольше
+цели, объём памяти уменьшается вдвое. Результат выводится в виде переменных
+окружения для core/config.py.
+
+Команду нужно запускать на той же машине (или с теми же ресурсами
+контейнера), где работает приложение, из каталога ToDoTask:
+
+    python -m commands.calibrate_argon2 --target-ms 250 --max-memory-mib 64
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Any
+
+from argon2 import PasswordHasher
+
+
+PASSWORD = "CalibrationPassword1234"
+# Минимальный объём памяти в КиБ (минимум OWASP для argon2id)
+MIN_MEMORY_COST = 19_456
+# Максимальное количество проходов
+MAX_TIME_COST = 16
+
+
+def measure_verify(password_hasher: PasswordHasher, rounds: int) -> float:
+    """Медиана времени проверки пароля в миллисекундах."""
+    password_hash: str = password_hasher.hash(PASSWORD)
+    timings: list[float] = []
+    for _ in range(rounds):
+        started: float = time.perf_counter()
+        password_hasher.verify(password_hash, PASSWORD)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def calibrate(target_ms: float, max_memory_cost: int, parallelism: int,
+              rounds: int) -> dict[str, Any]:
+    """Подбор параметров argon2 под целевое время проверки.
+
+    Args:
+        target_ms (float): Целевое время проверки пароля в миллисекундах.
+        max_memory_cost (int): Максимальный объём памяти в КиБ.
+        parallelism (int): Количество потоков.
+        rounds (int): Количество замеров для каждого набора параметров.
+
+    Returns:
+        dict[str, Any]: Подобранные параметры и измеренное время проверки.
+    """
+    memory_cost: int = max_memory_cost
+    while True:
+        time_cost: int = 1
+        verify_ms: float = measure_verify(
+            PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+            rounds,
+        )
+        # Один проход уже дольше цели - уменьшаем память, пока есть куда
+        if verify_ms > target_ms and memory_cost // 2 >= MIN_MEMORY_COST:
+            memory_cost //= 2
+            continue
+
+        # Время растёт с количеством проходов почти линейно: берём последний
+        # набор, который ещё укладывается в цель
+        while time_cost < MAX_TIME_COST:
+            next_verify_ms: float = measure_verify(
+                PasswordHasher(time_cost=time_cost + 1, memory_cost=memory_cost,
+                               parallelism=parallelism),
+                rounds,
+            )
+            if next_verify_ms > target_ms:
+                break
+            time_cost += 1
+            verify_ms = next_verify_ms
+
+        return {
+            "time_cost": time_cost,
+            "memory_cost": memory_cost,
+            "parallelism": parallelism,
+            "verify_ms": round(verify_ms, 2),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250, help="Целевое время проверки")
+    parser.add_argument("--max-memory-mib", type=int, default=64, help="Максимальный объём памяти")
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5, help="Замеров на набор параметров")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+
+    result: dict[str, Any] = calibrate(args.target_ms, args.max_memory_mib * 1024,
+                                       args.parallelism, args.rounds)
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"# Проверка пароля: {result['verify_ms']} мс (цель {args.target_ms} мс)")
+    print(f"PASSWORD_HASH_TIME_COST={result['time_cost']}")
+    print(f"PASSWORD_HASH_MEMORY_COST={result['memory_cost']}")
+    print(f"PASSWORD_HASH_PARALLELISM={result['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Пересборка фильтра зарегистрированных email.
+
+Команда заполняет фильтр из таблицы users, выводит его заполнение и
+расчётную долю ложных срабатываний, затем увеличивает поколение фильтра
+в общем кэше: работающие воркеры пересобирают свои фильтры при следующей
+синхронизации. Нужна после массового удаления или изменения пользователей
+в обход приложения и после изменения EMAIL_FILTER_CAPACITY или
+EMAIL_FILTER_ERROR_RATE. С CACHE_BACKEND=memory поколение видно только
+процессу команды, и воркеры пересоберут фильтры только при перезапуске.
+
+Запуск из каталога ToDoTask (переменные окружения как у приложения):
+
+    python -m commands.rebuild_email_filter
+"""
+import argparse
+import asyncio
+import json
+
+from core.config import CACHE_BACKEND
+from core.container import container
+from core.email_filter import EMAIL_FILTER_GENERATION_KEY
+from database import database
+
+
+async def run(notify_workers: bool) -> None:
+    database.init_engine()
+    try:
+        async with database.get_sessionmaker()() as db:
+            await container.email_filter.rebuild(db)
+
+        print(json.dumps({
+            **container.email_filter.stats(),
+            "size_bytes": len(container.email_filter.bloom.bits),
+            "hash_count": container.email_filter.bloom.hash_count,
+        }))
+
+        if notify_workers:
+            await container.cache_backend.incr_version(EMAIL_FILTER_GENERATION_KEY)
+            if CACHE_BACKEND != "redis":
+                print("Внимание: CACHE_BACKEND=memory, воркеры пересоберут фильтры при перезапуске")
+    finally:
+        await database.dispose_engine()
+        await container.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-notify", action="store_true",
+                        help="Только вывести заполнение, не пересобирать фильтры воркеров")
+    args = parser.parse_args()
+    asyncio.run(run(not args.no_notify))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Файл кэшей приложения.
+
+Содержит локальный LRU кэш, бэкенды общего кэша (в памяти процесса и Redis)
+и кэш списков задач с версиями по пользователю.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from core.logger import logger
+
+try:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - redis нужен только для CACHE_BACKEND=redis
+    aioredis = None
+    RedisError = OSError
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Ограниченный LRU кэш с временем жизни записей.
+
+    Кэш не потокобезопасен и рассчитан на работу внутри одного цикла событий.
+
+    Args:
+        maxsize (int): Максимальное количество записей.
+        ttl (float | None): Время жизни записи по умолчанию в секундах.
+        clock (Callable[[], float]): Источник текущего времени в секундах.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        if maxsize < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+
+        self.maxsize: int = maxsize
+        self.ttl: float | None = ttl
+        self._clock: Callable[[], float] = clock
+        # Значение хранится вместе с моментом истечения (None - бессрочно)
+        self._data: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Получение значения по ключу.
+
+        Args:
+            key (K): Ключ.
+
+        Returns:
+            V | None: Значение или None, если записи нет или её срок истёк.
+        """
+        entry: tuple[V, float | None] | None = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        """Сохранение значения.
+
+        Args:
+            key (K): Ключ.
+            value (V): Значение.
+            expires_at (float | None): Момент истечения записи. По умолчанию
+                вычисляется из `ttl` кэша.
+        """
+        if expires_at is None and self.ttl is not None:
+            expires_at = self._clock() + self.ttl
+
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        """Удаление значения по ключу.
+
+        Args:
+            key (K): Ключ.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Метрики кэша.
+
+        Returns:
+            dict[str, int]: Размер кэша, попадания, промахи и вытеснения.
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheBackend(ABC):
+    """Базовый бэкенд кэша.
+
+    Хранит значения в байтах и целочисленные версии. Версия, которой ещё нет,
+    создаётся из текущего времени в наносекундах, поэтому потерянная
+    (вытесненная) версия не совпадёт ни с одной из прежних.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Получение значения по ключу."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Сохранение значения на `ttl` секунд."""
+
+    @abstractmethod
+    async def get_version(self, key: str) -> int:
+        """Получение версии, создаёт её при отсутствии."""
+
+    @abstractmethod
+    async def incr_version(self, key: str) -> int:
+        """Увеличение версии, создаёт её при отсутствии."""
+
+    async def close(self) -> None:
+        """Освобождение ресурсов бэкенда."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Бэкенд кэша в памяти процесса (LRU + TTL).
+
+    Подходит для тестов и развёртывания в один процесс.
+
+    Args:
+        maxsize (int): Максимальное количество значений.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.values: LRUCache[str, bytes] = LRUCache(maxsize)
+        # Версии хранятся отдельно, чтобы их не вытесняли значения
+        self.versions: LRUCache[str, int] = LRUCache(maxsize)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.values.set(key, value, expires_at=time.time() + ttl)
+
+    async def get_version(self, key: str) -> int:
+        version: int | None = self.versions.get(key)
+        if version is None:
+            version = time.time_ns()
+            self.versions.set(key, version)
+        return version
+
+    async def incr_version(self, key: str) -> int:
+        version: int = await self.get_version(key) + 1
+        self.versions.set(key, version)
+        return version
+
+
+class RedisCacheBackend(CacheBackend):
+    """Бэкенд кэша в Redis, общий для всех процессов и узлов.
+
+    Args:
+        url (str): URL подключения к Redis.
+    """
+
+    # Атомарное чтение версии с созданием при отсутствии
+    GET_VERSION_SCRIPT = """
+        local version = redis.call('GET', KEYS[1])
+        if not version then
+            redis.call('SET', KEYS[1], ARGV[1])
+            version = ARGV[1]
+        end
+        return version
+    """
+    # Атомарное увеличение версии; отсутствующая версия создаётся из времени
+    INCR_VERSION_SCRIPT = """
+        if redis.call('EXISTS', KEYS[1]) == 0 then
+            redis.call('SET', KEYS[1], ARGV[1])
+            return ARGV[1]
+        end
+        return redis.call('INCR', KEYS[1])
+    """
+
+    def __init__(self, url: str) -> None:
+        if aioredis is None:
+            raise RuntimeError("Для CACHE_BACKEND=redis требуется пакет redis")
+
+        self.redis: Any = aioredis.Redis.from_url(url)
+        self._get_version: Any = self.redis.register_script(self.GET_VERSION_SCRIPT)
+        self._incr_version: Any = self.redis.register_script(self.INCR_VERSION_SCRIPT)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.redis.set(key, value, px=int(ttl * 1000))
+
+    async def get_version(self, key: str) -> int:
+        return int(await self._get_version(keys=[key], args=[time.time_ns()]))
+
+    async def incr_version(self, key: str) -> int:
+        return int(await self._incr_version(keys=[key], args=[time.time_ns()]))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class _LeaderCancelled(Exception):
+    """Загрузка отменена вместе с запросом, который её выполнял."""
+
+
+class SingleFlight:
+    """Объединение одновременных загрузок одного и того же ключа.
+
+    Пока загрузка ключа выполняется, остальные запросы этого ключа ждут
+    её результата вместо повторного обращения к базе данных. Если запрос,
+    выполнявший загрузку, отменён (например, клиент разорвал соединение),
+    ожидающие не отменяются: один из них повторяет загрузку сам.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[V]]) -> V:
+        """Выполнение загрузки ключа не более одного раза одновременно.
+
+        Args:
+            key (str): Ключ.
+            func (Callable[[], Awaitable[V]]): Загрузка значения.
+
+        Returns:
+            V: Результат загрузки.
+        """
+        call: asyncio.Future[Any] | None = self._calls.get(key)
+        while call is not None:
+            try:
+                return await asyncio.shield(call)
+            except _LeaderCancelled:
+                # Первый проснувшийся ожидающий становится новым загружающим
+                call = self._calls.get(key)
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result: V = await func()
+        except asyncio.CancelledError:
+            call.set_exception(_LeaderCancelled())
+            call.exception()
+            raise
+        except Exception as e:
+            call.set_exception(e)
+            # Исключение получат ожидающие; помечаем его прочитанным, если их нет
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+class TodoListCache:
+    """Кэш страниц списка задач с версиями по пользователю.
+
+    Ключ страницы включает ID владельца, текущую версию его списка и
+    параметры запроса. Любое изменение задач пользователя увеличивает версию,
+    после чего старые ключи просто перестают запрашиваться и истекают по TTL.
+
+    Args:
+        backend (CacheBackend): Бэкенд кэша.
+        ttl (float): Время жизни страницы в секундах.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float) -> None:
+        self.backend: CacheBackend = backend
+        self.ttl: float = ttl
+        self.single_flight: SingleFlight = SingleFlight()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def _version_key(owner_id: int) -> str:
+        return f"todos:{owner_id}:version"
+
+    async def get_or_load(self, owner_id: int, params: dict[str, Any],
+                          loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Получение страницы из кэша или загрузка её из базы данных.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            params (dict[str, Any]): Параметры запроса страницы.
+            loader (Callable[[], Awaitable[bytes]]): Загрузка страницы при промахе.
+
+        Returns:
+            bytes: Страница списка задач в JSON.
+        """
+        try:
+            version: int | None = await self.backend.get_version(self._version_key(owner_id))
+        except RedisError as e:
+            logger.warning("Кэш списка задач недоступен", error=str(e))
+            return await loader()
+
+        params_digest: str = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key: str = f"todos:{owner_id}:{version}:{params_digest}"
+
+        try:
+            value: bytes | None = await self.backend.get(key)
+        except RedisError as e:
+            logger.warning("Кэш списка задач недоступен", error=str(e))
+            value = None
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+
+        async def load_and_store() -> bytes:
+            loaded: bytes = await loader()
+            try:
+                await self.backend.set(key, loaded, self.ttl)
+            except RedisError as e:
+                logger.warning("Кэш списка задач недоступен", error=str(e))
+            return loaded
+
+        return await self.single_flight.do(key, load_and_store)
+
+    async def invalidate(self, owner_id: int) -> None:
+        """Сброс всех закэшированных страниц пользователя за O(1).
+
+        Args:
+            owner_id (int): ID владельца задач.
+        """
+        try:
+            await self.backend.incr_version(self._version_key(owner_id))
+        except RedisError as e:
+            # Старые страницы истекут по TTL
+            logger.warning("Не удалось сбросить кэш списка задач", error=str(e))
+
+    def stats(self) -> dict[str, int]:
+        """Метрики кэша.
+
+        Returns:
+            dict[str, int]: Попадания и промахи.
+        """
+        return {"hits": self.hits, "misses": self.misses}
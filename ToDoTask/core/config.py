@@ -8,6 +8,38 @@ from datetime import timezone
 DEBUG_MODE = os.getenv("DEBUG_MODE", "False").lower() == "true"
 # --------------------------------------------------------------------------------
 
+# Блок настроек логирования
+# --------------------------------------------------------------------------------
+# Минимальный уровень логов
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Количество записей, ожидающих записи в поток вывода (при переполнении записи отбрасываются)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10_000))
+# Доля записываемых логов запросов (от 0 до 1)
+LOG_ACCESS_SAMPLE_RATE = float(os.getenv("LOG_ACCESS_SAMPLE_RATE", 1.0))
+# --------------------------------------------------------------------------------
+
+# Блок настроек сервера
+# --------------------------------------------------------------------------------
+# Адрес, на котором сервер принимает соединения
+SERVER_BIND = os.getenv("SERVER_BIND", "0.0.0.0:8000")
+# Количество процессов-воркеров
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", os.cpu_count() or 1))
+# Загрузка приложения в главном процессе до создания воркеров
+SERVER_PRELOAD = os.getenv("SERVER_PRELOAD", "True").lower() == "true"
+# Количество запросов, после которого воркер перезапускается (0 - без перезапуска)
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", 10_000))
+# Случайная добавка к SERVER_MAX_REQUESTS, чтобы воркеры не перезапускались одновременно
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 1_000))
+# Время в секундах, за которое воркер должен завершить выполняющиеся запросы при остановке
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+# Время в секундах, после которого зависший воркер перезапускается
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", 60))
+# Время удержания keep-alive соединения в секундах
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", 5))
+# Использование uvloop и httptools, если они установлены
+SERVER_FAST_LOOP = os.getenv("SERVER_FAST_LOOP", "True").lower() == "true"
+# --------------------------------------------------------------------------------
+
 # Блок Базы Данных
 # --------------------------------------------------------------------------------
 # Временная зона базы данных
@@ -24,6 +56,40 @@ ASYNC_DATABASE_TEST_URL = "postgresql+asyncpg://" + BASE_DATABASE_URL.split("/")
 ASYNC_DATABASE_URL = "postgresql+asyncpg://" + BASE_DATABASE_URL
 # URL для синхронного подключения к базе данных
 SYNC_DATABASE_URL = "postgresql://" + BASE_DATABASE_URL
+# Хост и порт реплики только для чтения (без хоста - все запросы идут в основную базу)
+POSTGRES_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST", "")
+POSTGRES_REPLICA_PORT = os.getenv("POSTGRES_REPLICA_PORT", os.getenv("POSTGRES_PORT"))
+# URL для асинхронного подключения к реплике
+ASYNC_DATABASE_REPLICA_URL = ("postgresql+asyncpg://"
+                              f"{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}"
+                              f"@{POSTGRES_REPLICA_HOST}:{POSTGRES_REPLICA_PORT}"
+                              f"/{os.getenv('POSTGRES_DB')}") if POSTGRES_REPLICA_HOST else None
+# URL базы, заменяющей реплику в ТЕСТАХ
+ASYNC_DATABASE_TEST_REPLICA_URL = "postgresql+asyncpg://" + BASE_DATABASE_URL.split("/")[0] + "/" + str(os.getenv('POSTGRES_TEST_REPLICA_DB'))
+# Максимальное отставание реплики в секундах, при большем чтение идёт из основной базы
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 5))
+# Интервал проверки отставания реплики в секундах
+DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS", 1))
+# Время после изменений пользователя, в течение которого его данные читаются из основной базы
+# (должно быть не меньше DB_REPLICA_MAX_LAG_SECONDS)
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", 5))
+# Количество постоянных соединений в пуле
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+# Количество дополнительных соединений сверх DB_POOL_SIZE при пиковой нагрузке
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+# Время ожидания свободного соединения в секундах
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Время жизни соединения в секундах (-1 - без ограничения)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+# Проверка соединения перед выдачей из пула
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true"
+# Размер кэша подготовленных выражений asyncpg на соединение
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+# Размер кэша подготовленных выражений SQLAlchemy на соединение
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100))
+# Режим работы через PgBouncer в режиме пулинга транзакций
+# (именованные подготовленные выражения не переиспользуются между транзакциями)
+DB_PGBOUNCER_MODE = os.getenv("DB_PGBOUNCER_MODE", "False").lower() == "true"
 # --------------------------------------------------------------------------------
 
 # Блок настроек JWT
@@ -36,4 +102,110 @@ JWT_ALGORITHM = str(os.getenv("JWT_ALGORITHM"))
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 # Время жизни токена обновления
 REFRESH_TOKEN_EXPIRE_MINUTES = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", 60 * 24 * 7))
+# Количество проверенных токенов доступа в кэше
+ACCESS_TOKEN_CACHE_SIZE = int(os.getenv("ACCESS_TOKEN_CACHE_SIZE", 10_000))
+# Хранилище отозванных токенов обновления: "memory" (в памяти процесса, только для одного
+# воркера) или "redis" (общее для воркеров, REDIS_URL)
+TOKEN_REVOCATION_BACKEND = os.getenv("TOKEN_REVOCATION_BACKEND", "memory")
+# Ширина корзины времени истечения отозванных токенов в секундах
+TOKEN_REVOCATION_BUCKET_SECONDS = int(os.getenv("TOKEN_REVOCATION_BUCKET_SECONDS", 60))
+# --------------------------------------------------------------------------------
+
+# Блок настроек хеширования паролей
+# --------------------------------------------------------------------------------
+# Тип пула для хеширования паролей: "thread" или "process"
+PASSWORD_HASHING_EXECUTOR = os.getenv("PASSWORD_HASHING_EXECUTOR", "thread")
+# Количество воркеров пула хеширования
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1))
+# Количество задач хеширования, ожидающих свободного воркера
+PASSWORD_HASHING_QUEUE_SIZE = int(os.getenv("PASSWORD_HASHING_QUEUE_SIZE", 64))
+# Параметры argon2id (по умолчанию - профиль RFC 9106 с малым потреблением памяти).
+# Подобрать под текущую машину: python -m commands.calibrate_argon2
+# Хеши со старыми параметрами пересчитываются при входе пользователя
+# Количество проходов
+PASSWORD_HASH_TIME_COST = int(os.getenv("PASSWORD_HASH_TIME_COST", 3))
+# Объём памяти в КиБ
+PASSWORD_HASH_MEMORY_COST = int(os.getenv("PASSWORD_HASH_MEMORY_COST", 65_536))
+# Количество потоков
+PASSWORD_HASH_PARALLELISM = int(os.getenv("PASSWORD_HASH_PARALLELISM", 4))
+# --------------------------------------------------------------------------------
+
+# Блок настроек задач
+# --------------------------------------------------------------------------------
+# Размер страницы списка задач по умолчанию
+TODO_PAGE_DEFAULT_LIMIT = int(os.getenv("TODO_PAGE_DEFAULT_LIMIT", 20))
+# Максимальный размер страницы списка задач
+TODO_PAGE_MAX_LIMIT = int(os.getenv("TODO_PAGE_MAX_LIMIT", 100))
+# Максимальное количество задач в одном пакетном запросе
+TODO_BATCH_MAX_SIZE = int(os.getenv("TODO_BATCH_MAX_SIZE", 100))
+# Количество строк, получаемых с сервера за раз при выгрузке задач
+TODO_EXPORT_FETCH_SIZE = int(os.getenv("TODO_EXPORT_FETCH_SIZE", 1000))
+# --------------------------------------------------------------------------------
+
+# Блок настроек кэша
+# --------------------------------------------------------------------------------
+# Бэкенд кэша: "memory" (в памяти процесса) или "redis"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# URL подключения к Redis
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Максимальное количество записей в кэше в памяти процесса
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10_000))
+# Время жизни закэшированной страницы списка задач в секундах
+TODO_LIST_CACHE_TTL_SECONDS = float(os.getenv("TODO_LIST_CACHE_TTL_SECONDS", 60))
+# --------------------------------------------------------------------------------
+
+# Блок настроек ограничения частоты запросов аутентификации
+# --------------------------------------------------------------------------------
+# Включение ограничения частоты запросов входа и регистрации
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+# Бэкенд счётчиков: "memory" (в памяти процесса) или "redis" (общий для воркеров, REDIS_URL)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+# Максимальное количество ключей в бэкенде в памяти процесса
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100_000))
+# Запас запросов с одного IP и скорость его пополнения в запросах в секунду
+RATE_LIMIT_IP_CAPACITY = float(os.getenv("RATE_LIMIT_IP_CAPACITY", 20))
+RATE_LIMIT_IP_REFILL_PER_SECOND = float(os.getenv("RATE_LIMIT_IP_REFILL_PER_SECOND", 1))
+# Запас запросов к одному email и скорость его пополнения в запросах в секунду
+RATE_LIMIT_EMAIL_CAPACITY = float(os.getenv("RATE_LIMIT_EMAIL_CAPACITY", 5))
+RATE_LIMIT_EMAIL_REFILL_PER_SECOND = float(os.getenv("RATE_LIMIT_EMAIL_REFILL_PER_SECOND", 0.1))
+# Адреса прокси (nginx), от которых принимается заголовок X-Real-IP, через запятую
+RATE_LIMIT_TRUSTED_PROXIES = frozenset(
+    host.strip() for host in os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1").split(",") if host.strip()
+)
+# --------------------------------------------------------------------------------
+
+# Блок настроек фильтра зарегистрированных email
+# --------------------------------------------------------------------------------
+# Проверка email по фильтру Блума перед запросом к базе данных
+EMAIL_FILTER_ENABLED = os.getenv("EMAIL_FILTER_ENABLED", "True").lower() == "true"
+# Минимальная ёмкость фильтра (фильтр пересобирается с запасом x2 от числа пользователей)
+EMAIL_FILTER_CAPACITY = int(os.getenv("EMAIL_FILTER_CAPACITY", 1_000_000))
+# Допустимая доля ложных срабатываний фильтра
+EMAIL_FILTER_ERROR_RATE = float(os.getenv("EMAIL_FILTER_ERROR_RATE", 0.01))
+# Интервал фонового дочитывания пользователей других воркеров в секундах
+EMAIL_FILTER_SYNC_INTERVAL_SECONDS = float(os.getenv("EMAIL_FILTER_SYNC_INTERVAL_SECONDS", 1))
+# --------------------------------------------------------------------------------
+
+# Блок настроек прогрева при старте
+# --------------------------------------------------------------------------------
+# Прогрев соединений, хеширования и JWT до приёма запросов
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "True").lower() == "true"
+# Количество заранее открываемых соединений пула (не больше DB_POOL_SIZE)
+WARMUP_DB_CONNECTIONS = int(os.getenv("WARMUP_DB_CONNECTIONS", 5))
+# Максимальное время прогрева в секундах, после него воркер начинает принимать запросы
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", 30))
+# --------------------------------------------------------------------------------
+
+# Блок настроек проверок живости и готовности
+# --------------------------------------------------------------------------------
+# Интервал фоновых проверок в секундах
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", 1))
+# Таймаут проверки подключения к базе данных в секундах
+HEALTH_DB_TIMEOUT_SECONDS = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", 1))
+# Максимальная доля выданных соединений пула (от DB_POOL_SIZE + DB_MAX_OVERFLOW)
+HEALTH_DB_POOL_SATURATION_MAX = float(os.getenv("HEALTH_DB_POOL_SATURATION_MAX", 0.9))
+# Максимальная задержка цикла событий в секундах
+HEALTH_LOOP_LAG_MAX_SECONDS = float(os.getenv("HEALTH_LOOP_LAG_MAX_SECONDS", 0.5))
+# Максимальная доля заполненности очереди пула хеширования (от PASSWORD_HASHING_QUEUE_SIZE)
+HEALTH_HASHING_QUEUE_SATURATION_MAX = float(os.getenv("HEALTH_HASHING_QUEUE_SATURATION_MAX", 0.9))
 # --------------------------------------------------------------------------------
@@ -0,0 +1,142 @@
+"""Файл контейнера зависимостей.
+
+Контейнер хранит объекты, не зависящие от запроса (пул хеширования, ключи JWT,
+кэши), и создаёт их лениво при первом обращении. Сервисы, зависящие
+от сессии базы данных, собираются на каждый запрос из этих объектов.
+"""
+from functools import cached_property
+
+from core.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend, TodoListCache
+from core.config import PASSWORD_HASHING_EXECUTOR, PASSWORD_HASHING_WORKERS, \
+    PASSWORD_HASHING_QUEUE_SIZE, ACCESS_TOKEN_CACHE_SIZE, CACHE_BACKEND, REDIS_URL, \
+    CACHE_MAX_ENTRIES, TODO_LIST_CACHE_TTL_SECONDS, RATE_LIMIT_BACKEND, RATE_LIMIT_MAX_KEYS, \
+    RATE_LIMIT_IP_CAPACITY, RATE_LIMIT_IP_REFILL_PER_SECOND, RATE_LIMIT_EMAIL_CAPACITY, \
+    RATE_LIMIT_EMAIL_REFILL_PER_SECOND, EMAIL_FILTER_CAPACITY, EMAIL_FILTER_ERROR_RATE, \
+    EMAIL_FILTER_SYNC_INTERVAL_SECONDS, TOKEN_REVOCATION_BACKEND, TOKEN_REVOCATION_BUCKET_SECONDS, \
+    DB_REPLICA_MAX_LAG_SECONDS, DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS, DB_READ_YOUR_WRITES_SECONDS, \
+    HEALTH_PROBE_INTERVAL_SECONDS, HEALTH_DB_TIMEOUT_SECONDS, HEALTH_DB_POOL_SATURATION_MAX, \
+    HEALTH_LOOP_LAG_MAX_SECONDS, HEALTH_HASHING_QUEUE_SATURATION_MAX
+from core.email_filter import EmailFilter
+from core.hashing import PasswordHashingPool
+from core.health import HealthProber
+from core.ratelimit import RateLimitBackend, MemoryRateLimitBackend, RedisRateLimitBackend, \
+    RateLimitRule, AuthRateLimiter
+from core.revocation import RevocationStore, MemoryRevocationStore, RedisRevocationStore
+from core.tokens import JWTKeys, AccessTokenVerifier
+from database.replica import ReplicaRouter
+
+
+class Container:
+    """Контейнер общих для всех запросов зависимостей.
+
+    Любой объект можно подменить присваиванием атрибута, например в тестах:
+    `container.jwt_keys = JWTKeys(...)`.
+    """
+
+    @cached_property
+    def hashing_pool(self) -> PasswordHashingPool:
+        """Пул хеширования паролей."""
+        return PasswordHashingPool(
+            PASSWORD_HASHING_EXECUTOR, PASSWORD_HASHING_WORKERS, PASSWORD_HASHING_QUEUE_SIZE
+        )
+
+    @cached_property
+    def jwt_keys(self) -> JWTKeys:
+        """Ключи JWT."""
+        return JWTKeys.from_config()
+
+    @cached_property
+    def token_verifier(self) -> AccessTokenVerifier:
+        """Проверка токенов доступа с кэшем."""
+        return AccessTokenVerifier(self.jwt_keys, ACCESS_TOKEN_CACHE_SIZE)
+
+    @cached_property
+    def revocation_store(self) -> RevocationStore:
+        """Хранилище отозванных токенов обновления."""
+        if TOKEN_REVOCATION_BACKEND == "redis":
+            return RedisRevocationStore(REDIS_URL, TOKEN_REVOCATION_BUCKET_SECONDS)
+        return MemoryRevocationStore(TOKEN_REVOCATION_BUCKET_SECONDS)
+
+    @cached_property
+    def cache_backend(self) -> CacheBackend:
+        """Бэкенд общего кэша."""
+        if CACHE_BACKEND == "redis":
+            return RedisCacheBackend(REDIS_URL)
+        return MemoryCacheBackend(CACHE_MAX_ENTRIES)
+
+    @cached_property
+    def todo_list_cache(self) -> TodoListCache:
+        """Кэш страниц списка задач."""
+        return TodoListCache(self.cache_backend, TODO_LIST_CACHE_TTL_SECONDS)
+
+    @cached_property
+    def replica_router(self) -> ReplicaRouter:
+        """Выбор сессии для чтения: реплика или основная база."""
+        # Отметки об изменениях не должны вытесняться страницами списка задач
+        # из общего LRU кэша в памяти процесса
+        write_marks: CacheBackend = (
+            self.cache_backend if CACHE_BACKEND == "redis" else MemoryCacheBackend(CACHE_MAX_ENTRIES)
+        )
+        return ReplicaRouter(write_marks, DB_REPLICA_MAX_LAG_SECONDS,
+                             DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS, DB_READ_YOUR_WRITES_SECONDS)
+
+    @cached_property
+    def email_filter(self) -> EmailFilter:
+        """Фильтр зарегистрированных email."""
+        return EmailFilter(self.cache_backend, EMAIL_FILTER_CAPACITY, EMAIL_FILTER_ERROR_RATE,
+                           EMAIL_FILTER_SYNC_INTERVAL_SECONDS)
+
+    @cached_property
+    def rate_limit_backend(self) -> RateLimitBackend:
+        """Бэкенд счётчиков ограничения частоты запросов."""
+        if RATE_LIMIT_BACKEND == "redis":
+            return RedisRateLimitBackend(REDIS_URL)
+        return MemoryRateLimitBackend(RATE_LIMIT_MAX_KEYS)
+
+    @cached_property
+    def auth_rate_limiter(self) -> AuthRateLimiter:
+        """Ограничение частоты запросов входа и регистрации."""
+        return AuthRateLimiter(
+            self.rate_limit_backend,
+            ip_rule=RateLimitRule(RATE_LIMIT_IP_CAPACITY, RATE_LIMIT_IP_REFILL_PER_SECOND),
+            email_rule=RateLimitRule(RATE_LIMIT_EMAIL_CAPACITY, RATE_LIMIT_EMAIL_REFILL_PER_SECOND),
+        )
+
+    @cached_property
+    def health_prober(self) -> HealthProber:
+        """Фоновые проверки живости и готовности воркера."""
+        return HealthProber(self.hashing_pool, HEALTH_PROBE_INTERVAL_SECONDS, HEALTH_DB_TIMEOUT_SECONDS,
+                            HEALTH_DB_POOL_SATURATION_MAX, HEALTH_LOOP_LAG_MAX_SECONDS,
+                            HEALTH_HASHING_QUEUE_SATURATION_MAX)
+
+    async def shutdown(self) -> None:
+        """Освобождение ресурсов и сброс созданных объектов."""
+        # Проверки останавливаются первыми, пока используемые ими объекты живы
+        health_prober: HealthProber | None = self.__dict__.get("health_prober")
+        if health_prober is not None:
+            await health_prober.stop()
+
+        email_filter: EmailFilter | None = self.__dict__.get("email_filter")
+        if email_filter is not None:
+            await email_filter.stop()
+
+        hashing_pool: PasswordHashingPool | None = self.__dict__.get("hashing_pool")
+        if hashing_pool is not None:
+            hashing_pool.shutdown()
+
+        revocation_store: RevocationStore | None = self.__dict__.get("revocation_store")
+        if revocation_store is not None:
+            await revocation_store.close()
+
+        cache_backend: CacheBackend | None = self.__dict__.get("cache_backend")
+        if cache_backend is not None:
+            await cache_backend.close()
+
+        rate_limit_backend: RateLimitBackend | None = self.__dict__.get("rate_limit_backend")
+        if rate_limit_backend is not None:
+            await rate_limit_backend.close()
+
+        self.__dict__.clear()
+
+
+container = Container()
@@ -0,0 +1,307 @@
+"""Файл фильтра зарегистрированных email.
+
+Фильтр Блума в памяти процесса отвечает "email точно не зарегистрирован"
+без обращения к базе данных, поэтому вход с незарегистрированным email
+(перебор адресов, опечатки) не нагружает Postgres. Ответ "возможно
+зарегистрирован" проверяется в базе как раньше.
+
+Фильтр заполняется из таблицы users при старте воркера и пополняется при
+регистрации. Новых пользователей других воркеров фильтр дочитывает фоновой
+задачей раз в EMAIL_FILTER_SYNC_INTERVAL_SECONDS. Кроме того, после
+регистрации увеличивается версия в общем кэше (CACHE_BACKEND): получив
+отрицательный ответ, воркер сверяет версию и при её изменении дочитывает
+пользователей сразу. Дочитывание идёт в собственной сессии фильтра, а не
+в сессии запроса.
+С бэкендом кэша в памяти процесса версия видна только своему воркеру,
+поэтому при нескольких воркерах рекомендуется CACHE_BACKEND=redis.
+"""
+import asyncio
+import hashlib
+import math
+import time
+from typing import Any, Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import CacheBackend, RedisError, SingleFlight
+from core.logger import logger
+from database.models.users import User
+
+
+# Ключ версии, увеличиваемой при каждой регистрации
+EMAIL_FILTER_VERSION_KEY = "users:email_filter:version"
+# Ключ поколения, увеличиваемого командой пересборки фильтра
+EMAIL_FILTER_GENERATION_KEY = "users:email_filter:generation"
+# Транзакции регистрации фиксируются не в порядке ID, поэтому дочитывание
+# захватывает и последние уже прочитанные ID
+EMAIL_FILTER_SYNC_ID_OVERLAP = 1000
+# Количество строк, получаемых с сервера за раз при заполнении фильтра
+EMAIL_FILTER_FETCH_SIZE = 10_000
+
+
+class BloomFilter:
+    """Фильтр Блума для строк.
+
+    Размер битового массива и количество хеш-функций рассчитываются из
+    ожидаемого количества элементов и допустимой доли ложных срабатываний.
+
+    Args:
+        capacity (int): Ожидаемое количество элементов.
+        error_rate (float): Допустимая доля ложных срабатываний при `capacity` элементах.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("Некорректные параметры фильтра Блума")
+
+        self.capacity: int = capacity
+        self.size: int = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count: int = max(1, round(self.size / capacity * math.log(2)))
+        self.bits: bytearray = bytearray((self.size + 7) // 8)
+        # Количество добавленных различных элементов (приблизительно)
+        self.count: int = 0
+
+    def _positions(self, item: str) -> list[int]:
+        # Двойное хеширование: позиции h1 + i * h2 из одного хеша blake2b
+        digest: bytes = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1: int = int.from_bytes(digest[:8], "little")
+        h2: int = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> bool:
+        """Добавление элемента.
+
+        Args:
+            item (str): Элемент.
+
+        Returns:
+            bool: True, если элемента в фильтре ещё не было.
+        """
+        is_new: bool = False
+        for position in self._positions(item):
+            mask: int = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                is_new = True
+        if is_new:
+            self.count += 1
+        return is_new
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+    def expected_false_positive_rate(self) -> float:
+        """Расчётная доля ложных срабатываний при текущем заполнении."""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class EmailFilter:
+    """Фильтр зарегистрированных email, синхронизируемый с таблицей users.
+
+    Email передаются уже нормализованными (см. `normalize_email`). Пока фильтр
+    не заполнен, все email считаются возможно зарегистрированными.
+
+    Args:
+        backend (CacheBackend): Бэкенд общего кэша для версии фильтра.
+        capacity (int): Минимальная ёмкость фильтра.
+        error_rate (float): Допустимая доля ложных срабатываний.
+        sync_interval (float): Максимальный интервал между дочитываниями в секундах.
+        clock (Callable[[], float]): Источник текущего времени в секундах.
+    """
+
+    def __init__(self, backend: CacheBackend, capacity: int, error_rate: float,
+                 sync_interval: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.backend: CacheBackend = backend
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.sync_interval: float = sync_interval
+        self._clock: Callable[[], float] = clock
+        self.single_flight: SingleFlight = SingleFlight()
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+        self.bloom: BloomFilter | None = None
+        self.max_user_id: int = 0
+        self.version: int | None = None
+        self.generation: int | None = None
+        self.synced_at: float = -math.inf
+
+        self.negatives: int = 0
+        self.positives: int = 0
+        self.false_positives: int = 0
+
+    async def _load(self, db: AsyncSession, bloom: BloomFilter, after_id: int) -> int:
+        # Возвращает максимальный прочитанный ID
+        max_user_id: int = after_id
+        result: Any = await db.stream(
+            select(User.id, func.lower(User.email))
+            .where(User.id > after_id)
+            .execution_options(yield_per=EMAIL_FILTER_FETCH_SIZE)
+        )
+        async for rows in result.partitions():
+            for user_id, email in rows:
+                bloom.add(email)
+                max_user_id = max(max_user_id, user_id)
+        return max_user_id
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Заполнение нового фильтра всеми email из таблицы users.
+
+        Args:
+            db (AsyncSession): Сессия базы данных.
+        """
+        # Версии читаются до запроса, чтобы регистрации во время чтения
+        # изменили версию и были дочитаны позже
+        generation: int = await self.backend.get_version(EMAIL_FILTER_GENERATION_KEY)
+        version: int = await self.backend.get_version(EMAIL_FILTER_VERSION_KEY)
+
+        users_count: int = await db.scalar(select(func.count()).select_from(User)) or 0
+        # Запас ёмкости под новые регистрации до следующей пересборки
+        bloom = BloomFilter(max(self.capacity, users_count * 2), self.error_rate)
+        max_user_id: int = await self._load(db, bloom, 0)
+
+        self.bloom, self.max_user_id = bloom, max_user_id
+        self.version, self.generation = version, generation
+        self.synced_at = self._clock()
+        logger.info("Фильтр email заполнен", users=bloom.count, size_bytes=len(bloom.bits))
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Дочитывание пользователей, зарегистрированных после последней синхронизации.
+
+        Если фильтр переполнен или запрошена пересборка (изменилось поколение),
+        фильтр заполняется заново.
+
+        Args:
+            db (AsyncSession): Сессия базы данных.
+        """
+        generation: int = await self.backend.get_version(EMAIL_FILTER_GENERATION_KEY)
+        if self.bloom is None or generation != self.generation or self.bloom.count > self.bloom.capacity:
+            await self.rebuild(db)
+            return
+
+        version: int = await self.backend.get_version(EMAIL_FILTER_VERSION_KEY)
+        self.max_user_id = await self._load(
+            db, self.bloom, max(0, self.max_user_id - EMAIL_FILTER_SYNC_ID_OVERLAP)
+        )
+        self.version = version
+        self.synced_at = self._clock()
+
+    async def _sync_in_session(self) -> None:
+        if self._session_factory is None:
+            raise RuntimeError("Фильтр email не запущен, вызовите start()")
+        async with self._session_factory() as db:
+            await self.sync(db)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.single_flight.do("sync", self._sync_in_session)
+            except (SQLAlchemyError, OSError, RedisError) as e:
+                logger.warning("Не удалось синхронизировать фильтр email", error=str(e))
+
+    async def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Заполнение фильтра и запуск фонового дочитывания.
+
+        Если заполнить фильтр не удалось, ошибка передаётся вызывающему, а
+        фоновая задача повторит заполнение при следующем дочитывании.
+
+        Args:
+            session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной базы.
+        """
+        self._session_factory = session_factory
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="email-filter-sync")
+        async with session_factory() as db:
+            await self.rebuild(db)
+
+    async def stop(self) -> None:
+        """Остановка фонового дочитывания."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def might_exist(self, email: str) -> bool:
+        """Проверка, может ли email быть зарегистрирован.
+
+        Args:
+            email (str): Нормализованный email.
+
+        Returns:
+            bool: False, если email точно не зарегистрирован.
+        """
+        if self.bloom is None or self._session_factory is None:
+            return True
+        if email in self.bloom:
+            self.positives += 1
+            return True
+
+        # Прежде чем отказать, убеждаемся, что фильтр не отстал от других воркеров
+        # (фоновое дочитывание могло задержаться)
+        try:
+            version: int = await self.backend.get_version(EMAIL_FILTER_VERSION_KEY)
+            if version != self.version or self._clock() - self.synced_at >= self.sync_interval:
+                await self.single_flight.do("sync", self._sync_in_session)
+        except (SQLAlchemyError, OSError, RedisError) as e:
+            logger.warning("Не удалось синхронизировать фильтр email", error=str(e))
+            return True
+
+        if email in self.bloom:
+            self.positives += 1
+            return True
+
+        self.negatives += 1
+        return False
+
+    async def add(self, email: str) -> None:
+        """Добавление email зарегистрированного пользователя.
+
+        Args:
+            email (str): Нормализованный email.
+        """
+        if self.bloom is None:
+            return
+
+        self.bloom.add(email)
+        try:
+            version: int = await self.backend.incr_version(EMAIL_FILTER_VERSION_KEY)
+        except RedisError as e:
+            # Другие воркеры дочитают пользователя по интервалу синхронизации
+            logger.warning("Не удалось обновить версию фильтра email", error=str(e))
+            return
+        # Своя регистрация уже в фильтре, дочитывание нужно только ради чужих
+        if self.version is not None and version == self.version + 1:
+            self.version = version
+
+    def record_false_positive(self) -> None:
+        """Учёт email, который фильтр пропустил, но в базе его не оказалось."""
+        if self.bloom is not None:
+            self.false_positives += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Метрики фильтра.
+
+        Returns:
+            dict[str, int | float]: Заполнение, ответы фильтра и доли ложных срабатываний:
+                наблюдаемая (среди незарегистрированных email) и расчётная.
+        """
+        checked_missing: int = self.negatives + self.false_positives
+        return {
+            "ready": int(self.bloom is not None),
+            "count": self.bloom.count if self.bloom is not None else 0,
+            "capacity": self.bloom.capacity if self.bloom is not None else 0,
+            "negatives": self.negatives,
+            "positives": self.positives,
+            "false_positives": self.false_positives,
+            "false_positive_rate": self.false_positives / checked_missing if checked_missing else 0.0,
+            "expected_false_positive_rate": (
+                self.bloom.expected_false_positive_rate() if self.bloom is not None else 0.0
+            ),
+        }
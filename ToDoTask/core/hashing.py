@@ -0,0 +1,222 @@
+"""Файл пула хеширования паролей.
+
+Argon2 намеренно тяжёлый по CPU и памяти, поэтому хеширование и проверка
+паролей выполняются в отдельном пуле потоков или процессов, а не в цикле
+событий. Пул ограничен: при переполнении очереди запрос отклоняется с 503.
+Параметры argon2 задаются в конфигурации; хеш, созданный с другими
+параметрами, проверяется как обычно, а `needs_rehash` сообщает, что его
+стоит пересчитать.
+"""
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+from typing import Any, Callable, TypeVar
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+
+from core.config import PASSWORD_HASH_TIME_COST, PASSWORD_HASH_MEMORY_COST, \
+    PASSWORD_HASH_PARALLELISM
+from core.errors import ErrorWithStatus
+
+
+T = TypeVar("T")
+
+
+@cache
+def get_password_hasher() -> PasswordHasher:
+    """Получение экземпляра PasswordHasher текущего процесса.
+
+    Returns:
+        PasswordHasher: Хешер паролей с параметрами из конфигурации, общий для
+            всех вызовов в процессе.
+    """
+    return PasswordHasher(
+        time_cost=PASSWORD_HASH_TIME_COST,
+        memory_cost=PASSWORD_HASH_MEMORY_COST,
+        parallelism=PASSWORD_HASH_PARALLELISM,
+    )
+
+
+# Функции выполняются внутри пула, поэтому должны быть доступны на уровне
+# модуля (это требование ProcessPoolExecutor к сериализации).
+def hash_password(password: str) -> str:
+    """Хеширование пароля.
+
+    Args:
+        password (str): Пароль.
+
+    Returns:
+        str: Хэш пароля.
+    """
+    return get_password_hasher().hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Проверка пароля.
+
+    Args:
+        password (str): Пароль.
+        password_hash (str): Хеш пароля.
+
+    Returns:
+        bool: True, если пароль совпадает с хешем, иначе False.
+    """
+    try:
+        return get_password_hasher().verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Проверка, создан ли хеш с параметрами, отличными от текущих.
+
+    Разбирает только заголовок хеша и не хеширует, поэтому выполняется вне пула.
+
+    Args:
+        password_hash (str): Хеш пароля.
+
+    Returns:
+        bool: True, если хеш стоит пересчитать с текущими параметрами.
+    """
+    try:
+        return get_password_hasher().check_needs_rehash(password_hash)
+    except InvalidHashError:
+        return True
+
+
+class PasswordHashingPool:
+    """Ограниченный пул для хеширования паролей.
+
+    Одновременно принимается не более `workers + queue_size` задач,
+    остальные отклоняются с ошибкой 503. Задача занимает место в пуле, пока
+    не завершится в исполнителе, даже если ожидающий её запрос отменён
+    (например, клиент разорвал соединение).
+
+    Args:
+        executor (str): Тип пула: "thread" или "process".
+        workers (int): Количество воркеров пула.
+        queue_size (int): Количество задач, ожидающих свободного воркера.
+    """
+
+    def __init__(self, executor: str, workers: int, queue_size: int) -> None:
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Неизвестный тип пула хеширования: {executor}")
+        if workers < 1 or queue_size < 0:
+            raise ValueError("Некорректный размер пула хеширования")
+
+        self.executor_type: str = executor
+        self.workers: int = workers
+        self.queue_size: int = queue_size
+
+        self._executor: Executor | None = None
+        self._pending: int = 0
+        self._completed_total: int = 0
+        self._failed_total: int = 0
+        self._cancelled_total: int = 0
+        self._rejected_total: int = 0
+
+    def _get_executor(self) -> Executor:
+        # Пул создаётся лениво, чтобы не порождать процессы при импорте
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hashing"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Выполнение функции в пуле.
+
+        Args:
+            func (Callable): Функция, выполняемая в пуле.
+            *args (Any): Аргументы функции.
+
+        Returns:
+            T: Результат функции.
+
+        Raises:
+            ErrorWithStatus[503]: Если очередь пула переполнена.
+        """
+        # Счётчик меняется только из цикла событий, поэтому блокировка не нужна
+        if self._pending >= self.workers + self.queue_size:
+            self._rejected_total += 1
+            raise ErrorWithStatus("Сервис перегружен, повторите попытку позже", 503)
+
+        loop = asyncio.get_running_loop()
+        future: Future[T] = self._get_executor().submit(func, *args)
+        self._pending += 1
+        # Колбэк вызывается из потока исполнителя, поэтому счётчики меняются
+        # через цикл событий. Отмена ожидающего запроса отменяет задачу, только
+        # если она ещё не начала выполняться, иначе место освобождается по её
+        # завершении.
+        future.add_done_callback(lambda done: self._call_in_loop(loop, self._finish, done))
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _call_in_loop(loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Цикл событий уже закрыт при остановке
+            pass
+
+    def _finish(self, future: Future[Any]) -> None:
+        self._pending -= 1
+        if future.cancelled():
+            self._cancelled_total += 1
+        elif future.exception() is not None:
+            self._failed_total += 1
+        else:
+            self._completed_total += 1
+
+    async def hash_password(self, password: str) -> str:
+        """Асинхронное хеширование пароля.
+
+        Args:
+            password (str): Пароль.
+
+        Returns:
+            str: Хэш пароля.
+        """
+        return await self.run(hash_password, password)
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        """Асинхронная проверка пароля.
+
+        Args:
+            password (str): Пароль.
+            password_hash (str): Хеш пароля.
+
+        Returns:
+            bool: True, если пароль совпадает с хешем, иначе False.
+        """
+        return await self.run(verify_password, password, password_hash)
+
+    def stats(self) -> dict[str, int]:
+        """Метрики загруженности пула.
+
+        Returns:
+            dict[str, int]: Размер пула, занятые воркеры, длина очереди и счётчики
+                задач: успешно выполненных, завершившихся ошибкой, отменённых до
+                начала выполнения и отклонённых.
+        """
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "busy": min(self._pending, self.workers),
+            "queued": max(self._pending - self.workers, 0),
+            "completed_total": self._completed_total,
+            "failed_total": self._failed_total,
+            "cancelled_total": self._cancelled_total,
+            "rejected_total": self._rejected_total,
+        }
+
+    def shutdown(self) -> None:
+        """Остановка пула с ожиданием уже принятых задач."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
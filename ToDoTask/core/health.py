@@ -0,0 +1,180 @@
+"""Файл фоновых проверок живости и готовности воркера.
+
+Проверки выполняются фоновой задачей раз в HEALTH_PROBE_INTERVAL_SECONDS,
+а /live и /ready отдают последний результат, поэтому проверки оркестратора
+и балансировщика с любой частотой не нагружают базу данных. Проверяются:
+
+- подключение к базе данных (SELECT 1 с таймаутом);
+- заполненность пула соединений (выданные / максимум пула);
+- задержка цикла событий (насколько позже заказанного просыпается задача);
+- заполненность очереди пула хеширования.
+
+Воркер жив, пока фоновая задача просыпается вовремя: если цикл событий
+заблокирован или задача упала, отметка живости устаревает. Живость не
+зависит от базы данных, чтобы оркестратор не перезапускал воркеры при её
+недоступности. Воркер готов, если жив и все проверки пройдены.
+"""
+import asyncio
+import time
+from typing import Any, Callable
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from core.hashing import PasswordHashingPool
+from core.logger import logger
+
+
+class HealthProber:
+    """Фоновые проверки зависимостей воркера с кэшированием результата.
+
+    Args:
+        hashing_pool (PasswordHashingPool): Пул хеширования паролей.
+        interval (float): Интервал проверок в секундах.
+        db_timeout (float): Таймаут проверки базы данных в секундах.
+        pool_saturation_max (float): Максимальная доля выданных соединений пула.
+        loop_lag_max (float): Максимальная задержка цикла событий в секундах.
+        hashing_queue_saturation_max (float): Максимальная доля заполненности очереди хеширования.
+        clock (Callable[[], float]): Источник текущего времени в секундах.
+    """
+
+    def __init__(self, hashing_pool: PasswordHashingPool, interval: float, db_timeout: float,
+                 pool_saturation_max: float, loop_lag_max: float,
+                 hashing_queue_saturation_max: float,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.hashing_pool: PasswordHashingPool = hashing_pool
+        self.interval: float = interval
+        self.db_timeout: float = db_timeout
+        self.pool_saturation_max: float = pool_saturation_max
+        self.loop_lag_max: float = loop_lag_max
+        self.hashing_queue_saturation_max: float = hashing_queue_saturation_max
+        self._clock: Callable[[], float] = clock
+
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._on_probe: Callable[[], None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.loop_lag: float = 0.0
+        self.checks: dict[str, dict[str, Any]] = {}
+        self.checked_at: float | None = None
+        # Последнее пробуждение фоновой задачи
+        self.beat_at: float | None = None
+
+    def _pool_saturation(self, session_factory: async_sessionmaker[AsyncSession]) -> float | None:
+        engine: AsyncEngine | None = session_factory.kw.get("bind")
+        pool: Any = engine.pool if engine is not None else None
+        if pool is None or not hasattr(pool, "stats"):
+            return None
+        stats: dict[str, int | float] = pool.stats()
+        capacity: int | float = stats["pool_size"] + stats["max_overflow"]
+        return stats["checked_out"] / capacity if capacity > 0 else 0.0
+
+    async def _check_db(self, session_factory: async_sessionmaker[AsyncSession]) -> dict[str, Any]:
+        started: float = self._clock()
+        try:
+            async with session_factory() as db:
+                await asyncio.wait_for(db.execute(text("SELECT 1")), self.db_timeout)
+        except (SQLAlchemyError, OSError, TimeoutError) as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+        return {"ok": True, "latency_seconds": round(self._clock() - started, 4)}
+
+    async def probe(self) -> None:
+        """Выполнение всех проверок и сохранение результата."""
+        if self._session_factory is None:
+            raise RuntimeError("Проверки не запущены, вызовите start()")
+
+        checks: dict[str, dict[str, Any]] = {"database": await self._check_db(self._session_factory)}
+
+        saturation: float | None = self._pool_saturation(self._session_factory)
+        checks["db_pool"] = {
+            "ok": saturation is None or saturation <= self.pool_saturation_max,
+            "saturation": round(saturation, 4) if saturation is not None else None,
+        }
+
+        checks["event_loop"] = {
+            "ok": self.loop_lag <= self.loop_lag_max,
+            "lag_seconds": round(self.loop_lag, 4),
+        }
+
+        hashing_stats: dict[str, int] = self.hashing_pool.stats()
+        queue_saturation: float = (
+            hashing_stats["queued"] / hashing_stats["queue_size"] if hashing_stats["queue_size"] else 0.0
+        )
+        checks["password_hashing"] = {
+            "ok": queue_saturation <= self.hashing_queue_saturation_max,
+            "queued": hashing_stats["queued"],
+        }
+
+        if self.checks and all(check["ok"] for check in self.checks.values()) \
+                and not all(check["ok"] for check in checks.values()):
+            logger.warning("Воркер не готов принимать запросы",
+                           failed=[name for name, check in checks.items() if not check["ok"]])
+
+        self.checks = checks
+        self.checked_at = self._clock()
+
+    async def _run(self) -> None:
+        while True:
+            started: float = self._clock()
+            await asyncio.sleep(self.interval)
+            # Задача просыпается позже заказанного, если цикл событий занят
+            self.beat_at = self._clock()
+            self.loop_lag = max(0.0, self.beat_at - started - self.interval)
+            try:
+                await self.probe()
+                if self._on_probe is not None:
+                    self._on_probe()
+            except Exception as e:
+                # Ошибка одной проверки не должна останавливать проверки
+                logger.error("Проверка готовности завершилась ошибкой", error=str(e))
+
+    async def start(self, session_factory: async_sessionmaker[AsyncSession],
+                    on_probe: Callable[[], None] | None = None) -> None:
+        """Первая проверка и запуск фоновых проверок.
+
+        Args:
+            session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной базы.
+            on_probe (Callable[[], None] | None): Вызывается после каждой фоновой
+                проверки (например, обновление показателей воркера).
+        """
+        self._session_factory = session_factory
+        self._on_probe = on_probe
+        await self.probe()
+        self.beat_at = self._clock()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="health-prober")
+
+    async def stop(self) -> None:
+        """Остановка фоновых проверок."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def is_live(self) -> bool:
+        """Проверка живости: фоновая задача просыпалась не позже трёх интервалов назад."""
+        return self.beat_at is not None and self._clock() - self.beat_at <= self.interval * 3
+
+    def is_ready(self) -> bool:
+        """Проверка готовности: воркер жив, результат проверок свежий и все проверки пройдены."""
+        return self.is_live() and self.checked_at is not None \
+            and self._clock() - self.checked_at <= self.interval * 3 + self.db_timeout \
+            and all(check["ok"] for check in self.checks.values())
+
+    def status(self) -> dict[str, Any]:
+        """Последний результат проверок.
+
+        Returns:
+            dict[str, Any]: Живость, готовность, возраст результата и проверки.
+        """
+        return {
+            "live": self.is_live(),
+            "ready": self.is_ready(),
+            "age_seconds": (
+                round(self._clock() - self.checked_at, 4) if self.checked_at is not None else None
+            ),
+            "checks": self.checks,
+        }
@@ -1,20 +1,206 @@
+"""Файл настройки логирования.
 
-import structlog
+В режиме отладки логи выводятся в консоль в читаемом виде. В production
+логи пишутся в stdout в JSON фоновым потоком: цикл событий только кладёт
+запись в ограниченную очередь и не ждёт вывода. Логи запросов прореживаются.
+"""
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any, Callable, TextIO
+
+import structlog
+
+from core.config import DEBUG_MODE, LOG_LEVEL, LOG_QUEUE_SIZE, LOG_ACCESS_SAMPLE_RATE
+
+
+# Событие лога запроса
+ACCESS_LOG_EVENT = "request"
+# Уровни, логи которых могут быть отброшены при прореживании
+SAMPLED_LEVELS = frozenset({"debug", "info"})
+# Максимальное количество записей, выводимых за одну запись в поток
+LOG_WRITE_BATCH_SIZE = 256
+
+
+class EventSampler:
+    """Процессор structlog, прореживающий частые события.
+
+    Отбрасываются только события уровней debug и info, предупреждения
+    и ошибки пишутся всегда.
+
+    Args:
+        rates (dict[str, float]): Доля записываемых событий по имени события.
+        random_func (Callable[[], float]): Источник случайных чисел от 0 до 1.
+    """
+
+    def __init__(self, rates: dict[str, float],
+                 random_func: Callable[[], float] = random.random) -> None:
+        self.rates: dict[str, float] = rates
+        self._random: Callable[[], float] = random_func
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+        rate: float | None = self.rates.get(event_dict.get("event"))
+        if rate is not None and method_name in SAMPLED_LEVELS and self._random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+
+class QueueLogWriter:
+    """Запись логов в поток вывода фоновым потоком через ограниченную очередь.
+
+    Записи сериализуются в JSON уже в фоновом потоке. При переполнении очереди
+    записи отбрасываются и учитываются в `dropped`, чтобы медленный вывод
+    не останавливал обработку запросов.
+
+    Args:
+        stream (TextIO): Поток вывода.
+        maxsize (int): Максимальное количество записей в очереди.
+    """
+
+    def __init__(self, stream: TextIO, maxsize: int) -> None:
+        self.stream: TextIO = stream
+        self.maxsize: int = maxsize
+        self.dropped: int = 0
+        self._reset()
+        # Потоки не переживают fork (например, при preload_app в gunicorn),
+        # поэтому дочерний процесс запускает свой поток записи
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(self.maxsize)
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def write(self, event_dict: dict[str, Any]) -> None:
+        """Постановка записи в очередь без ожидания.
+
+        Args:
+            event_dict (dict[str, Any]): Запись лога.
+        """
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(event_dict)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            event_dict: dict[str, Any] | None = self._queue.get()
+            lines: list[str] = []
+            # Записи, накопившиеся за время вывода, выводятся одной записью в поток
+            while event_dict is not None:
+                lines.append(json.dumps(event_dict, ensure_ascii=False, default=str))
+                if len(lines) >= LOG_WRITE_BATCH_SIZE:
+                    break
+                try:
+                    event_dict = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    self.dropped += len(lines)
+            if event_dict is None:
+                return
+
+    def close(self, timeout: float = 5) -> None:
+        """Вывод оставшихся записей и остановка потока.
+
+        Args:
+            timeout (float): Максимальное время ожидания в секундах.
+        """
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+
+class QueueLogger:
+    """Логгер structlog, передающий записи в QueueLogWriter.
+
+    Args:
+        writer (QueueLogWriter): Фоновая запись логов.
+    """
+
+    def __init__(self, writer: QueueLogWriter) -> None:
+        self.writer: QueueLogWriter = writer
+
+    def msg(self, **event_dict: Any) -> None:
+        self.writer.write(event_dict)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+def configure_logging(debug: bool = DEBUG_MODE) -> QueueLogWriter | None:
+    """Настройка structlog.
+
+    Args:
+        debug (bool): Вывод в консоль в читаемом виде вместо JSON.
+
+    Returns:
+        QueueLogWriter | None: Фоновая запись логов в production режиме.
+    """
+    sampler = EventSampler({ACCESS_LOG_EVENT: LOG_ACCESS_SAMPLE_RATE})
+
+    if debug:
+        structlog.configure(
+            processors=[
+                sampler,
+                structlog.contextvars.merge_contextvars,
+                structlog.processors.add_log_level,
+                structlog.processors.StackInfoRenderer(),
+                structlog.dev.set_exc_info,
+                structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
+                structlog.dev.ConsoleRenderer()
+            ],
+            wrapper_class=structlog.make_filtering_bound_logger(logging.NOTSET),
+            context_class=dict,
+            logger_factory=structlog.PrintLoggerFactory(),
+            cache_logger_on_first_use=False
+        )
+        return None
+
+    writer = QueueLogWriter(sys.stdout, LOG_QUEUE_SIZE)
+    atexit.register(writer.close)
+    structlog.configure(
+        processors=[
+            # Прореживание первым, чтобы отброшенные события ничего не стоили
+            sampler,
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.StackInfoRenderer(),
+            # Исключение форматируется сразу: в фоновом потоке его уже нет.
+            # Словарь передаётся в QueueLogger как есть, JSON собирается в фоновом потоке
+            structlog.processors.format_exc_info,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(LOG_LEVEL)),
+        context_class=dict,
+        logger_factory=lambda *args: QueueLogger(writer),
+        cache_logger_on_first_use=True
+    )
+    return writer
+
 
-structlog.configure(
-    processors=[
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
-        structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
-        structlog.dev.ConsoleRenderer()
-    ],
-    wrapper_class=structlog.make_filtering_bound_logger(logging.NOTSET),
-    context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=False
-)
+log_writer: QueueLogWriter | None = configure_logging()
 
 logger = structlog.get_logger()
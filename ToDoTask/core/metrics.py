@@ -0,0 +1,136 @@
+"""Файл метрик приложения в формате Prometheus.
+
+Если задана переменная окружения PROMETHEUS_MULTIPROC_DIR (её выставляет
+launcher.py), значения метрик каждого воркера хранятся в файлах этого каталога,
+а /metrics суммирует их по всем воркерам. Иначе метрики хранятся в памяти
+процесса.
+"""
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, \
+    Histogram, REGISTRY, generate_latest, multiprocess
+
+from core.container import container
+from core.email_filter import EmailFilter
+from database import database
+from database.replica import ReplicaRouter
+
+
+# Тип содержимого ответа /metrics
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+# Метка маршрута для запросов, не совпавших ни с одним маршрутом
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Количество обработанных HTTP запросов",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP запроса в секундах",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+# Показатели воркеров складываются, завершившиеся воркеры не учитываются
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Соединения с базой данных, выданные из пула",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Постоянные соединения пула",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Соединения сверх постоянных (отрицательное - ещё не открытые)",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASHING_BUSY = Gauge(
+    "password_hashing_busy", "Воркеры пула хеширования, занятые хешированием",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASHING_QUEUED = Gauge(
+    "password_hashing_queued", "Задачи хеширования, ожидающие свободного воркера",
+    multiprocess_mode="livesum",
+)
+
+# Доля ложных срабатываний фильтра email - худшая среди воркеров
+EMAIL_FILTER_FALSE_POSITIVE_RATE = Gauge(
+    "email_filter_false_positive_rate",
+    "Наблюдаемая доля незарегистрированных email, пропущенных фильтром в базу",
+    multiprocess_mode="livemax",
+)
+EMAIL_FILTER_EXPECTED_FALSE_POSITIVE_RATE = Gauge(
+    "email_filter_expected_false_positive_rate",
+    "Расчётная доля ложных срабатываний фильтра email при текущем заполнении",
+    multiprocess_mode="livemax",
+)
+
+# Отставание реплики - наибольшее среди воркеров, -1 - реплика недоступна
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds", "Отставание реплики базы данных в секундах",
+    multiprocess_mode="livemax",
+)
+DB_READS_TOTAL = Gauge(
+    "db_reads_total", "Чтения, направленные на реплику и в основную базу",
+    ["target"],
+    multiprocess_mode="livesum",
+)
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    """Учёт обработанного запроса.
+
+    Args:
+        method (str): HTTP метод.
+        route (str): Шаблон пути маршрута, например "/todos/{todo_id}".
+        status (int): Код ответа.
+        duration (float): Время обработки в секундах.
+    """
+    HTTP_REQUESTS_TOTAL.labels(method, route, str(status)).inc()
+    HTTP_REQUEST_DURATION_SECONDS.labels(method, route).observe(duration)
+
+
+def update_runtime_gauges() -> None:
+    """Обновление показателей пула соединений и пула хеширования текущего процесса."""
+    if database.engine is not None:
+        pool_stats: dict[str, int | float] = database.get_pool_status()
+        DB_POOL_CHECKED_OUT.set(pool_stats["checked_out"])
+        DB_POOL_SIZE.set(pool_stats["pool_size"])
+        DB_POOL_OVERFLOW.set(pool_stats["overflow"])
+
+    hashing_stats: dict[str, int] = container.hashing_pool.stats()
+    PASSWORD_HASHING_BUSY.set(hashing_stats["busy"])
+    PASSWORD_HASHING_QUEUED.set(hashing_stats["queued"])
+
+    # Фильтр не создаётся ради метрик, если он не используется
+    email_filter: EmailFilter | None = container.__dict__.get("email_filter")
+    if email_filter is not None:
+        email_filter_stats: dict[str, int | float] = email_filter.stats()
+        EMAIL_FILTER_FALSE_POSITIVE_RATE.set(email_filter_stats["false_positive_rate"])
+        EMAIL_FILTER_EXPECTED_FALSE_POSITIVE_RATE.set(email_filter_stats["expected_false_positive_rate"])
+
+    replica_router: ReplicaRouter | None = container.__dict__.get("replica_router")
+    if replica_router is not None and database.read_engine is not None:
+        replica_stats: dict[str, int | float | None] = replica_router.stats()
+        lag: int | float | None = replica_stats["lag_seconds"]
+        DB_REPLICA_LAG_SECONDS.set(lag if lag is not None else -1)
+        DB_READS_TOTAL.labels("replica").set(replica_stats["replica_reads"])
+        DB_READS_TOTAL.labels("primary").set(replica_stats["primary_reads"])
+
+
+def render_metrics() -> bytes:
+    """Метрики всех воркеров в текстовом формате Prometheus.
+
+    Returns:
+        bytes: Тело ответа /metrics.
+    """
+    update_runtime_gauges()
+
+    multiproc_dir: str | None = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not multiproc_dir:
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=multiproc_dir)
+    return generate_latest(registry)
@@ -0,0 +1,110 @@
+"""Файл ASGI middleware приложения.
+
+Проверка Host, ID запроса, время обработки и метрики собраны в один слой,
+работающий напрямую с `scope` и `send`: без BaseHTTPMiddleware не создаётся
+отдельная задача на запрос и не буферизуется тело потоковых ответов.
+"""
+import re
+import time
+import uuid
+from typing import Any, Awaitable, Callable, MutableMapping, Sequence
+
+from structlog.contextvars import bind_contextvars, reset_contextvars
+
+from core.logger import ACCESS_LOG_EVENT, logger
+from core.metrics import UNMATCHED_ROUTE, observe_request
+
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# Заголовки в том виде, в котором они передаются в ASGI
+HOST_HEADER = b"host"
+REQUEST_ID_HEADER = b"x-request-id"
+PROCESS_TIME_HEADER = b"x-process-time"
+# ID запроса от клиента принимается, только если он короткий и без спецсимволов
+REQUEST_ID_PATTERN = re.compile(rb"[A-Za-z0-9._:\-]{1,128}")
+
+# Ответ на запрос с недопустимым Host (как у TrustedHostMiddleware)
+INVALID_HOST_BODY = b"Invalid host header"
+INVALID_HOST_START: Message = {
+    "type": "http.response.start",
+    "status": 400,
+    "headers": [
+        (b"content-type", b"text/plain; charset=utf-8"),
+        (b"content-length", str(len(INVALID_HOST_BODY)).encode()),
+    ],
+}
+INVALID_HOST_RESPONSE_BODY: Message = {"type": "http.response.body", "body": INVALID_HOST_BODY}
+
+
+class RequestContextMiddleware:
+    """Проверка Host, ID запроса, время обработки и метрики запроса.
+
+    ID запроса берётся из заголовка X-Request-ID или генерируется, добавляется
+    в контекст логов и возвращается в ответе вместе с X-Process-Time (время
+    до начала ответа). По завершении запроса пишется лог запроса.
+
+    Args:
+        app (ASGIApp): Оборачиваемое ASGI приложение.
+        allowed_hosts (Sequence[str]): Допустимые значения Host, "*" - любые.
+    """
+
+    def __init__(self, app: ASGIApp, allowed_hosts: Sequence[str] = ("*",)) -> None:
+        self.app: ASGIApp = app
+        self.allow_any_host: bool = "*" in allowed_hosts
+        self.allowed_hosts: frozenset[bytes] = frozenset(host.encode() for host in allowed_hosts)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        host: bytes = b""
+        request_id: bytes | None = None
+        for name, value in scope["headers"]:
+            if name == HOST_HEADER:
+                host = value
+            elif name == REQUEST_ID_HEADER and REQUEST_ID_PATTERN.fullmatch(value):
+                request_id = value
+
+        if not self.allow_any_host and host.split(b":", 1)[0] not in self.allowed_hosts:
+            await send(INVALID_HOST_START)
+            await send(INVALID_HOST_RESPONSE_BODY)
+            return
+
+        if request_id is None:
+            request_id = uuid.uuid4().hex.encode()
+
+        start_time: float = time.perf_counter()
+        status_code: int = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (REQUEST_ID_HEADER, request_id),
+                    (PROCESS_TIME_HEADER, str(time.perf_counter() - start_time).encode()),
+                ]
+            await send(message)
+
+        context_tokens: Any = bind_contextvars(request_id=request_id.decode())
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            process_time: float = time.perf_counter() - start_time
+            # Ошибки сервера пишутся всегда, остальные запросы прореживаются
+            log = logger.error if status_code >= 500 else logger.info
+            log(ACCESS_LOG_EVENT, method=scope["method"], path=scope["path"],
+                status=status_code, duration_ms=round(process_time * 1000, 3))
+            reset_contextvars(**context_tokens)
+
+            # Метка - шаблон пути маршрута, чтобы количество рядов метрик не зависело от ID в путях
+            route: Any = scope.get("route")
+            observe_request(scope["method"], getattr(route, "path_format", UNMATCHED_ROUTE),
+                            status_code, process_time)
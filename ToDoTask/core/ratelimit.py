@@ -0,0 +1,161 @@
+"""Файл ограничения частоты запросов.
+
+Ограничение построено на token bucket: у каждого ключа есть запас токенов,
+который пополняется с постоянной скоростью, запрос забирает один токен.
+Счётчики хранятся в памяти процесса или в Redis, чтобы при нескольких
+воркерах лимит был общим.
+"""
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, NamedTuple
+
+from core.cache import LRUCache, RedisError, aioredis
+from core.logger import logger
+
+
+class RateLimitRule(NamedTuple):
+    """Параметры token bucket.
+
+    Args:
+        capacity (float): Максимальный запас запросов.
+        refill_per_second (float): Скорость пополнения запаса в запросах в секунду.
+    """
+
+    capacity: float
+    refill_per_second: float
+
+
+class RateLimitBackend(ABC):
+    """Базовый бэкенд счётчиков token bucket."""
+
+    @abstractmethod
+    async def acquire(self, key: str, rule: RateLimitRule) -> float:
+        """Попытка забрать токен из корзины ключа.
+
+        Args:
+            key (str): Ключ корзины.
+            rule (RateLimitRule): Параметры корзины.
+
+        Returns:
+            float: 0, если токен получен, иначе через сколько секунд он появится.
+        """
+
+    async def close(self) -> None:
+        """Освобождение ресурсов бэкенда."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Бэкенд счётчиков в памяти процесса.
+
+    Лимит действует отдельно в каждом воркере. Корзины хранятся в LRU кэше
+    и истекают, когда полностью пополнятся.
+
+    Args:
+        maxsize (int): Максимальное количество корзин.
+        clock (Callable[[], float]): Источник текущего времени в секундах.
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock: Callable[[], float] = clock
+        # Корзина - запас токенов и момент его последнего пересчёта
+        self.buckets: LRUCache[str, tuple[float, float]] = LRUCache(maxsize, clock=clock)
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> float:
+        now: float = self._clock()
+        tokens, updated_at = self.buckets.get(key) or (rule.capacity, now)
+        tokens = min(rule.capacity, tokens + (now - updated_at) * rule.refill_per_second)
+
+        if tokens < 1:
+            return (1 - tokens) / rule.refill_per_second
+
+        tokens -= 1
+        self.buckets.set(key, (tokens, now),
+                         expires_at=now + (rule.capacity - tokens) / rule.refill_per_second)
+        return 0.0
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Бэкенд счётчиков в Redis, общий для всех процессов и узлов.
+
+    Args:
+        url (str): URL подключения к Redis.
+    """
+
+    # Атомарный пересчёт корзины по времени Redis, чтобы часы воркеров не влияли
+    # на лимит. Время ожидания возвращается строкой: числа Lua Redis округляет
+    ACQUIRE_SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local refill = tonumber(ARGV[2])
+        local time = redis.call('TIME')
+        local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated_at = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill)
+        if tokens < 1 then
+            return tostring((1 - tokens) / refill)
+        end
+        tokens = tokens - 1
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+        redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / refill * 1000) + 1000)
+        return '0'
+    """
+
+    def __init__(self, url: str) -> None:
+        if aioredis is None:
+            raise RuntimeError("Для RATE_LIMIT_BACKEND=redis требуется пакет redis")
+
+        self.redis: Any = aioredis.Redis.from_url(url)
+        self._acquire: Any = self.redis.register_script(self.ACQUIRE_SCRIPT)
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> float:
+        return float(await self._acquire(keys=[key], args=[rule.capacity, rule.refill_per_second]))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class AuthRateLimiter:
+    """Ограничение частоты запросов аутентификации по IP и по email.
+
+    Сначала проверяется корзина IP: запросы с исчерпанным лимитом IP не
+    расходуют лимит email. При недоступности бэкенда запросы пропускаются.
+
+    Args:
+        backend (RateLimitBackend): Бэкенд счётчиков.
+        ip_rule (RateLimitRule): Лимит запросов с одного IP.
+        email_rule (RateLimitRule): Лимит запросов к одному email.
+    """
+
+    def __init__(self, backend: RateLimitBackend, ip_rule: RateLimitRule,
+                 email_rule: RateLimitRule) -> None:
+        self.backend: RateLimitBackend = backend
+        self.ip_rule: RateLimitRule = ip_rule
+        self.email_rule: RateLimitRule = email_rule
+
+    async def check(self, ip: str | None, email: str | None) -> float:
+        """Учёт запроса в лимитах IP и email.
+
+        Args:
+            ip (str | None): IP клиента.
+            email (str | None): Email, к которому обращается запрос.
+
+        Returns:
+            float: 0, если запрос разрешён, иначе через сколько секунд повторить.
+        """
+        buckets: list[tuple[str, RateLimitRule]] = []
+        if ip:
+            buckets.append((f"ratelimit:auth:ip:{ip}", self.ip_rule))
+        if email:
+            buckets.append((f"ratelimit:auth:email:{email}", self.email_rule))
+
+        for key, rule in buckets:
+            try:
+                retry_after: float = await self.backend.acquire(key, rule)
+            except RedisError as e:
+                logger.warning("Бэкенд ограничения запросов недоступен", error=str(e))
+                return 0.0
+            if retry_after > 0:
+                return retry_after
+
+        return 0.0
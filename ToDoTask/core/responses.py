@@ -0,0 +1,28 @@
+"""Файл JSON ответов приложения.
+
+Ответы сериализуются через orjson вместо стандартного json. Уже
+провалидированная pydantic схема сериализуется сразу в байты через
+pydantic-core: если вернуть из обработчика `FastJSONResponse(schema)`, FastAPI
+не валидирует результат повторно по `response_model` и не прогоняет его
+через `jsonable_encoder`. `response_model` при этом остаётся в описании
+маршрута для документации.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(ORJSONResponse):
+    """JSON ответ через orjson с отдельным путём для pydantic схем.
+
+    Args:
+        content (Any): Pydantic схема или данные, поддерживаемые orjson.
+        status_code (int): HTTP статус ответа.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
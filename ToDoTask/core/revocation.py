@@ -0,0 +1,159 @@
+"""Файл хранилища отозванных токенов.
+
+Отозванные токены хранятся по `jti` только до истечения срока действия
+токена: после него токен и так не пройдёт проверку. Записи разложены по
+корзинам времени истечения (шириной `bucket_seconds`), поэтому истёкшие
+записи удаляются целыми корзинами, а проверка токена смотрит только в
+корзину его `exp`. `jti` хранится в виде 16 байт UUID.
+"""
+import heapq
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+from core.cache import aioredis
+
+
+def jti_to_bytes(jti: str) -> bytes:
+    """Компактное представление jti (UUID в hex) для хранения.
+
+    Args:
+        jti (str): Идентификатор токена.
+
+    Returns:
+        bytes: 16 байт UUID или исходная строка в байтах, если это не UUID.
+    """
+    try:
+        return uuid.UUID(hex=jti).bytes
+    except ValueError:
+        return jti.encode()
+
+
+class RevocationStore(ABC):
+    """Базовое хранилище отозванных токенов.
+
+    Args:
+        bucket_seconds (int): Ширина корзины времени истечения в секундах.
+    """
+
+    def __init__(self, bucket_seconds: int) -> None:
+        self.bucket_seconds: int = bucket_seconds
+
+    def _bucket(self, expires_at: float) -> int:
+        # Номер корзины - конец её интервала, запись удаляется не раньше истечения токена
+        return math.ceil(expires_at / self.bucket_seconds)
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        """Отзыв токена до момента его истечения.
+
+        Args:
+            jti (str): Идентификатор токена.
+            expires_at (float): Момент истечения токена (unix time).
+
+        Returns:
+            bool: True, если токен отозван этим вызовом, False - если уже был отозван.
+        """
+
+    @abstractmethod
+    async def is_revoked(self, jti: str, expires_at: float) -> bool:
+        """Проверка, отозван ли токен.
+
+        Args:
+            jti (str): Идентификатор токена.
+            expires_at (float): Момент истечения токена (unix time).
+
+        Returns:
+            bool: True, если токен отозван.
+        """
+
+    async def close(self) -> None:
+        """Освобождение ресурсов хранилища."""
+
+
+class MemoryRevocationStore(RevocationStore):
+    """Хранилище отозванных токенов в памяти процесса.
+
+    Отзыв действует только в текущем воркере. Истёкшие корзины удаляются
+    при каждом обращении.
+
+    Args:
+        bucket_seconds (int): Ширина корзины времени истечения в секундах.
+        clock (Callable[[], float]): Источник текущего времени (unix time).
+    """
+
+    def __init__(self, bucket_seconds: int, clock: Callable[[], float] = time.time) -> None:
+        super().__init__(bucket_seconds)
+        self._clock: Callable[[], float] = clock
+        self.buckets: dict[int, set[bytes]] = {}
+        # Номера корзин по возрастанию для удаления истёкших
+        self._expiry_heap: list[int] = []
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def purge(self) -> None:
+        """Удаление корзин, все токены которых истекли."""
+        now: float = self._clock()
+        while self._expiry_heap and self._expiry_heap[0] * self.bucket_seconds <= now:
+            del self.buckets[heapq.heappop(self._expiry_heap)]
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        self.purge()
+        if expires_at <= self._clock():
+            return True
+
+        bucket_number: int = self._bucket(expires_at)
+        bucket: set[bytes] | None = self.buckets.get(bucket_number)
+        if bucket is None:
+            bucket = self.buckets[bucket_number] = set()
+            heapq.heappush(self._expiry_heap, bucket_number)
+
+        key: bytes = jti_to_bytes(jti)
+        if key in bucket:
+            return False
+        bucket.add(key)
+        return True
+
+    async def is_revoked(self, jti: str, expires_at: float) -> bool:
+        self.purge()
+        bucket: set[bytes] | None = self.buckets.get(self._bucket(expires_at))
+        return bucket is not None and jti_to_bytes(jti) in bucket
+
+
+class RedisRevocationStore(RevocationStore):
+    """Хранилище отозванных токенов в Redis, общее для всех процессов и узлов.
+
+    Корзина - множество Redis, которое истекает вместе с последним токеном в ней.
+
+    Args:
+        url (str): URL подключения к Redis.
+        bucket_seconds (int): Ширина корзины времени истечения в секундах.
+    """
+
+    def __init__(self, url: str, bucket_seconds: int) -> None:
+        if aioredis is None:
+            raise RuntimeError("Для TOKEN_REVOCATION_BACKEND=redis требуется пакет redis")
+
+        super().__init__(bucket_seconds)
+        self.redis: Any = aioredis.Redis.from_url(url)
+
+    def _key(self, bucket_number: int) -> str:
+        return f"revoked:{bucket_number}"
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        bucket_number: int = self._bucket(expires_at)
+        key: str = self._key(bucket_number)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(key, jti_to_bytes(jti))
+            pipe.expireat(key, bucket_number * self.bucket_seconds)
+            added, _ = await pipe.execute()
+        return added == 1
+
+    async def is_revoked(self, jti: str, expires_at: float) -> bool:
+        return bool(await self.redis.sismember(self._key(self._bucket(expires_at)), jti_to_bytes(jti)))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
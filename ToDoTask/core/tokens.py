@@ -0,0 +1,156 @@
+"""Файл ключей и проверки JWT токенов."""
+import hashlib
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+import jwt
+
+from core.cache import LRUCache
+from core.config import JWT_SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, \
+    REFRESH_TOKEN_EXPIRE_MINUTES
+from core.errors import ErrorWithStatus
+
+
+# Типы токенов, записываемые в поле "type"
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
+@dataclass(frozen=True, slots=True)
+class JWTKeys:
+    """Ключевой материал и время жизни JWT токенов.
+
+    Args:
+        secret_key (str): Секретный ключ подписи.
+        algorithm (str): Алгоритм подписи.
+        access_token_expire_minutes (int): Время жизни токена доступа.
+        refresh_token_expire_minutes (int): Время жизни токена обновления.
+    """
+    secret_key: str
+    algorithm: str
+    access_token_expire_minutes: int
+    refresh_token_expire_minutes: int
+
+    @classmethod
+    def from_config(cls) -> "JWTKeys":
+        """Создание ключей по настройкам приложения.
+
+        Returns:
+            JWTKeys: Ключи JWT.
+        """
+        return cls(
+            secret_key=JWT_SECRET_KEY,
+            algorithm=JWT_ALGORITHM,
+            access_token_expire_minutes=ACCESS_TOKEN_EXPIRE_MINUTES,
+            refresh_token_expire_minutes=REFRESH_TOKEN_EXPIRE_MINUTES,
+        )
+
+
+class AccessTokenVerifier:
+    """Проверка токенов доступа с кэшем уже проверенных токенов.
+
+    Кэш хранит соответствие SHA-256 токена и ID пользователя до истечения
+    срока действия токена, поэтому подпись каждого токена проверяется один раз.
+
+    Args:
+        jwt_keys (JWTKeys): Ключи JWT.
+        cache_size (int): Максимальное количество токенов в кэше.
+    """
+
+    def __init__(self, jwt_keys: JWTKeys, cache_size: int) -> None:
+        self.jwt_keys: JWTKeys = jwt_keys
+        self.cache: LRUCache[bytes, int] = LRUCache(cache_size)
+
+    def verify(self, token: str) -> int:
+        """Проверка токена доступа.
+
+        Args:
+            token (str): JWT токен.
+
+        Returns:
+            int: ID пользователя, извлеченный из токена.
+
+        Raises:
+            ErrorWithStatus: Если токен недействителен (401).
+            ErrorWithStatus: Если срок действия токена истек (401).
+        """
+        token_digest: bytes = hashlib.sha256(token.encode()).digest()
+
+        user_id: int | None = self.cache.get(token_digest)
+        if user_id is not None:
+            return user_id
+
+        try:
+            data: Any = jwt.decode(  # type: ignore
+                token,
+                self.jwt_keys.secret_key,
+                algorithms=[self.jwt_keys.algorithm],
+                options={"require": ["exp"]},
+            )
+        except jwt.ExpiredSignatureError:
+            raise ErrorWithStatus("Срок действия токена истек", 401)
+        except jwt.InvalidTokenError:
+            raise ErrorWithStatus("Неверный токен", 401)
+
+        if not isinstance(data, dict) or type(data.get("user_id")) is not int \
+                or data.get("type") != ACCESS_TOKEN_TYPE:
+            raise ErrorWithStatus("Неверный токен", 401)
+
+        self.cache.set(token_digest, data["user_id"], expires_at=float(data["exp"]))
+
+        return data["user_id"]
+
+    def stats(self) -> dict[str, int]:
+        """Метрики кэша токенов.
+
+        Returns:
+            dict[str, int]: Размер кэша, попадания и промахи.
+        """
+        return self.cache.stats()
+
+
+class RefreshTokenClaims(NamedTuple):
+    """Данные проверенного токена обновления.
+
+    Args:
+        user_id (int): ID пользователя.
+        jti (str): Идентификатор токена.
+        expires_at (float): Момент истечения токена (unix time).
+    """
+
+    user_id: int
+    jti: str
+    expires_at: float
+
+
+def decode_refresh_token(token: str, jwt_keys: JWTKeys) -> RefreshTokenClaims:
+    """Проверка подписи и срока действия токена обновления.
+
+    Args:
+        token (str): JWT токен обновления.
+        jwt_keys (JWTKeys): Ключи JWT.
+
+    Returns:
+        RefreshTokenClaims: Данные токена.
+
+    Raises:
+        ErrorWithStatus: Если токен недействителен (401).
+        ErrorWithStatus: Если срок действия токена истек (401).
+    """
+    try:
+        data: Any = jwt.decode(  # type: ignore
+            token,
+            jwt_keys.secret_key,
+            algorithms=[jwt_keys.algorithm],
+            options={"require": ["exp", "jti"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise ErrorWithStatus("Срок действия токена истек", 401)
+    except jwt.InvalidTokenError:
+        raise ErrorWithStatus("Неверный токен", 401)
+
+    if not isinstance(data, dict) or type(data.get("user_id")) is not int \
+            or data.get("type") != REFRESH_TOKEN_TYPE or not isinstance(data.get("jti"), str):
+        raise ErrorWithStatus("Неверный токен", 401)
+
+    return RefreshTokenClaims(data["user_id"], data["jti"], float(data["exp"]))
@@ -1,28 +1,113 @@
 """Файл подключения к базе данных."""
-from typing import AsyncGenerator
+import uuid
+from typing import Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, \
                                     AsyncSession, AsyncEngine
 
-from core.config import ASYNC_DATABASE_URL, DEBUG_MODE
+from core.config import ASYNC_DATABASE_URL, DEBUG_MODE, DB_POOL_SIZE, DB_MAX_OVERFLOW, \
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_CACHE_SIZE, \
+    DB_PREPARED_STATEMENT_CACHE_SIZE, DB_PGBOUNCER_MODE, ASYNC_DATABASE_REPLICA_URL
+from database.pool import InstrumentedQueuePool
+from database.session import LazySession
 
 
 engine: AsyncEngine | None = None
 AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+# Реплика только для чтения (None, если не настроена)
+read_engine: AsyncEngine | None = None
+ReadSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+# Функция для получения параметров подключения asyncpg
+def get_connect_args(pgbouncer_mode: bool = DB_PGBOUNCER_MODE) -> dict[str, Any]:
+    if pgbouncer_mode:
+        # PgBouncer в режиме пулинга транзакций выдаёт разные серверные соединения
+        # для разных транзакций, поэтому подготовленные выражения не кэшируются,
+        # а их имена уникальны, чтобы не пересекаться на одном серверном соединении
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+
+# Функция для создания движка с настройками пула из конфигурации
+def create_engine(url: str = ASYNC_DATABASE_URL, **kwargs: Any) -> AsyncEngine:
+    options: dict[str, Any] = {
+        "echo": DEBUG_MODE,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": get_connect_args(),
+    }
+    options.update(kwargs)
+    return create_async_engine(url, **options)
 
 
 def init_engine():
-    global engine, AsyncSessionLocal
-    engine = create_async_engine(ASYNC_DATABASE_URL, echo=DEBUG_MODE, future=True)
+    global engine, AsyncSessionLocal, read_engine, ReadSessionLocal
+    engine = create_engine()
     AsyncSessionLocal = async_sessionmaker(
-        autocommit=False, autoflush=False, bind=engine
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
     )
+    if ASYNC_DATABASE_REPLICA_URL:
+        read_engine = create_engine(ASYNC_DATABASE_REPLICA_URL)
+        ReadSessionLocal = async_sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+        )
+
+
+# Функция для закрытия всех соединений пула
+async def dispose_engine() -> None:
+    if engine is not None:
+        await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
 
-# Функциия для получения асинрхонной сессии базы данных
-async def get_db() -> AsyncGenerator[AsyncSession]:
+# Функциия для получения асинрхонной сессии базы данных.
+# Сессия создаётся и берёт соединение из пула только при первом запросе к базе
+async def get_db() -> AsyncGenerator[LazySession]:
     if AsyncSessionLocal is not None:
-        db = AsyncSessionLocal()
+        db = LazySession(AsyncSessionLocal)
         try:
             yield db
         finally:
             await db.close()
+
+
+# Функция для получения сессии реплики только для чтения (None, если реплика не настроена).
+# Сессия подключается к реплике только при первом запросе
+async def get_read_db() -> AsyncGenerator[LazySession | None]:
+    if ReadSessionLocal is None:
+        yield None
+        return
+
+    db = LazySession(ReadSessionLocal)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# Функция для получения фабрики сессий там, где сессия должна жить дольше
+# зависимостей запроса (например, в потоковом ответе)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("База данных не инициализирована, вызовите init_engine()")
+    return AsyncSessionLocal
+
+
+# Функция для получения метрик пула соединений
+def get_pool_status() -> dict[str, int | float]:
+    if engine is None:
+        raise RuntimeError("База данных не инициализирована, вызовите init_engine()")
+    return engine.pool.stats()
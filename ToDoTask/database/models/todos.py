@@ -0,0 +1,23 @@
+from datetime import date
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, Date, ForeignKey, Index, String
+
+from database.models.base import ExtendedBase
+
+
+class TodoItem(ExtendedBase):
+    """Модель задачи."""
+    __tablename__ = "todos"
+    __table_args__ = (
+        # Покрывающие индексы для постраничной выдачи по ключу (due_date, id):
+        # с фильтром по is_done и без него
+        Index("ix_todos_owner_id_is_done_due_date_id", "owner_id", "is_done", "due_date", "id"),
+        Index("ix_todos_owner_id_due_date_id", "owner_id", "due_date", "id"),
+    )
+
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str | None] = mapped_column(String, nullable=True)
+    is_done: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
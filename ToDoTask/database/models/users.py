@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String
+from sqlalchemy import Index, String, func
 
 from database.models.base import ExtendedBase
 
@@ -8,5 +8,9 @@ class User(ExtendedBase):
     """Модель пользователя."""
     __tablename__ = "users"
 
-    email: Mapped[str] = mapped_column(unique=True, nullable=False)
+    email: Mapped[str] = mapped_column(nullable=False)
     password_hash: Mapped[str] = mapped_column(String, nullable=False)
+
+
+# Email уникален без учёта регистра; индекс также служит целью ON CONFLICT при регистрации
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
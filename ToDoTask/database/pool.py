@@ -0,0 +1,60 @@
+"""Файл пула соединений с базой данных.
+
+Пул считает выдачи соединений, время их ожидания и таймауты, чтобы размер
+пула можно было подбирать по реальной нагрузке.
+"""
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Асинхронный пул соединений с метриками ожидания.
+
+    Время ожидания включает ожидание свободного соединения и открытие нового
+    соединения, если пул ещё не заполнен.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts_total: int = 0
+        self.timeouts_total: int = 0
+        self.wait_seconds_total: float = 0.0
+        self.wait_seconds_max: float = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        started: float = time.perf_counter()
+        try:
+            connection: PoolProxiedConnection = super().connect()
+        except PoolTimeoutError:
+            self.timeouts_total += 1
+            raise
+        finally:
+            # Счётчики меняются только из цикла событий, поэтому блокировка не нужна
+            waited: float = time.perf_counter() - started
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        self.checkouts_total += 1
+        return connection
+
+    def stats(self) -> dict[str, int | float]:
+        """Метрики пула.
+
+        Returns:
+            dict[str, int | float]: Размер пула, выданные и свободные соединения,
+                переполнение, счётчики выдач и таймаутов, время ожидания.
+        """
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # Отрицательное значение - сколько постоянных соединений ещё не открыто
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "checkouts_total": self.checkouts_total,
+            "timeouts_total": self.timeouts_total,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
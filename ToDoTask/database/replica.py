@@ -0,0 +1,151 @@
+"""Файл выбора сессии для чтения: реплика или основная база.
+
+Чтение идёт с реплики, пока её отставание не превышает допустимое.
+Отставание проверяется не чаще раза в интервал, при ошибке подключения
+реплика считается недоступной до следующей проверки. Пользователь, только
+что изменивший свои данные, какое-то время читает их из основной базы,
+чтобы увидеть свои изменения (read-your-writes). Отметки об изменениях
+хранятся в Redis, если CACHE_BACKEND=redis, чтобы их видели все воркеры,
+иначе - в отдельном кэше процесса, который не вытесняют страницы задач.
+"""
+import math
+import time
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import CacheBackend, RedisError, SingleFlight
+from core.logger import logger
+
+
+# Отставание в секундах; не реплика (pg_is_in_recovery() = false) не отстаёт.
+# Реплика, применившая весь полученный WAL, не отстаёт: без новых записей на
+# основной базе время последней применённой транзакции растёт, хотя реплика
+# догнала её. Иначе отставание - время с последней применённой транзакции;
+# реплика, ещё не применившая ни одной транзакции, считается отстающей
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    """Выбор сессии для чтения с учётом отставания реплики и своих изменений.
+
+    Args:
+        backend (CacheBackend): Бэкенд для отметок об изменениях (без других записей,
+            чтобы они не вытесняли отметки).
+        max_lag (float): Максимальное отставание реплики в секундах.
+        check_interval (float): Интервал проверки отставания в секундах.
+        read_your_writes (float): Время чтения из основной базы после изменений в секундах.
+        clock (Callable[[], float]): Источник текущего времени в секундах.
+    """
+
+    def __init__(self, backend: CacheBackend, max_lag: float, check_interval: float,
+                 read_your_writes: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.backend: CacheBackend = backend
+        self.max_lag: float = max_lag
+        self.check_interval: float = check_interval
+        self.read_your_writes: float = read_your_writes
+        self._clock: Callable[[], float] = clock
+        self.single_flight: SingleFlight = SingleFlight()
+
+        self.lag: float | None = None
+        self.checked_at: float = -math.inf
+
+        self.replica_reads: int = 0
+        self.primary_reads: int = 0
+
+    @staticmethod
+    def _write_key(user_id: int) -> str:
+        return f"replica:written:{user_id}"
+
+    async def _check_lag(self, read_db: AsyncSession) -> None:
+        try:
+            lag: float | None = await read_db.scalar(REPLICA_LAG_QUERY)
+            # Транзакция проверки не должна держать снимок для последующего чтения
+            await read_db.rollback()
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning("Реплика недоступна", error=str(e))
+            lag = None
+        self.lag = float(lag) if lag is not None else None
+        self.checked_at = self._clock()
+
+    async def is_replica_available(self, read_db: AsyncSession) -> bool:
+        """Проверка, можно ли читать с реплики.
+
+        Args:
+            read_db (AsyncSession): Сессия реплики.
+
+        Returns:
+            bool: True, если реплика доступна и отставание не больше допустимого.
+        """
+        if self._clock() - self.checked_at >= self.check_interval:
+            await self.single_flight.do("lag", lambda: self._check_lag(read_db))
+        return self.lag is not None and self.lag <= self.max_lag
+
+    async def mark_write(self, user_id: int) -> None:
+        """Отметка об изменении данных пользователя.
+
+        Args:
+            user_id (int): ID пользователя.
+        """
+        try:
+            await self.backend.set(self._write_key(user_id), b"1", self.read_your_writes)
+        except RedisError as e:
+            logger.warning("Не удалось отметить изменение данных пользователя", error=str(e))
+
+    async def has_recent_write(self, user_id: int) -> bool:
+        """Проверка, изменял ли пользователь данные в последние `read_your_writes` секунд.
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            bool: True, если изменял (или это неизвестно).
+        """
+        try:
+            return await self.backend.get(self._write_key(user_id)) is not None
+        except RedisError as e:
+            logger.warning("Не удалось проверить изменения данных пользователя", error=str(e))
+            return True
+
+    async def choose(self, db: AsyncSession, read_db: AsyncSession | None,
+                     user_id: int | None = None) -> AsyncSession:
+        """Выбор сессии для чтения.
+
+        Args:
+            db (AsyncSession): Сессия основной базы.
+            read_db (AsyncSession | None): Сессия реплики или None, если реплика не настроена.
+            user_id (int | None): ID пользователя, чьи данные читаются.
+
+        Returns:
+            AsyncSession: Сессия реплики или основной базы.
+        """
+        if read_db is None:
+            return db
+
+        if (user_id is not None and await self.has_recent_write(user_id)) \
+                or not await self.is_replica_available(read_db):
+            self.primary_reads += 1
+            return db
+
+        self.replica_reads += 1
+        return read_db
+
+    def stats(self) -> dict[str, int | float | None]:
+        """Метрики выбора сессии.
+
+        Returns:
+            dict[str, int | float | None]: Последнее отставание реплики и количество
+                чтений с реплики и из основной базы.
+        """
+        return {
+            "lag_seconds": self.lag,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
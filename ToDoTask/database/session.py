@@ -0,0 +1,101 @@
+"""Файл ленивой сессии базы данных.
+
+Сессия запроса создаётся при первом обращении к ней (execute, add, commit
+и т.д.), а соединение берётся из пула при первом запросе к базе. Запросы,
+которые отвечают из кэша и не обращаются к базе, не занимают соединение
+пула. После чтения сессию можно отпустить (`release`), чтобы соединение
+вернулось в пул до конца обработки запроса: например, на время проверки
+пароля или сериализации ответа. Следующее обращение возьмёт соединение
+заново.
+"""
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction, UOWTransaction
+
+
+# Ключ Session.info: в текущей транзакции были изменения, отправленные без commit
+SESSION_HAS_WRITES_KEY = "has_writes"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_executed_writes(orm_execute_state: ORMExecuteState) -> None:
+    # Всё, кроме SELECT (в том числе text()), считается изменением
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[SESSION_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_writes(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[SESSION_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_writes(session: Session, transaction: SessionTransaction) -> None:
+    # commit, rollback или close внешней транзакции
+    if transaction.parent is None:
+        session.info.pop(SESSION_HAS_WRITES_KEY, None)
+
+
+class LazySession:
+    """Прокси AsyncSession, создающий сессию при первом обращении.
+
+    Все атрибуты и методы AsyncSession доступны через прокси.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory: async_sessionmaker[AsyncSession] = session_factory
+        self._session: AsyncSession | None = None
+
+    @property
+    def is_opened(self) -> bool:
+        """True, если сессия уже создана."""
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        """Сессия, создаваемая при первом обращении."""
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    def in_transaction(self) -> bool:
+        return self._session is not None and self._session.in_transaction()
+
+    async def release(self) -> None:
+        """Возврат соединения в пул, если текущая транзакция только читала.
+
+        Транзакция чтения завершается, загруженные объекты отсоединяются от
+        сессии и сохраняют загруженные значения. Если в сессии есть изменения
+        без commit, соединение остаётся за сессией.
+        """
+        session: AsyncSession | None = self._session
+        if session is None or not session.in_transaction():
+            return
+        if session.new or session.dirty or session.deleted or session.info.get(SESSION_HAS_WRITES_KEY):
+            return
+        await session.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+async def release_session(db: AsyncSession | LazySession | None) -> None:
+    """Возврат соединения ленивой сессии в пул после чтения.
+
+    Обычные сессии (команды, тесты сервисов) не отпускаются: их владелец
+    сам решает, когда закрыть сессию.
+
+    Args:
+        db (AsyncSession | LazySession | None): Сессия базы данных.
+    """
+    if isinstance(db, LazySession):
+        await db.release()
@@ -5,6 +5,6 @@ sleep 5 && \
     alembic upgrade head && \
     echo "Database migration completed" && \
     echo "Starting tests..." && \
-    pytest --maxfail=1 --disable-warnings -q -vv && \
+    pytest -n auto --maxfail=1 --disable-warnings -q -vv && \
     echo "Starting the application..." && \
-    gunicorn fast:app --bind 0.0.0.0:8000 --timeout 900
+    exec python launcher.py
@@ -1,58 +1,91 @@
-import time
+import asyncio
 from typing import Any, Sequence
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+from core.cache import RedisError
+from core.config import EMAIL_FILTER_ENABLED, WARMUP_ENABLED, WARMUP_DB_CONNECTIONS, \
+    WARMUP_TIMEOUT_SECONDS
+from core.container import container
+from core.logger import logger
+from core.metrics import update_runtime_gauges
+from core.responses import FastJSONResponse
+from core.middleware import RequestContextMiddleware
+from database.database import init_engine, dispose_engine, get_sessionmaker
+from services.warmup import warm_up
+from src.routes import base_router
 
 
-from database.database import init_engine, engine
-from src.routes import base_router
+def get_app_sessionmaker(app: FastAPI) -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий с учётом переопределения зависимостей (в тестах - тестовая база)."""
+    return app.dependency_overrides.get(get_sessionmaker, get_sessionmaker)()
+
+
+async def warm_email_filter(app: FastAPI) -> None:
+    """Заполнение фильтра зарегистрированных email до приёма запросов."""
+    try:
+        await container.email_filter.start(get_app_sessionmaker(app))
+    except (SQLAlchemyError, OSError, RedisError) as e:
+        # Без фильтра пользователи ищутся в базе как обычно
+        logger.warning("Не удалось заполнить фильтр email", error=str(e))
+
+
+async def warm_up_worker(app: FastAPI) -> None:
+    """Прогрев соединений, хеширования и JWT до приёма запросов."""
+    session_factory = get_app_sessionmaker(app)
+    try:
+        await asyncio.wait_for(warm_up(session_factory, WARMUP_DB_CONNECTIONS), WARMUP_TIMEOUT_SECONDS)
+    except TimeoutError:
+        # Воркер начинает принимать запросы, не дождавшись прогрева
+        logger.warning("Прогрев не уложился в таймаут", timeout=WARMUP_TIMEOUT_SECONDS)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_engine()
+    if EMAIL_FILTER_ENABLED:
+        await warm_email_filter(app)
+    if WARMUP_ENABLED:
+        await warm_up_worker(app)
+    # Первая проверка готовности выполняется до приёма запросов. Показатели
+    # пулов каждого воркера обновляются по таймеру проверок, а не на каждый запрос
+    await container.health_prober.start(get_app_sessionmaker(app), on_probe=update_runtime_gauges)
     yield
-    if engine is not None:
-        await engine.dispose()
+    await container.health_prober.stop()
+    if EMAIL_FILTER_ENABLED:
+        await container.email_filter.stop()
+    await dispose_engine()
+    await container.shutdown()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 
 # Middleware block
 app.add_middleware(
-    TrustedHostMiddleware, allowed_hosts=["127.0.0.1", "localhost"]
+    RequestContextMiddleware, allowed_hosts=["127.0.0.1", "localhost"]
 )
 
 
-# Custom middleware to coune time requests
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next: Any) -> Response:
-    start_time = time.perf_counter()
-    response: Response = await call_next(request)
-    process_time: float = time.perf_counter() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
 # HTTP Exceptions block
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request,
     exc: RequestValidationError
-) -> JSONResponse:
+) -> FastJSONResponse:
     errors: Sequence[Any] = exc.errors()
 
     if len(errors) > 0:
         first_error: Any = errors[0]
         if isinstance(first_error, dict) and all(key in first_error for key in ("msg", "loc")):
-            return JSONResponse({"detail": f"'{first_error['loc'][-1]}' {first_error['msg']}"}, status_code=422)
+            return FastJSONResponse({"detail": f"'{first_error['loc'][-1]}' {first_error['msg']}"}, status_code=422)
 
-    return JSONResponse({"detail": str(exc)}, status_code=422)
+    return FastJSONResponse({"detail": str(exc)}, status_code=422)
 
 # Router block
 app.include_router(
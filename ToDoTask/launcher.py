@@ -0,0 +1,184 @@
+"""Файл запуска приложения в production.
+
+Gunicorn управляет процессами-воркерами uvicorn: перезапускает упавшие
+и отработавшие SERVER_MAX_REQUESTS запросов воркеры, а при остановке даёт
+им дообработать выполняющиеся запросы. Завершение воркера проходит через
+lifespan приложения, который закрывает пул соединений с базой данных.
+Метрики воркеров собираются через общий каталог PROMETHEUS_MULTIPROC_DIR.
+Больше одного воркера запускается только с общим (Redis) хранилищем
+отозванных токенов, иначе один токен обновления можно обменять в каждом
+воркере.
+
+Запуск:
+
+    python launcher.py [--workers N] [--bind HOST:PORT]
+"""
+import argparse
+import glob
+import os
+import tempfile
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+from uvicorn_worker import UvicornWorker
+
+from core.config import SERVER_BIND, SERVER_WORKERS, SERVER_PRELOAD, SERVER_MAX_REQUESTS, \
+    SERVER_MAX_REQUESTS_JITTER, SERVER_GRACEFUL_TIMEOUT, SERVER_TIMEOUT, SERVER_KEEPALIVE, \
+    SERVER_FAST_LOOP, TOKEN_REVOCATION_BACKEND
+from core.logger import logger
+
+
+# Приложение, которое запускают воркеры
+APP_URI = "fast:app"
+# Каталог метрик воркеров, если PROMETHEUS_MULTIPROC_DIR не задан
+DEFAULT_METRICS_DIR = os.path.join(tempfile.gettempdir(), "todo-metrics")
+# Часть времени остановки, оставляемая на lifespan после ожидания запросов
+LIFESPAN_SHUTDOWN_RESERVE_SECONDS = 5
+
+
+class Worker(UvicornWorker):
+    """Воркер uvicorn на стандартном цикле событий и парсере h11."""
+
+    CONFIG_KWARGS: dict[str, Any] = {"loop": "asyncio", "http": "h11", "lifespan": "on"}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Без ограничения uvicorn ждёт запросы бесконечно, и gunicorn убивает
+        # воркер по graceful_timeout, не дав lifespan закрыть соединения
+        self.config.timeout_graceful_shutdown = max(
+            self.cfg.graceful_timeout - LIFESPAN_SHUTDOWN_RESERVE_SECONDS, 1
+        )
+
+
+class FastWorker(Worker):
+    """Воркер uvicorn на uvloop и парсере httptools."""
+
+    CONFIG_KWARGS: dict[str, Any] = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def get_worker_class(fast_loop: bool = SERVER_FAST_LOOP) -> type[Worker]:
+    """Выбор класса воркера.
+
+    Args:
+        fast_loop (bool): Использовать uvloop и httptools.
+
+    Returns:
+        type[Worker]: FastWorker, если запрошен и зависимости установлены, иначе Worker.
+    """
+    if not fast_loop:
+        return Worker
+
+    try:
+        import httptools  # noqa: F401
+        import uvloop  # noqa: F401
+    except ImportError:
+        logger.warning("uvloop или httptools не установлены, используется asyncio и h11")
+        return Worker
+    return FastWorker
+
+
+def prepare_metrics_dir() -> None:
+    """Подготовка каталога метрик и очистка его от файлов предыдущего запуска.
+
+    Вызывается до загрузки приложения: prometheus_client читает
+    PROMETHEUS_MULTIPROC_DIR при импорте, а метрики создают файлы сразу.
+    """
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", DEFAULT_METRICS_DIR)
+    metrics_dir: str = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Исключение показателей завершившегося воркера из суммы живых воркеров."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def check_workers(workers: int, revocation_backend: str = TOKEN_REVOCATION_BACKEND) -> None:
+    """Проверка, что состояние, которое должно быть общим для воркеров, не хранится в процессе.
+
+    Args:
+        workers (int): Количество процессов-воркеров.
+        revocation_backend (str): Бэкенд хранилища отозванных токенов.
+
+    Raises:
+        ValueError: Если воркеров больше одного, а отозванные токены хранятся в памяти процесса.
+    """
+    if workers > 1 and revocation_backend == "memory":
+        raise ValueError(
+            "TOKEN_REVOCATION_BACKEND=memory действует только внутри одного воркера: "
+            "задайте TOKEN_REVOCATION_BACKEND=redis или запустите один воркер (--workers 1)"
+        )
+
+
+def get_options(workers: int = SERVER_WORKERS, bind: str = SERVER_BIND) -> dict[str, Any]:
+    """Получение настроек gunicorn из конфигурации.
+
+    Args:
+        workers (int): Количество процессов-воркеров.
+        bind (str): Адрес, на котором сервер принимает соединения.
+
+    Returns:
+        dict[str, Any]: Настройки gunicorn.
+    """
+    options: dict[str, Any] = {
+        "bind": bind,
+        "workers": workers,
+        "worker_class": get_worker_class(),
+        "preload_app": SERVER_PRELOAD,
+        "max_requests": SERVER_MAX_REQUESTS,
+        "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "timeout": SERVER_TIMEOUT,
+        "keepalive": SERVER_KEEPALIVE,
+        "child_exit": child_exit,
+    }
+    # Файлы heartbeat воркеров в памяти, а не на диске контейнера
+    if os.path.isdir("/dev/shm"):
+        options["worker_tmp_dir"] = "/dev/shm"
+    return options
+
+
+class Application(BaseApplication):
+    """Приложение gunicorn с настройками из конфигурации, а не из командной строки.
+
+    Args:
+        app_uri (str): Путь к ASGI приложению в формате "модуль:атрибут".
+        options (dict[str, Any]): Настройки gunicorn.
+    """
+
+    def __init__(self, app_uri: str, options: dict[str, Any]) -> None:
+        self.app_uri: str = app_uri
+        self.options: dict[str, Any] = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        # При preload_app приложение импортируется в главном процессе один раз,
+        # а соединения с базой данных создаются в lifespan каждого воркера
+        return import_app(self.app_uri)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Запуск приложения под gunicorn с воркерами uvicorn")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--bind", default=SERVER_BIND)
+    args = parser.parse_args()
+    try:
+        check_workers(args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    prepare_metrics_dir()
+    Application(APP_URI, get_options(args.workers, args.bind)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+
+from pydantic import Field
+
+from schemas.base import BaseSchema
+
+
+# Блок для схем задач
+
+class TodoCreateSchema(BaseSchema):
+    title: str = Field(min_length=1)
+    description: str | None = None
+    is_done: bool = False
+    due_date: date | None = None
+
+
+class TodoUpdateSchema(BaseSchema):
+    title: str | None = Field(default=None, min_length=1)
+    description: str | None = None
+    is_done: bool | None = None
+    due_date: date | None = None
+
+
+class TodoSchema(BaseSchema):
+    id: int
+    title: str
+    description: str | None
+    is_done: bool
+    due_date: date | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class TodoListResponseSchema(BaseSchema):
+    items: list[TodoSchema]
+    next_cursor: str | None
+
+
+# Блок для схем пакетных операций с задачами
+
+class TodoBatchCreateSchema(BaseSchema):
+    items: list[TodoCreateSchema]
+
+
+class TodoBatchUpdateItemSchema(TodoUpdateSchema):
+    id: int
+
+
+class TodoBatchUpdateSchema(BaseSchema):
+    items: list[TodoBatchUpdateItemSchema]
+
+
+class TodoBatchDeleteSchema(BaseSchema):
+    ids: list[int]
+
+
+class TodoBatchItemResultSchema(BaseSchema):
+    id: int
+    status_code: int
+    todo: TodoSchema | None = None
+    detail: str | None = None
+
+
+class TodoBatchResponseSchema(BaseSchema):
+    results: list[TodoBatchItemResultSchema]
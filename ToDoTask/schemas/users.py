@@ -22,8 +22,18 @@ class RegisterUserResponseSchema(BaseSchema):
     email: str
 
 
+class UserResponseSchema(BaseSchema):
+    id: int
+    email: str
+    created_at: datetime
+
+
 # Блок для схем JWT
 
+class RefreshTokenRequestSchema(BaseSchema):
+    refresh_token: str
+
+
 class TokenSchema(BaseSchema):
     access_token: str
     access_token_expires_at: datetime
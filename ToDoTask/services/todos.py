@@ -0,0 +1,608 @@
+"""Файл сервиса задач.
+
+Список задач выдаётся постранично по ключу (due_date, id): каждая страница
+продолжает выборку с последней записи предыдущей страницы по покрывающему
+индексу, поэтому глубокие страницы стоят столько же, сколько первая.
+"""
+import base64
+import binascii
+import csv
+import io
+import json
+from datetime import date
+from typing import Annotated, Any, AsyncIterator
+
+from fastapi import Depends
+from sqlalchemy import Boolean, Date, Integer, Select, String, case, cast, column, delete, \
+    insert, select, tuple_, union_all, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from core.cache import TodoListCache
+from core.config import TODO_BATCH_MAX_SIZE, TODO_EXPORT_FETCH_SIZE
+from core.container import container
+from core.errors import ErrorWithStatus
+from database.database import get_db, get_read_db
+from database.replica import ReplicaRouter
+from database.session import release_session
+from database.models.todos import TodoItem
+from schemas.todos import TodoListResponseSchema, TodoSchema
+
+
+# Порядок выдачи списка задач, совпадающий с порядком покрывающих индексов
+TODO_LIST_ORDER = (TodoItem.due_date.asc().nulls_last(), TodoItem.id.asc())
+# Изменяемые поля задачи и их типы для пакетного обновления
+TODO_UPDATABLE_FIELDS = {"title": String, "description": String, "is_done": Boolean, "due_date": Date}
+# Поля задачи, которые не могут быть null
+TODO_NOT_NULL_FIELDS = ("title", "is_done")
+# Колонки выгрузки задач (совпадают с полями TodoSchema)
+TODO_EXPORT_COLUMNS = tuple(TodoSchema.model_fields)
+
+
+def encode_cursor(due_date: date | None, todo_id: int) -> str:
+    """Кодирование курсора страницы.
+
+    Args:
+        due_date (date | None): Срок последней задачи страницы.
+        todo_id (int): ID последней задачи страницы.
+
+    Returns:
+        str: Непрозрачный курсор.
+    """
+    payload: bytes = json.dumps(
+        {"d": due_date.isoformat() if due_date else None, "i": todo_id},
+        separators=(",", ":"),
+    ).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[date | None, int]:
+    """Декодирование курсора страницы.
+
+    Args:
+        cursor (str): Курсор.
+
+    Returns:
+        tuple[date | None, int]: Срок и ID последней задачи предыдущей страницы.
+
+    Raises:
+        ErrorWithStatus[422]: Если курсор некорректен.
+    """
+    try:
+        payload: Any = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        due_date: date | None = date.fromisoformat(payload["d"]) if payload["d"] is not None else None
+        todo_id: Any = payload["i"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ErrorWithStatus("Некорректный курсор", 422)
+
+    if type(todo_id) is not int:
+        raise ErrorWithStatus("Некорректный курсор", 422)
+
+    return due_date, todo_id
+
+
+class TodoService:
+    """Сервис задач.
+
+    Args:
+        db (AsyncSession): Сессия базы данных.
+        list_cache (TodoListCache): Кэш страниц списка задач.
+        read_db (AsyncSession | None): Сессия реплики для чтения.
+        replica_router (ReplicaRouter | None): Выбор сессии для чтения.
+    """
+
+    def __init__(self, db: AsyncSession, list_cache: TodoListCache,
+                 read_db: AsyncSession | None = None, replica_router: ReplicaRouter | None = None):
+        self.db: AsyncSession = db
+        self.list_cache: TodoListCache = list_cache
+        self.read_db: AsyncSession | None = read_db
+        self.replica_router: ReplicaRouter | None = replica_router
+
+
+    async def _reader(self, owner_id: int) -> AsyncSession:
+        """Сессия для чтения задач пользователя: реплика или основная база.
+
+        Args:
+            owner_id (int): ID владельца задач.
+
+        Returns:
+            AsyncSession: Сессия для чтения.
+        """
+        if self.replica_router is None:
+            return self.db
+        return await self.replica_router.choose(self.db, self.read_db, owner_id)
+
+
+    async def _release_readers(self) -> None:
+        """Возврат соединений в пул после чтения, до сериализации ответа."""
+        await release_session(self.db)
+        await release_session(self.read_db)
+
+
+    async def _after_write(self, owner_id: int) -> None:
+        """Сброс кэша списка и чтение из основной базы после изменения задач.
+
+        Args:
+            owner_id (int): ID владельца задач.
+        """
+        await self.list_cache.invalidate(owner_id)
+        if self.replica_router is not None and self.read_db is not None:
+            await self.replica_router.mark_write(owner_id)
+
+
+    def _filter_list_query(self, query: Select[Any], owner_id: int, is_done: bool | None,
+                           due_date: date | None) -> Select[Any]:
+        """Добавление фильтров списка задач к запросу.
+
+        Args:
+            query (Select): Запрос.
+            owner_id (int): ID владельца задач.
+            is_done (bool | None): Фильтр по статусу выполнения.
+            due_date (date | None): Фильтр по сроку выполнения.
+
+        Returns:
+            Select: Запрос с фильтрами.
+        """
+        query = query.where(TodoItem.owner_id == owner_id)
+        if is_done is not None:
+            query = query.where(TodoItem.is_done == is_done)
+        if due_date is not None:
+            query = query.where(TodoItem.due_date == due_date)
+
+        return query
+
+
+    def _page_query(self, owner_id: int, is_done: bool | None, due_date: date | None,
+                    start_key: tuple[date | None, int] | None, limit: int) -> Select[Any]:
+        """Запрос страницы задач, следующих за ключом (due_date, id).
+
+        Записи без срока идут в конце списка (NULLS LAST), как и в индексе.
+        Условие по ключу записано сравнением кортежей, чтобы оно стало условием
+        поиска по индексу, а хвост без срока выбирается отдельной ветвью UNION ALL.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            is_done (bool | None): Фильтр по статусу выполнения.
+            due_date (date | None): Фильтр по сроку выполнения.
+            start_key (tuple[date | None, int] | None): Ключ последней задачи
+                предыдущей страницы.
+            limit (int): Количество запрашиваемых задач.
+
+        Returns:
+            Select: Запрос задач страницы.
+        """
+        query = self._filter_list_query(select(TodoItem), owner_id, is_done, due_date)
+        if start_key is None:
+            return query.order_by(*TODO_LIST_ORDER).limit(limit)
+
+        start_due_date, start_id = start_key
+        if start_due_date is None:
+            return query.where(
+                TodoItem.due_date.is_(None), TodoItem.id > start_id
+            ).order_by(TodoItem.id).limit(limit)
+
+        with_due_date = query.where(
+            tuple_(TodoItem.due_date, TodoItem.id) > tuple_(start_due_date, start_id)
+        ).order_by(*TODO_LIST_ORDER).limit(limit)
+        without_due_date = query.where(TodoItem.due_date.is_(None)).order_by(TodoItem.id).limit(limit)
+
+        page = aliased(TodoItem, union_all(with_due_date, without_due_date).subquery())
+        return select(page).order_by(page.due_date.asc().nulls_last(), page.id.asc()).limit(limit)
+
+
+    async def _page_start_key(self, db: AsyncSession, owner_id: int, is_done: bool | None,
+                              due_date: date | None, page: int, limit: int
+    ) -> tuple[date | None, int] | None:
+        """Получение ключа последней задачи перед страницей `page`.
+
+        Пропуск строк выполняется только по колонкам покрывающего индекса,
+        без чтения самих задач.
+
+        Args:
+            db (AsyncSession): Сессия для чтения.
+            owner_id (int): ID владельца задач.
+            is_done (bool | None): Фильтр по статусу выполнения.
+            due_date (date | None): Фильтр по сроку выполнения.
+            page (int): Номер страницы, начиная с 2.
+            limit (int): Размер страницы.
+
+        Returns:
+            tuple[date | None, int] | None: Срок и ID задачи или None, если страница
+                за пределами списка.
+        """
+        query = self._filter_list_query(
+            select(TodoItem.due_date, TodoItem.id), owner_id, is_done, due_date
+        ).order_by(*TODO_LIST_ORDER).offset((page - 1) * limit - 1).limit(1)
+
+        row = (await db.execute(query)).first()
+        if row is None:
+            return None
+
+        return row.due_date, row.id
+
+
+    async def list_todos(self, owner_id: int, is_done: bool | None = None,
+                         due_date: date | None = None, limit: int = 20,
+                         cursor: str | None = None, page: int | None = None
+    ) -> tuple[list[TodoItem], str | None]:
+        """Получение страницы списка задач пользователя.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            is_done (bool | None): Фильтр по статусу выполнения.
+            due_date (date | None): Фильтр по сроку выполнения.
+            limit (int): Размер страницы.
+            cursor (str | None): Курсор, полученный с предыдущей страницы.
+            page (int | None): Номер страницы (режим совместимости), переводится в курсор.
+
+        Returns:
+            tuple[list[TodoItem], str | None]: Задачи страницы и курсор следующей страницы.
+
+        Raises:
+            ErrorWithStatus[422]: Если курсор некорректен или передан вместе с page.
+        """
+        if cursor is not None and page is not None:
+            raise ErrorWithStatus("Нельзя одновременно передавать cursor и page", 422)
+
+        db: AsyncSession = await self._reader(owner_id)
+
+        start_key: tuple[date | None, int] | None = None
+        if cursor is not None:
+            start_key = decode_cursor(cursor)
+        elif page is not None and page > 1:
+            start_key = await self._page_start_key(db, owner_id, is_done, due_date, page, limit)
+            if start_key is None:
+                await self._release_readers()
+                return [], None
+
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        todos: list[TodoItem] = list((await db.scalars(
+            self._page_query(owner_id, is_done, due_date, start_key, limit + 1)
+        )).all())
+        await self._release_readers()
+
+        next_cursor: str | None = None
+        if len(todos) > limit:
+            todos = todos[:limit]
+            next_cursor = encode_cursor(todos[-1].due_date, todos[-1].id)
+
+        return todos, next_cursor
+
+
+    async def list_todos_json(self, owner_id: int, is_done: bool | None = None,
+                              due_date: date | None = None, limit: int = 20,
+                              cursor: str | None = None, page: int | None = None) -> bytes:
+        """Получение страницы списка задач в JSON через кэш.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            is_done (bool | None): Фильтр по статусу выполнения.
+            due_date (date | None): Фильтр по сроку выполнения.
+            limit (int): Размер страницы.
+            cursor (str | None): Курсор, полученный с предыдущей страницы.
+            page (int | None): Номер страницы (режим совместимости).
+
+        Returns:
+            bytes: Страница в формате TodoListResponseSchema.
+
+        Raises:
+            ErrorWithStatus[422]: Если курсор некорректен или передан вместе с page.
+        """
+        async def load() -> bytes:
+            todos, next_cursor = await self.list_todos(
+                owner_id, is_done=is_done, due_date=due_date, limit=limit, cursor=cursor, page=page
+            )
+            return TodoListResponseSchema(
+                items=[TodoSchema.model_validate(todo) for todo in todos],
+                next_cursor=next_cursor,
+            ).model_dump_json().encode()
+
+        return await self.list_cache.get_or_load(
+            owner_id,
+            {"is_done": is_done, "due_date": due_date, "limit": limit, "cursor": cursor, "page": page},
+            load,
+        )
+
+
+    def _check_not_null(self, data: dict[str, Any]) -> None:
+        """Проверка того, что обязательным полям не передан null.
+
+        Args:
+            data (dict[str, Any]): Обновляемые поля задачи.
+
+        Raises:
+            ErrorWithStatus[422]: Если обязательному полю передано значение null.
+        """
+        for field in TODO_NOT_NULL_FIELDS:
+            if field in data and data[field] is None:
+                raise ErrorWithStatus(f"'{field}' не может быть null", 422)
+
+
+    def _check_batch_size(self, size: int) -> None:
+        """Проверка размера пакета.
+
+        Args:
+            size (int): Количество элементов пакета.
+
+        Raises:
+            ErrorWithStatus[422]: Если пакет пуст или больше TODO_BATCH_MAX_SIZE.
+        """
+        if size == 0:
+            raise ErrorWithStatus("Пакет не может быть пустым", 422)
+        if size > TODO_BATCH_MAX_SIZE:
+            raise ErrorWithStatus(f"Размер пакета не может превышать {TODO_BATCH_MAX_SIZE}", 422)
+
+
+    async def get_todo(self, owner_id: int, todo_id: int) -> TodoItem:
+        """Получение задачи пользователя.
+
+        Args:
+            owner_id (int): ID владельца задачи.
+            todo_id (int): ID задачи.
+
+        Returns:
+            TodoItem: Задача.
+
+        Raises:
+            ErrorWithStatus[404]: Если задача не найдена.
+        """
+        db: AsyncSession = await self._reader(owner_id)
+        todo: TodoItem | None = (await db.scalars(
+            select(TodoItem).where(TodoItem.id == todo_id, TodoItem.owner_id == owner_id)
+        )).first()
+        await self._release_readers()
+
+        if todo is None:
+            raise ErrorWithStatus("Задача не найдена", 404)
+
+        return todo
+
+
+    async def create_todo(self, owner_id: int, data: dict[str, Any]) -> TodoItem:
+        """Создание задачи.
+
+        Args:
+            owner_id (int): ID владельца задачи.
+            data (dict[str, Any]): Поля задачи.
+
+        Returns:
+            TodoItem: Созданная задача.
+        """
+        todo: TodoItem = (await self.db.scalars(
+            insert(TodoItem).values(owner_id=owner_id, **data).returning(TodoItem)
+        )).one()
+
+        await self.db.commit()
+        await self._after_write(owner_id)
+
+        return todo
+
+
+    async def update_todo(self, owner_id: int, todo_id: int, data: dict[str, Any]) -> TodoItem:
+        """Обновление задачи.
+
+        Args:
+            owner_id (int): ID владельца задачи.
+            todo_id (int): ID задачи.
+            data (dict[str, Any]): Обновляемые поля задачи.
+
+        Returns:
+            TodoItem: Обновлённая задача.
+
+        Raises:
+            ErrorWithStatus[422]: Если обязательному полю передано значение null.
+            ErrorWithStatus[404]: Если задача не найдена.
+        """
+        self._check_not_null(data)
+
+        if not data:
+            return await self.get_todo(owner_id, todo_id)
+
+        todo: TodoItem | None = (await self.db.scalars(
+            update(TodoItem)
+            .where(TodoItem.id == todo_id, TodoItem.owner_id == owner_id)
+            .values(**data)
+            .returning(TodoItem)
+        )).first()
+
+        if todo is None:
+            raise ErrorWithStatus("Задача не найдена", 404)
+
+        await self.db.commit()
+        await self._after_write(owner_id)
+
+        return todo
+
+
+    async def delete_todo(self, owner_id: int, todo_id: int) -> None:
+        """Удаление задачи.
+
+        Args:
+            owner_id (int): ID владельца задачи.
+            todo_id (int): ID задачи.
+
+        Raises:
+            ErrorWithStatus[404]: Если задача не найдена.
+        """
+        deleted_id: int | None = (await self.db.scalars(
+            delete(TodoItem)
+            .where(TodoItem.id == todo_id, TodoItem.owner_id == owner_id)
+            .returning(TodoItem.id)
+        )).first()
+
+        if deleted_id is None:
+            raise ErrorWithStatus("Задача не найдена", 404)
+
+        await self.db.commit()
+        await self._after_write(owner_id)
+
+    async def create_todos(self, owner_id: int, items: list[dict[str, Any]]) -> list[TodoItem]:
+        """Пакетное создание задач одним многострочным INSERT ... RETURNING.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            items (list[dict[str, Any]]): Поля создаваемых задач.
+
+        Returns:
+            list[TodoItem]: Созданные задачи в порядке `items`.
+
+        Raises:
+            ErrorWithStatus[422]: Если пакет пуст или слишком большой.
+        """
+        self._check_batch_size(len(items))
+
+        todos: list[TodoItem] = list((await self.db.scalars(
+            insert(TodoItem).returning(TodoItem, sort_by_parameter_order=True),
+            [{"owner_id": owner_id, **item} for item in items],
+        )).all())
+
+        await self.db.commit()
+        await self._after_write(owner_id)
+
+        return todos
+
+
+    async def update_todos(self, owner_id: int, items: list[dict[str, Any]]
+    ) -> dict[int, TodoItem | None]:
+        """Пакетное частичное обновление задач одним UPDATE ... FROM (VALUES ...) RETURNING.
+
+        Каждый элемент содержит `id` и только те поля, которые нужно изменить.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            items (list[dict[str, Any]]): ID и обновляемые поля задач.
+
+        Returns:
+            dict[int, TodoItem | None]: Обновлённая задача по ID или None, если задача не найдена.
+
+        Raises:
+            ErrorWithStatus[422]: Если пакет пуст, слишком большой, содержит повторяющиеся ID
+                или null в обязательном поле.
+        """
+        self._check_batch_size(len(items))
+
+        ids: list[int] = [item["id"] for item in items]
+        if len(set(ids)) != len(ids):
+            raise ErrorWithStatus("ID задач в пакете не должны повторяться", 422)
+        for item in items:
+            self._check_not_null(item)
+
+        # Для каждого поля передаётся значение и признак того, что поле нужно изменить
+        columns = [column("id", Integer())]
+        for field, field_type in TODO_UPDATABLE_FIELDS.items():
+            columns += [column(field, field_type()), column(f"set_{field}", Boolean())]
+
+        rows = []
+        for item in items:
+            row: list[Any] = [item["id"]]
+            for field in TODO_UPDATABLE_FIELDS:
+                row += [item.get(field), field in item]
+            rows.append(tuple(row))
+
+        batch = values(*columns, name="batch").data(rows)
+
+        # Столбец из одних NULL в VALUES получает тип text, поэтому значения приводятся к типу поля
+        updated: list[TodoItem] = list((await self.db.scalars(
+            update(TodoItem)
+            .where(TodoItem.id == batch.c.id, TodoItem.owner_id == owner_id)
+            .values({
+                field: case(
+                    (batch.c[f"set_{field}"], cast(batch.c[field], field_type())),
+                    else_=getattr(TodoItem, field),
+                )
+                for field, field_type in TODO_UPDATABLE_FIELDS.items()
+            })
+            .returning(TodoItem)
+            .execution_options(synchronize_session=False)
+        )).all())
+
+        await self.db.commit()
+        if updated:
+            await self._after_write(owner_id)
+
+        updated_by_id: dict[int, TodoItem] = {todo.id: todo for todo in updated}
+        return {todo_id: updated_by_id.get(todo_id) for todo_id in ids}
+
+
+    async def delete_todos(self, owner_id: int, ids: list[int]) -> dict[int, bool]:
+        """Пакетное удаление задач одним DELETE ... RETURNING.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            ids (list[int]): ID удаляемых задач.
+
+        Returns:
+            dict[int, bool]: Признак удаления по ID.
+
+        Raises:
+            ErrorWithStatus[422]: Если пакет пуст или слишком большой.
+        """
+        self._check_batch_size(len(ids))
+
+        deleted_ids: set[int] = set((await self.db.scalars(
+            delete(TodoItem)
+            .where(TodoItem.owner_id == owner_id, TodoItem.id.in_(ids))
+            .returning(TodoItem.id)
+        )).all())
+
+        await self.db.commit()
+        if deleted_ids:
+            await self._after_write(owner_id)
+
+        return {todo_id: todo_id in deleted_ids for todo_id in ids}
+
+    async def export_todos(self, owner_id: int, export_format: str = "ndjson",
+                           fetch_size: int = TODO_EXPORT_FETCH_SIZE) -> AsyncIterator[bytes]:
+        """Потоковая выгрузка всех задач пользователя.
+
+        Строки читаются серверным курсором порциями по `fetch_size` и сразу
+        отдаются частями ответа, поэтому память не зависит от количества задач.
+        Выбираются колонки, а не ORM объекты, чтобы строки не копились в сессии.
+
+        Args:
+            owner_id (int): ID владельца задач.
+            export_format (str): Формат выгрузки: "ndjson" или "csv".
+            fetch_size (int): Количество строк, получаемых с сервера за раз.
+
+        Yields:
+            bytes: Часть выгрузки, соответствующая одной порции строк.
+        """
+        result = await self.db.stream(
+            select(*(getattr(TodoItem, name) for name in TODO_EXPORT_COLUMNS))
+            .where(TodoItem.owner_id == owner_id)
+            .order_by(TodoItem.id)
+            .execution_options(yield_per=fetch_size)
+        )
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(TODO_EXPORT_COLUMNS)
+            yield buffer.getvalue().encode()
+
+        async for rows in result.partitions():
+            if export_format == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                yield buffer.getvalue().encode()
+            else:
+                yield b"".join(
+                    TodoSchema.model_validate(row).model_dump_json().encode() + b"\n" for row in rows
+                )
+
+
+def get_todo_service(db: AsyncSession = Depends(get_db),
+                     read_db: Annotated[AsyncSession | None, Depends(get_read_db)] = None
+) -> TodoService:
+    """Получение экземпляра сервиса задач.
+
+    При прямом вызове без сессии реплики чтение идёт из основной базы.
+
+    Args:
+        db (AsyncSession): Сессия базы данных.
+        read_db (AsyncSession | None): Сессия реплики для чтения.
+
+    Returns:
+        TodoService: Экземпляр сервиса задач.
+    """
+    return TodoService(db, container.todo_list_cache, read_db, container.replica_router)
@@ -2,55 +2,141 @@
 
 Содежрит в себе как работу с базой так и с внешними функциями.
 """
+import uuid
 from datetime import datetime, timedelta
-from functools import lru_cache
-from typing import Any
+from typing import Annotated
 
 import jwt
-from argon2 import PasswordHasher
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-
-from core.config import DATABASE_TIMEZONE, JWT_SECRET_KEY, JWT_ALGORITHM, \
-    ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_MINUTES
+from fastapi import Depends
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import Select, func, select, update
+
+from core.config import DATABASE_TIMEZONE, EMAIL_FILTER_ENABLED
+from core.container import container
+from core.email_filter import EmailFilter
 from core.errors import ErrorWithStatus
+from core.hashing import PasswordHashingPool, needs_rehash
+from core.logger import logger
+from core.revocation import RevocationStore
+from core.tokens import JWTKeys, AccessTokenVerifier, RefreshTokenClaims, decode_refresh_token, \
+    ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE
+from database.database import get_db, get_read_db
+from database.replica import ReplicaRouter
+from database.session import release_session
 from database.models.users import User
 from schemas.users import TokenSchema
 
 
+def normalize_email(email: str) -> str:
+    """Приведение email к виду, в котором он хранится в базе данных.
+
+    Args:
+        email (str): Email пользователя.
+
+    Returns:
+        str: Email без пробелов по краям в нижнем регистре.
+    """
+    return email.strip().lower()
+
+
 class UserService:
     """Сервис пользователей.
     
     Args:
         db (AsyncSession): Сессия базы данных.
+        hashing_pool (PasswordHashingPool): Пул хеширования паролей.
+        jwt_keys (JWTKeys): Ключи JWT.
+        token_verifier (AccessTokenVerifier): Проверка токенов доступа.
+        email_filter (EmailFilter | None): Фильтр зарегистрированных email.
+        revocation_store (RevocationStore | None): Хранилище отозванных токенов обновления.
+        read_db (AsyncSession | None): Сессия реплики для чтения.
+        replica_router (ReplicaRouter | None): Выбор сессии для чтения.
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, hashing_pool: PasswordHashingPool, jwt_keys: JWTKeys,
+                 token_verifier: AccessTokenVerifier, email_filter: EmailFilter | None = None,
+                 revocation_store: RevocationStore | None = None, read_db: AsyncSession | None = None,
+                 replica_router: ReplicaRouter | None = None):
         self.db: AsyncSession = db
+        self.hashing_pool: PasswordHashingPool = hashing_pool
+        self.jwt_keys: JWTKeys = jwt_keys
+        self.token_verifier: AccessTokenVerifier = token_verifier
+        self.email_filter: EmailFilter | None = email_filter
+        self.revocation_store: RevocationStore | None = revocation_store
+        self.read_db: AsyncSession | None = read_db
+        self.replica_router: ReplicaRouter | None = replica_router
     
-    def hash_password(self, password: str) -> str:
-        """Хеширование пароля.
+    async def hash_password(self, password: str) -> str:
+        """Хеширование пароля в пуле хеширования.
 
         Args:
             password (str): Пароль.
 
         Returns:
             str: Хэш пароля.
+
+        Raises:
+            ErrorWithStatus[503]: Если пул хеширования перегружен.
         """
-        return PasswordHasher().hash(password)
+        return await self.hashing_pool.hash_password(password)
 
 
-    def verify_password(self, password: str, password_hash: str) -> bool:
-        """Проверка пароля.
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        """Проверка пароля в пуле хеширования.
 
         Args:
             password (str): Пароль.
             password_hash (str): Хеш пароля.
 
         Returns:
-            bool: True, если пароль совпадает с хешем, иначе вызовет ошибку.
+            bool: True, если пароль совпадает с хешем, иначе False.
+
+        Raises:
+            ErrorWithStatus[503]: Если пул хеширования перегружен.
         """
-        return PasswordHasher().verify(password_hash, password)
+        return await self.hashing_pool.verify_password(password, password_hash)
+
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Проверка, создан ли хеш с устаревшими параметрами argon2.
+
+        Args:
+            password_hash (str): Хеш пароля.
+
+        Returns:
+            bool: True, если хеш нужно пересчитать с текущими параметрами.
+        """
+        return needs_rehash(password_hash)
+
+
+    async def rehash_password(self, user_id: int, password: str, old_password_hash: str) -> bool:
+        """Пересчёт хеша пароля с текущими параметрами argon2.
+
+        Хеш обновляется, только если в базе всё ещё лежит `old_password_hash`,
+        чтобы не затереть пароль, сменённый параллельно.
+
+        Args:
+            user_id (int): ID пользователя.
+            password (str): Проверенный пароль пользователя.
+            old_password_hash (str): Хеш, с которым был проверен пароль.
+
+        Returns:
+            bool: True, если хеш обновлён.
+
+        Raises:
+            ErrorWithStatus[503]: Если пул хеширования перегружен.
+        """
+        password_hash: str = await self.hash_password(password)
+
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.password_hash == old_password_hash)
+            .values(password_hash=password_hash)
+        )
+        await self.db.commit()
+
+        return result.rowcount == 1
 
 
     def check_password_strength(self, password: str) -> bool:
@@ -81,19 +167,23 @@ class UserService:
             TokenSchema: JWT токен с access и refresh токенами.
         """
 
-        access_token_expiration = datetime.now(DATABASE_TIMEZONE) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        refresh_token_expiration = datetime.now(DATABASE_TIMEZONE) + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES)
+        now: datetime = datetime.now(DATABASE_TIMEZONE)
+        access_token_expiration = now + timedelta(minutes=self.jwt_keys.access_token_expire_minutes)
+        refresh_token_expiration = now + timedelta(minutes=self.jwt_keys.refresh_token_expire_minutes)
 
+        # jti различает токены, выпущенные в одну секунду, и позволяет отозвать токен обновления
         access_token = jwt.encode(  # type: ignore
-            {"user_id": user_id, "exp": access_token_expiration},
-            JWT_SECRET_KEY,
-            algorithm=JWT_ALGORITHM,
+            {"user_id": user_id, "exp": access_token_expiration, "type": ACCESS_TOKEN_TYPE,
+             "jti": uuid.uuid4().hex},
+            self.jwt_keys.secret_key,
+            algorithm=self.jwt_keys.algorithm,
         )
 
         refresh_token = jwt.encode(  # type: ignore
-            {"user_id": user_id, "exp": refresh_token_expiration},
-            JWT_SECRET_KEY,
-            algorithm=JWT_ALGORITHM,
+            {"user_id": user_id, "exp": refresh_token_expiration, "type": REFRESH_TOKEN_TYPE,
+             "jti": uuid.uuid4().hex},
+            self.jwt_keys.secret_key,
+            algorithm=self.jwt_keys.algorithm,
         )
 
         return TokenSchema(
@@ -105,6 +195,59 @@ class UserService:
         )
 
 
+    async def refresh_token(self, refresh_token: str) -> TokenSchema:
+        """Обмен токена обновления на новую пару токенов.
+
+        Токен проверяется по подписи и сроку действия без обращения к базе данных.
+        Использованный токен отзывается до истечения, поэтому повторно
+        обменять его нельзя.
+
+        Args:
+            refresh_token (str): JWT токен обновления.
+
+        Returns:
+            TokenSchema: Новая пара токенов.
+
+        Raises:
+            ErrorWithStatus: Если токен недействителен, истек или уже использован (401).
+        """
+        claims: RefreshTokenClaims = decode_refresh_token(refresh_token, self.jwt_keys)
+
+        # Отзыв атомарен: из одновременных обменов одного токена проходит только один
+        if self.revocation_store is not None \
+                and not await self.revocation_store.revoke(claims.jti, claims.expires_at):
+            raise ErrorWithStatus("Токен обновления уже использован", 401)
+
+        return self.generate_token(claims.user_id)
+
+
+    async def _read_first(self, query: Select[tuple[User]]) -> User | None:
+        """Поиск пользователя с реплики с повторным поиском в основной базе.
+
+        Пользователь, которого нет на реплике, мог только что зарегистрироваться,
+        поэтому промах на реплике проверяется в основной базе.
+
+        Args:
+            query (Select): Запрос пользователя.
+
+        Returns:
+            User | None: Объект пользователя или None, если пользователь не найден.
+        """
+        db: AsyncSession = self.db
+        if self.replica_router is not None:
+            db = await self.replica_router.choose(self.db, self.read_db)
+
+        user: User | None = (await db.execute(query)).scalars().first()
+        if user is None and db is not self.db:
+            user = (await self.db.execute(query)).scalars().first()
+
+        # Соединения не держатся на время проверки пароля и остальной обработки запроса
+        await release_session(self.db)
+        await release_session(self.read_db)
+
+        return user
+
+
     async def get_user_by_email(self, email: str) -> User | None:
         """Получение пользователя по email.
 
@@ -114,13 +257,37 @@ class UserService:
         Returns:
             User | None: Объект пользователя или None, если пользователь не найден.
         """
-        user: User | None = (await self.db.execute(
-            select(User).where(User.email == email)
-        )).scalars().first()
+        email = normalize_email(email)
+
+        # Email, которого точно нет в фильтре, не ищется в базе
+        if self.email_filter is not None and not await self.email_filter.might_exist(email):
+            # Как и после поиска в базе, соединение не держится до конца запроса
+            await release_session(self.db)
+            await release_session(self.read_db)
+            return None
+
+        # Условие совпадает с выражением уникального индекса ix_users_email_lower
+        query = select(User).where(func.lower(User.email) == email)
+        user: User | None = await self._read_first(query)
+
+        if user is None and self.email_filter is not None:
+            self.email_filter.record_false_positive()
         
         return user
 
 
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        """Получение пользователя по ID.
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            User | None: Объект пользователя или None, если пользователь не найден.
+        """
+        return await self._read_first(select(User).where(User.id == user_id))
+
+
     async def create_user(self, email: str, password: str) -> User:
         """Создание пользователя.
 
@@ -135,27 +302,37 @@ class UserService:
             ErrorWithStatus: Если email некорректен (422).
             ErrorWithStatus: Если пользователь с таким email уже существует (409).
             ErrorWithStatus: Если пароль не соответствует требованиям (422).
+            ErrorWithStatus: Если пул хеширования перегружен (503).
         """
+        email = normalize_email(email)
+
         # Проверка валидности email
         if "@" not in email or "." not in email.split("@")[-1]:
             raise ErrorWithStatus("Некорректный email", 422)
 
-        # Проверка существования пользователя с таким email
-        existings_user: User | None = await self.get_user_by_email(email)
-        if existings_user:
-            raise ErrorWithStatus("Пользователь с таким email уже существует", 409)
-        
         # Проверка пароля
         self.check_password_strength(password)
 
-        password_hash: str = self.hash_password(password)
+        password_hash: str = await self.hash_password(password)
 
-        user = User(email=email, password_hash=password_hash)
-        self.db.add(user)
+        # Существование пользователя проверяется самой вставкой: при конфликте
+        # по уникальному индексу строка не вставляется и RETURNING пуст.
+        # Так регистрация занимает один запрос и не гонится с параллельной
+        user: User | None = await self.db.scalar(
+            insert(User)
+            .values(email=email, password_hash=password_hash)
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User)
+        )
+        if user is None:
+            await self.db.rollback()
+            raise ErrorWithStatus("Пользователь с таким email уже существует", 409)
 
         await self.db.commit()
-        await self.db.refresh(user)
-        
+
+        if self.email_filter is not None:
+            await self.email_filter.add(email)
+
         return user
 
 
@@ -169,28 +346,48 @@ class UserService:
             int: ID пользователя, извлеченный из токена.
 
         Raises:
-            ErrorWithStatus: Если токен недействителен (422).
-            ErrorWithStatus: Если срок действия токена истек (422).
+            ErrorWithStatus: Если токен недействителен (401).
+            ErrorWithStatus: Если срок действия токена истек (401).
         """
-        data: Any = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])  # type: ignore
-
-        if type(data) is not dict[str, Any] or "user_id" not in data or "exp" not in data:
-            raise ErrorWithStatus("Неверный токен", 422)
-
-        if datetime.now(DATABASE_TIMEZONE) > datetime.fromtimestamp(data["exp"], tz=DATABASE_TIMEZONE):
-            raise ErrorWithStatus("Срок действия токена истек", 422)
+        return self.token_verifier.verify(token)
 
-        return data["user_id"]
 
-
-@lru_cache
-def get_user_service(db: AsyncSession) -> UserService:
+def get_user_service(db: AsyncSession = Depends(get_db),
+                     read_db: Annotated[AsyncSession | None, Depends(get_read_db)] = None
+) -> UserService:
     """Получение экземпляра сервиса пользователей.
 
+    Сервис создаётся на каждый запрос, общие зависимости берутся из контейнера.
+    Функцию можно использовать как зависимость FastAPI или вызывать с сессией напрямую
+    (без сессии реплики чтение идёт из основной базы).
+
     Args:
         db (AsyncSession): Сессия базы данных.
+        read_db (AsyncSession | None): Сессия реплики для чтения.
 
     Returns:
         UserService: Экземпляр сервиса пользователей.
     """
-    return UserService(db)
+    return UserService(db, container.hashing_pool, container.jwt_keys, container.token_verifier,
+                       container.email_filter if EMAIL_FILTER_ENABLED else None,
+                       container.revocation_store, read_db, container.replica_router)
+
+
+async def rehash_user_password(session_factory: async_sessionmaker[AsyncSession], user_id: int,
+                               password: str, old_password_hash: str) -> None:
+    """Фоновый пересчёт хеша пароля после успешного входа.
+
+    Выполняется после отправки ответа, поэтому открывает собственную сессию.
+    Ошибки не влияют на вход: хеш будет пересчитан при следующем входе.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных.
+        user_id (int): ID пользователя.
+        password (str): Проверенный пароль пользователя.
+        old_password_hash (str): Хеш, с которым был проверен пароль.
+    """
+    async with session_factory() as db:
+        try:
+            await get_user_service(db).rehash_password(user_id, password, old_password_hash)
+        except ErrorWithStatus as e:
+            logger.warning("Не удалось пересчитать хеш пароля", user_id=user_id, error=str(e))
@@ -0,0 +1,137 @@
+"""Файл прогрева воркера перед приёмом запросов.
+
+Первые запросы после старта воркера платят за открытие соединений пула,
+загрузку типов asyncpg и подготовку выражений, запуск пула хеширования и
+выделение памяти argon2, первую сериализацию схем. Прогрев выполняет эту
+работу в lifespan, до того как воркер начнёт принимать запросы:
+
+- открывает WARMUP_DB_CONNECTIONS соединений пула и на каждом выполняет
+  частые запросы сервисов (кэш подготовленных выражений у каждого
+  соединения свой);
+- хеширует и проверяет пароль в пуле хеширования;
+- выпускает и проверяет пару JWT токенов;
+- сериализует ответы входа и списка задач.
+
+Ошибка шага записывается в лог и не мешает остальным шагам и старту.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import RedisError
+from core.config import DATABASE_TIMEZONE, DB_POOL_SIZE
+from core.container import container
+from core.errors import ErrorWithStatus
+from core.logger import logger
+from core.responses import FastJSONResponse
+from core.tokens import decode_refresh_token
+from database.models.todos import TodoItem
+from schemas.todos import TodoListResponseSchema, TodoSchema
+from schemas.users import TokenSchema
+from services.todos import TodoService
+from services.users import UserService
+
+
+# Данные прогрева не совпадают ни с одним пользователем и задачей
+WARMUP_USER_ID = 0
+WARMUP_EMAIL = "warmup@localhost"
+WARMUP_PASSWORD = "WarmupPassword1234"
+
+
+def create_user_service(db: AsyncSession) -> UserService:
+    # Без фильтра email и реплики: прогреваются запросы к основной базе
+    return UserService(db, container.hashing_pool, container.jwt_keys, container.token_verifier)
+
+
+async def warm_db_connection(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Выполнение частых запросов сервисов на одном соединении пула.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий.
+    """
+    async with session_factory() as db:
+        user_service: UserService = create_user_service(db)
+        await user_service.get_user_by_email(WARMUP_EMAIL)
+        await user_service.get_user_by_id(WARMUP_USER_ID)
+
+        todo_service = TodoService(db, container.todo_list_cache)
+        await todo_service.list_todos(WARMUP_USER_ID)
+        try:
+            await todo_service.get_todo(WARMUP_USER_ID, 0)
+        except ErrorWithStatus:
+            pass
+
+
+async def warm_db(session_factory: async_sessionmaker[AsyncSession], connections: int) -> None:
+    """Открытие соединений пула и подготовка частых запросов.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий.
+        connections (int): Количество соединений (не больше DB_POOL_SIZE,
+            соединения сверх постоянных закрываются при возврате в пул).
+    """
+    # Сессии работают одновременно, поэтому каждая занимает своё соединение
+    await asyncio.gather(*(
+        warm_db_connection(session_factory) for _ in range(min(connections, DB_POOL_SIZE))
+    ))
+
+
+async def warm_password_hashing() -> None:
+    """Запуск пула хеширования и одно хеширование и проверка пароля."""
+    password_hash: str = await container.hashing_pool.hash_password(WARMUP_PASSWORD)
+    await container.hashing_pool.verify_password(WARMUP_PASSWORD, password_hash)
+
+
+async def warm_tokens(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Выпуск и проверка пары токенов и сериализация ответов.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий (сессия
+            нужна сервису, но к базе не обращается).
+    """
+    async with session_factory() as db:
+        tokens: TokenSchema = create_user_service(db).generate_token(WARMUP_USER_ID)
+    container.token_verifier.verify(tokens.access_token)
+    decode_refresh_token(tokens.refresh_token, container.jwt_keys)
+    FastJSONResponse(tokens)
+
+    now: datetime = datetime.now(DATABASE_TIMEZONE)
+    todo = TodoItem(id=0, owner_id=WARMUP_USER_ID, title="Прогрев", description=None,
+                    is_done=False, due_date=now.date(), created_at=now, updated_at=now)
+    FastJSONResponse(TodoListResponseSchema(items=[TodoSchema.model_validate(todo)], next_cursor=None))
+
+
+async def warm_up(session_factory: async_sessionmaker[AsyncSession],
+                  connections: int) -> dict[str, float | None]:
+    """Прогрев воркера.
+
+    Args:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной базы.
+        connections (int): Количество заранее открываемых соединений пула.
+
+    Returns:
+        dict[str, float | None]: Время каждого шага в секундах, None - шаг завершился ошибкой.
+    """
+    steps: dict[str, Callable[[], Awaitable[None]]] = {
+        "db": lambda: warm_db(session_factory, connections),
+        "password_hashing": warm_password_hashing,
+        "tokens": lambda: warm_tokens(session_factory),
+    }
+
+    timings: dict[str, float | None] = {}
+    for name, step in steps.items():
+        started: float = time.perf_counter()
+        try:
+            await step()
+        except (SQLAlchemyError, OSError, RedisError, ErrorWithStatus) as e:
+            logger.warning("Шаг прогрева завершился ошибкой", step=name, error=str(e))
+            timings[name] = None
+        else:
+            timings[name] = round(time.perf_counter() - started, 4)
+
+    logger.info("Прогрев завершён", **timings)
+    return timings
@@ -0,0 +1,143 @@
+"""Файл зависимостей аутентификации."""
+import math
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from core.config import RATE_LIMIT_ENABLED, RATE_LIMIT_TRUSTED_PROXIES
+from core.container import container
+from core.errors import ErrorWithStatus
+from core.ratelimit import AuthRateLimiter
+from database.models.users import User
+from services.users import UserService, get_user_service, normalize_email
+
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> int:
+    """
+    Получение ID текущего пользователя из токена доступа.
+
+    Не обращается к базе данных: уже проверенные токены берутся из кэша.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials | None): Данные заголовка Authorization.
+
+    Returns:
+        int: ID текущего пользователя.
+
+    Raises:
+        HTTPException: Если токен не передан, недействителен или истек (401).
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Не передан токен авторизации",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        return container.token_verifier.verify(credentials.credentials)
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e),
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    user_service: UserService = Depends(get_user_service),
+) -> User:
+    """
+    Получение текущего пользователя.
+
+    Args:
+        user_id (int): ID текущего пользователя.
+        user_service (UserService): Сервис пользователей.
+
+    Returns:
+        User: Текущий пользователь.
+
+    Raises:
+        HTTPException: Если пользователь из токена не найден (401).
+    """
+    user: User | None = await user_service.get_user_by_id(user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Пользователь не найден",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return user
+
+
+def get_client_ip(request: Request) -> str | None:
+    """
+    Получение IP клиента.
+
+    Заголовок X-Real-IP учитывается, только если запрос пришёл от доверенного
+    прокси (nginx), иначе клиент мог бы подставить в него любой адрес.
+
+    Args:
+        request (Request): Запрос.
+
+    Returns:
+        str | None: IP клиента или None, если он неизвестен.
+    """
+    client_host: str | None = request.client.host if request.client else None
+    if client_host in RATE_LIMIT_TRUSTED_PROXIES:
+        return request.headers.get("x-real-ip") or client_host
+    return client_host
+
+
+def get_auth_rate_limiter() -> AuthRateLimiter | None:
+    """
+    Получение ограничения частоты запросов аутентификации.
+
+    Returns:
+        AuthRateLimiter | None: Ограничение или None, если оно выключено.
+    """
+    return container.auth_rate_limiter if RATE_LIMIT_ENABLED else None
+
+
+async def rate_limit_auth(
+    request: Request,
+    rate_limiter: AuthRateLimiter | None = Depends(get_auth_rate_limiter),
+) -> None:
+    """
+    Ограничение частоты запросов входа и регистрации по IP и email.
+
+    Каждая попытка стоит хеширования argon2, поэтому лимит проверяется до
+    обращения к базе данных и пулу хеширования. GET запросы (например,
+    /auth/me) не ограничиваются.
+
+    Args:
+        request (Request): Запрос.
+        rate_limiter (AuthRateLimiter | None): Ограничение частоты запросов.
+
+    Raises:
+        HTTPException: Если лимит исчерпан (429) с заголовком Retry-After.
+    """
+    if rate_limiter is None or request.method == "GET":
+        return
+
+    # Тело уже прочитано FastAPI, повторный вызов берёт его из кэша запроса
+    try:
+        body: Any = await request.json()
+    except ValueError:
+        body = None
+    email: Any = body.get("email") if isinstance(body, dict) else None
+
+    retry_after: float = await rate_limiter.check(
+        get_client_ip(request), normalize_email(email) if isinstance(email, str) else None
+    )
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Слишком много попыток, повторите позже",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
@@ -1,84 +1,151 @@
 """Файл методов аутентификации."""
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
-
-from database.database import get_db
+from database.database import get_sessionmaker
 from database.models.users import User
 
 from schemas.users import RegisterUserRequestSchema, LoginUserRequestSchema, \
-                          RegisterUserResponseSchema
+                          RegisterUserResponseSchema, UserResponseSchema
 
-from services.users import get_user_service
-from schemas.users import TokenSchema
+from services.users import UserService, get_user_service, rehash_user_password
+from schemas.users import TokenSchema, RefreshTokenRequestSchema
 from core.logger import logger
+from core.responses import FastJSONResponse
 from core.errors import ErrorWithStatus
+from src.auth.dependencies import get_current_user, rate_limit_auth
 
 
-auth_router = APIRouter()
+# Лимит проверяется до зависимостей и тела обработчиков
+auth_router = APIRouter(dependencies=[Depends(rate_limit_auth)])
 
 
 @auth_router.post("/register", response_model=RegisterUserResponseSchema, status_code=201)
 async def register(register_user_data: RegisterUserRequestSchema,
-                   db: Any = Depends(get_db)
-) -> RegisterUserResponseSchema:
+                   user_service: UserService = Depends(get_user_service)
+) -> FastJSONResponse:
     """
     Регистрация нового пользователя.
 
     Args:
         register_user_data (RegisterUserRequestSchema): Данные для регистрации пользователя.
-        db (AsyncSession): Сессия базы данных.
+        user_service (UserService): Сервис пользователей.
 
     Returns:
-        RegisterUserResponseSchema: Зарегистрированный пользователь.
+        FastJSONResponse: RegisterUserResponseSchema зарегистрированного пользователя.
 
     Raises:
         HTTPException: Если email некорректен (422).
         HTTPException: Если пользователь с таким email уже существует (409).
         HTTPException: Если пароль не соответствует требованиям (422).
+        HTTPException: Если пул хеширования перегружен (503).
+        HTTPException: Если превышен лимит попыток (429).
     """
-    user_service = get_user_service(db)
-
     try:
         user: User = await user_service.create_user(register_user_data.email, register_user_data.password)
     except ErrorWithStatus as e:
         raise HTTPException(status_code=e.status_code, detail=str(e))
 
-    return RegisterUserResponseSchema.model_validate(user)
+    return FastJSONResponse(RegisterUserResponseSchema.model_validate(user), status_code=201)
 
 
 @auth_router.post("/login", response_model=TokenSchema, status_code=200)
 async def login(login_user_data: LoginUserRequestSchema,
-                db: AsyncSession = Depends(get_db)
-) -> TokenSchema:
+                background_tasks: BackgroundTasks,
+                user_service: UserService = Depends(get_user_service),
+                session_factory: async_sessionmaker[AsyncSession] = Depends(get_sessionmaker)
+) -> FastJSONResponse:
     """
     Аутентификация пользователя.
 
+    Если хеш пароля создан с устаревшими параметрами argon2, он пересчитывается
+    в фоне после ответа, поэтому смена параметров не требует миграции.
+
     Args:
         login_user_data (LoginUserRequestSchema): Данные для аутентификации пользователя.
-        db (AsyncSession): Сессия базы данных.
+        background_tasks (BackgroundTasks): Фоновые задачи после ответа.
+        user_service (UserService): Сервис пользователей.
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий для фоновой задачи.
 
     Returns:
-        TokenSchema: JWT токен для аутентифицированного пользователя.
+        FastJSONResponse: TokenSchema с JWT токеном для аутентифицированного пользователя.
 
     Raises:
         HTTPException: Если пользователь с указанным email не найден (400).
         HTTPException: Если пароль неверный (400).
+        HTTPException: Если пул хеширования перегружен (503).
+        HTTPException: Если превышен лимит попыток (429).
     """
-    user_service = get_user_service(db)
-
     # Проверяем, существует ли пользователь с таким email
     user: User | None = await user_service.get_user_by_email(login_user_data.email)
     if not user:
         raise HTTPException(status_code=400, detail="Пользователь не найден")
     
     # Проверяем, совпадают ли пароли
-    if not user_service.verify_password(login_user_data.password, user.password_hash):
+    try:
+        is_password_valid: bool = await user_service.verify_password(
+            login_user_data.password, user.password_hash
+        )
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if not is_password_valid:
         raise HTTPException(status_code=400, detail="Неверный пароль")
 
+    # Сессия запроса закрывается до фоновых задач, поэтому задача открывает свою
+    if user_service.needs_rehash(user.password_hash):
+        background_tasks.add_task(rehash_user_password, session_factory, user.id,
+                                  login_user_data.password, user.password_hash)
+
     # Генерируем JWT токен
     token: TokenSchema = user_service.generate_token(user.id)
     
-    return token
+    # Схема уже провалидирована, повторная валидация по response_model не нужна
+    return FastJSONResponse(token)
+
+
+@auth_router.post("/refresh", response_model=TokenSchema, status_code=200)
+async def refresh(refresh_data: RefreshTokenRequestSchema,
+                  user_service: UserService = Depends(get_user_service)
+) -> FastJSONResponse:
+    """
+    Обмен токена обновления на новую пару токенов.
+
+    Не обращается к базе данных и не проверяет пароль. Использованный токен
+    обновления отзывается.
+
+    Args:
+        refresh_data (RefreshTokenRequestSchema): Токен обновления.
+        user_service (UserService): Сервис пользователей.
+
+    Returns:
+        FastJSONResponse: TokenSchema с новой парой токенов.
+
+    Raises:
+        HTTPException: Если токен недействителен, истек или уже использован (401).
+        HTTPException: Если превышен лимит попыток (429).
+    """
+    try:
+        token: TokenSchema = await user_service.refresh_token(refresh_data.refresh_token)
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e),
+                            headers={"WWW-Authenticate": "Bearer"})
+
+    return FastJSONResponse(token)
+
+
+@auth_router.get("/me", response_model=UserResponseSchema, status_code=200)
+async def me(user: User = Depends(get_current_user)) -> FastJSONResponse:
+    """
+    Получение текущего пользователя.
+
+    Args:
+        user (User): Текущий пользователь.
+
+    Returns:
+        FastJSONResponse: UserResponseSchema с данными текущего пользователя.
+
+    Raises:
+        HTTPException: Если токен не передан, недействителен или истек (401).
+    """
+    return FastJSONResponse(UserResponseSchema.model_validate(user))
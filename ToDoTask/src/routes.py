@@ -1,6 +1,13 @@
-from fastapi import APIRouter
+from typing import Any
 
+from fastapi import APIRouter, Response
+
+from core.container import container
+from core.metrics import METRICS_CONTENT_TYPE, render_metrics
+from core.responses import FastJSONResponse
+from database.database import get_pool_status
 from src.auth.routes import auth_router
+from src.todos.routes import todos_router
 
 
 base_router = APIRouter()
@@ -11,8 +18,50 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@base_router.get("/live", response_model=dict[str, Any], status_code=200)
+async def live() -> FastJSONResponse:
+    """Эндпоинт проверки живости воркера (503, если цикл событий заблокирован).
+
+    Отдаёт результат фоновых проверок и не обращается к базе данных.
+    """
+    status: dict[str, Any] = container.health_prober.status()
+    return FastJSONResponse({"status": "ok" if status["live"] else "fail"},
+                            status_code=200 if status["live"] else 503)
+
+
+@base_router.get("/ready", response_model=dict[str, Any], status_code=200)
+async def ready() -> FastJSONResponse:
+    """Эндпоинт проверки готовности воркера принимать запросы (503, если не готов).
+
+    Отдаёт результат фоновых проверок базы данных, пула соединений, цикла
+    событий и пула хеширования и не обращается к базе данных.
+    """
+    status: dict[str, Any] = container.health_prober.status()
+    return FastJSONResponse({"status": "ok" if status["ready"] else "fail", **status},
+                            status_code=200 if status["ready"] else 503)
+
+
+@base_router.get("/health/pool", response_model=dict[str, int | float], status_code=200)
+async def pool_status() -> dict[str, int | float]:
+    """Эндпоинт для получения метрик пула соединений с базой данных."""
+    return get_pool_status()
+
+
+@base_router.get("/metrics", response_class=Response, status_code=200)
+async def metrics() -> Response:
+    """Эндпоинт метрик в текстовом формате Prometheus."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 base_router.include_router(
     prefix="/auth",
     tags=["auth"],
     router=auth_router,
 )
+
+
+base_router.include_router(
+    prefix="/todos",
+    tags=["todos"],
+    router=todos_router,
+)
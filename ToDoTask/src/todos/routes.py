@@ -0,0 +1,329 @@
+"""Файл методов задач."""
+from datetime import date
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import TODO_PAGE_DEFAULT_LIMIT, TODO_PAGE_MAX_LIMIT
+from core.errors import ErrorWithStatus
+from core.responses import FastJSONResponse
+from database.database import get_sessionmaker
+from database.models.todos import TodoItem
+from schemas.todos import TodoCreateSchema, TodoUpdateSchema, TodoSchema, \
+                          TodoListResponseSchema, TodoBatchCreateSchema, TodoBatchUpdateSchema, \
+                          TodoBatchDeleteSchema, TodoBatchItemResultSchema, TodoBatchResponseSchema
+from services.todos import TodoService, get_todo_service
+from src.auth.dependencies import get_current_user_id
+
+
+todos_router = APIRouter()
+
+
+@todos_router.get("", response_model=TodoListResponseSchema, status_code=200)
+async def list_todos(is_done: bool | None = None,
+                     due_date: date | None = None,
+                     limit: int = Query(default=TODO_PAGE_DEFAULT_LIMIT, ge=1, le=TODO_PAGE_MAX_LIMIT),
+                     cursor: str | None = None,
+                     page: int | None = Query(default=None, ge=1),
+                     user_id: int = Depends(get_current_user_id),
+                     todo_service: TodoService = Depends(get_todo_service)
+) -> Response:
+    """
+    Получение списка задач текущего пользователя.
+
+    Основной режим - постраничная выдача по курсору: курсор следующей страницы
+    возвращается в поле `next_cursor`. Параметр `page` оставлен для совместимости.
+    Страницы кэшируются до следующего изменения задач пользователя.
+
+    Args:
+        is_done (bool | None): Фильтр по статусу выполнения.
+        due_date (date | None): Фильтр по сроку выполнения.
+        limit (int): Размер страницы.
+        cursor (str | None): Курсор, полученный с предыдущей страницы.
+        page (int | None): Номер страницы, начиная с 1.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        Response: TodoListResponseSchema с задачами страницы и курсором следующей страницы.
+
+    Raises:
+        HTTPException: Если курсор некорректен или передан вместе с page (422).
+    """
+    try:
+        content: bytes = await todo_service.list_todos_json(
+            user_id, is_done=is_done, due_date=due_date, limit=limit, cursor=cursor, page=page
+        )
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    # Страница уже сериализована (и, возможно, взята из кэша), повторная валидация не нужна
+    return Response(content=content, media_type="application/json")
+
+
+@todos_router.post("", response_model=TodoSchema, status_code=201)
+async def create_todo(todo_data: TodoCreateSchema,
+                      user_id: int = Depends(get_current_user_id),
+                      todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Создание задачи.
+
+    Args:
+        todo_data (TodoCreateSchema): Данные задачи.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoSchema созданной задачи.
+    """
+    todo: TodoItem = await todo_service.create_todo(user_id, todo_data.model_dump())
+
+    return FastJSONResponse(TodoSchema.model_validate(todo), status_code=201)
+
+
+@todos_router.post(":batch", response_model=TodoBatchResponseSchema, status_code=201)
+async def create_todos_batch(batch_data: TodoBatchCreateSchema,
+                             user_id: int = Depends(get_current_user_id),
+                             todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Пакетное создание задач в одной транзакции.
+
+    Args:
+        batch_data (TodoBatchCreateSchema): Данные создаваемых задач.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoBatchResponseSchema с результатом по каждой задаче в порядке запроса.
+
+    Raises:
+        HTTPException: Если пакет пуст или больше TODO_BATCH_MAX_SIZE (422).
+    """
+    try:
+        todos: list[TodoItem] = await todo_service.create_todos(
+            user_id, [item.model_dump() for item in batch_data.items]
+        )
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return FastJSONResponse(TodoBatchResponseSchema(results=[
+        TodoBatchItemResultSchema(id=todo.id, status_code=201, todo=TodoSchema.model_validate(todo))
+        for todo in todos
+    ]), status_code=201)
+
+
+@todos_router.patch(":batch", response_model=TodoBatchResponseSchema, status_code=200)
+async def update_todos_batch(batch_data: TodoBatchUpdateSchema,
+                             user_id: int = Depends(get_current_user_id),
+                             todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Пакетное частичное обновление задач в одной транзакции.
+
+    Args:
+        batch_data (TodoBatchUpdateSchema): ID и обновляемые поля задач.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoBatchResponseSchema с результатом по каждой задаче в порядке запроса
+            (404 для задач, которые не найдены).
+
+    Raises:
+        HTTPException: Если пакет некорректен (422).
+    """
+    try:
+        updated: dict[int, TodoItem | None] = await todo_service.update_todos(
+            user_id, [item.model_dump(exclude_unset=True) for item in batch_data.items]
+        )
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return FastJSONResponse(TodoBatchResponseSchema(results=[
+        TodoBatchItemResultSchema(id=todo_id, status_code=200, todo=TodoSchema.model_validate(todo))
+        if todo is not None else
+        TodoBatchItemResultSchema(id=todo_id, status_code=404, detail="Задача не найдена")
+        for todo_id, todo in updated.items()
+    ]))
+
+
+@todos_router.delete(":batch", response_model=TodoBatchResponseSchema, status_code=200)
+async def delete_todos_batch(batch_data: TodoBatchDeleteSchema,
+                             user_id: int = Depends(get_current_user_id),
+                             todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Пакетное удаление задач в одной транзакции.
+
+    Args:
+        batch_data (TodoBatchDeleteSchema): ID удаляемых задач.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoBatchResponseSchema с результатом по каждой задаче в порядке запроса
+            (404 для задач, которые не найдены).
+
+    Raises:
+        HTTPException: Если пакет пуст или больше TODO_BATCH_MAX_SIZE (422).
+    """
+    try:
+        deleted: dict[int, bool] = await todo_service.delete_todos(user_id, batch_data.ids)
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return FastJSONResponse(TodoBatchResponseSchema(results=[
+        TodoBatchItemResultSchema(id=todo_id, status_code=204)
+        if is_deleted else
+        TodoBatchItemResultSchema(id=todo_id, status_code=404, detail="Задача не найдена")
+        for todo_id, is_deleted in deleted.items()
+    ]))
+
+
+@todos_router.get("/export", status_code=200, responses={
+    200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+})
+async def export_todos(export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+                       user_id: int = Depends(get_current_user_id),
+                       session_factory: async_sessionmaker[AsyncSession] = Depends(get_sessionmaker)
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка всех задач текущего пользователя в NDJSON или CSV.
+
+    Args:
+        export_format (str): Формат выгрузки: "ndjson" или "csv".
+        user_id (int): ID текущего пользователя.
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных.
+
+    Returns:
+        StreamingResponse: Выгрузка задач, передаваемая частями.
+    """
+    # Сессия открывается внутри генератора: зависимости запроса закрываются
+    # до того, как начнётся передача тела потокового ответа
+    async def content() -> AsyncIterator[bytes]:
+        async with session_factory() as db:
+            async for chunk in get_todo_service(db).export_todos(user_id, export_format):
+                yield chunk
+
+    if export_format == "csv":
+        return StreamingResponse(content(), media_type="text/csv", headers={
+            "Content-Disposition": 'attachment; filename="todos.csv"',
+        })
+
+    return StreamingResponse(content(), media_type="application/x-ndjson")
+
+
+@todos_router.get("/{todo_id}", response_model=TodoSchema, status_code=200)
+async def get_todo(todo_id: int,
+                   user_id: int = Depends(get_current_user_id),
+                   todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Получение задачи.
+
+    Args:
+        todo_id (int): ID задачи.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoSchema задачи.
+
+    Raises:
+        HTTPException: Если задача не найдена (404).
+    """
+    try:
+        todo: TodoItem = await todo_service.get_todo(user_id, todo_id)
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return FastJSONResponse(TodoSchema.model_validate(todo))
+
+
+@todos_router.put("/{todo_id}", response_model=TodoSchema, status_code=200)
+async def replace_todo(todo_id: int,
+                       todo_data: TodoCreateSchema,
+                       user_id: int = Depends(get_current_user_id),
+                       todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Полное обновление задачи.
+
+    Args:
+        todo_id (int): ID задачи.
+        todo_data (TodoCreateSchema): Новые данные задачи.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoSchema обновлённой задачи.
+
+    Raises:
+        HTTPException: Если задача не найдена (404).
+    """
+    try:
+        todo: TodoItem = await todo_service.update_todo(user_id, todo_id, todo_data.model_dump())
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return FastJSONResponse(TodoSchema.model_validate(todo))
+
+
+@todos_router.patch("/{todo_id}", response_model=TodoSchema, status_code=200)
+async def update_todo(todo_id: int,
+                      todo_data: TodoUpdateSchema,
+                      user_id: int = Depends(get_current_user_id),
+                      todo_service: TodoService = Depends(get_todo_service)
+) -> FastJSONResponse:
+    """
+    Частичное обновление задачи.
+
+    Args:
+        todo_id (int): ID задачи.
+        todo_data (TodoUpdateSchema): Обновляемые поля задачи.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Returns:
+        FastJSONResponse: TodoSchema обновлённой задачи.
+
+    Raises:
+        HTTPException: Если обязательному полю передано значение null (422).
+        HTTPException: Если задача не найдена (404).
+    """
+    try:
+        todo: TodoItem = await todo_service.update_todo(
+            user_id, todo_id, todo_data.model_dump(exclude_unset=True)
+        )
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return FastJSONResponse(TodoSchema.model_validate(todo))
+
+
+@todos_router.delete("/{todo_id}", status_code=204)
+async def delete_todo(todo_id: int,
+                      user_id: int = Depends(get_current_user_id),
+                      todo_service: TodoService = Depends(get_todo_service)
+) -> Response:
+    """
+    Удаление задачи.
+
+    Args:
+        todo_id (int): ID задачи.
+        user_id (int): ID текущего пользователя.
+        todo_service (TodoService): Сервис задач.
+
+    Raises:
+        HTTPException: Если задача не найдена (404).
+    """
+    try:
+        await todo_service.delete_todo(user_id, todo_id)
+    except ErrorWithStatus as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    return Response(status_code=204)
@@ -0,0 +1,82 @@
+"""Тестирование получения текущего пользователя."""
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from httpx import AsyncClient
+
+from core.config import DATABASE_TIMEZONE
+from core.container import container
+from database.models.users import User
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_current_user(
+    first_example_user_client: AsyncClient,
+    first_example_user: User
+):
+    """
+    Тестирование получения текущего пользователя и кэша токенов.
+    """
+    response = await first_example_user_client.get("/auth/me")
+    assert response.status_code == 200
+    assert response.json()["id"] == first_example_user.id
+    assert response.json()["email"] == first_example_user.email
+
+    # Повторный запрос с тем же токеном обслуживается из кэша
+    hits_before: int = container.token_verifier.stats()["hits"]
+    response = await first_example_user_client.get("/auth/me")
+    assert response.status_code == 200
+    assert container.token_verifier.stats()["hits"] == hits_before + 1
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_current_user_without_token(unauthorized_client: AsyncClient):
+    """
+    Тестирование доступа без токена.
+    """
+    response = await unauthorized_client.get("/auth/me")
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Не передан токен авторизации"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("token_payload", [
+    {"user_id": 1, "type": "access", "exp": datetime.now(DATABASE_TIMEZONE) - timedelta(minutes=1)},
+    {"user_id": 1, "type": "refresh", "exp": datetime.now(DATABASE_TIMEZONE) + timedelta(minutes=1)},
+    {"user_id": "1", "type": "access", "exp": datetime.now(DATABASE_TIMEZONE) + timedelta(minutes=1)},
+    {"user_id": 1, "type": "access"},
+])
+async def test_current_user_invalid_token(
+    unauthorized_client: AsyncClient,
+    token_payload: dict[str, object]
+):
+    """
+    Тестирование доступа с просроченным, неподходящим или некорректным токеном.
+    """
+    token: str = jwt.encode(  # type: ignore
+        token_payload, container.jwt_keys.secret_key, algorithm=container.jwt_keys.algorithm
+    )
+
+    response = await unauthorized_client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_current_user_forged_token(unauthorized_client: AsyncClient):
+    """
+    Тестирование доступа с токеном, подписанным чужим ключом.
+    """
+    token: str = jwt.encode(  # type: ignore
+        {"user_id": 1, "type": "access", "exp": datetime.now(DATABASE_TIMEZONE) + timedelta(minutes=1)},
+        "NOT_THE_SECRET_KEY",
+        algorithm=container.jwt_keys.algorithm,
+    )
+
+    response = await unauthorized_client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Неверный токен"}
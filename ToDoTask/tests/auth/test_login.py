@@ -0,0 +1,107 @@
+"""Тестирование входа пользователя."""
+import uuid
+
+import pytest
+from argon2 import PasswordHasher
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.hashing import needs_rehash, verify_password
+from database.models.users import User
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_user(
+    unauthorized_client: AsyncClient,
+    first_example_user: User
+):
+    """
+    Тестирование входа пользователя.
+    """
+    response = await unauthorized_client.post(
+        "/auth/login",
+        json={
+            "email": first_example_user.email,
+            "password": "SuperSecretPassword1234",
+        }
+    )
+    response_json = response.json()
+
+    assert response.status_code == 200
+    assert all(field in response_json for field in (
+        "access_token", "access_token_expires_at", "refresh_token", "refresh_token_expires_at",
+    ))
+    assert response_json["token_type"] == "Bearer"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_user_wrong_password(
+    unauthorized_client: AsyncClient,
+    first_example_user: User
+):
+    """
+    Тестирование входа пользователя с неверным паролем.
+    """
+    response = await unauthorized_client.post(
+        "/auth/login",
+        json={
+            "email": first_example_user.email,
+            "password": "WrongPassword",
+        }
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Неверный пароль"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_user_not_found(unauthorized_client: AsyncClient):
+    """
+    Тестирование входа несуществующего пользователя.
+    """
+    response = await unauthorized_client.post(
+        "/auth/login",
+        json={
+            "email": "not_registered_user@localhost.com",
+            "password": "AnyPassword",
+        }
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Пользователь не найден"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_rehashes_outdated_password_hash(
+    unauthorized_client: AsyncClient,
+    async_session_local: async_sessionmaker[AsyncSession]
+):
+    """
+    Тестирование пересчёта хеша с устаревшими параметрами argon2 при входе.
+    """
+    email = f"{uuid.uuid4().hex}@localhost.com"
+    response = await unauthorized_client.post(
+        "/auth/register", json={"email": email, "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 201
+
+    outdated_hasher = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1)
+    async with async_session_local() as session:
+        user = await session.get(User, response.json()["id"])
+        user.password_hash = outdated_hasher.hash("SuperSecretPassword1234")
+        await session.commit()
+
+    response = await unauthorized_client.post(
+        "/auth/login",
+        json={
+            "email": user.email,
+            "password": "SuperSecretPassword1234",
+        }
+    )
+    assert response.status_code == 200
+
+    # ASGITransport возвращает ответ после выполнения фоновых задач
+    async with async_session_local() as session:
+        rehashed_user = await session.get(User, user.id)
+
+    assert rehashed_user.password_hash != user.password_hash
+    assert needs_rehash(rehashed_user.password_hash) is False
+    assert verify_password("SuperSecretPassword1234", rehashed_user.password_hash) is True
@@ -0,0 +1,72 @@
+"""Тестирование ограничения частоты запросов аутентификации."""
+from typing import Iterator
+
+import pytest
+from httpx import AsyncClient
+
+from core.ratelimit import AuthRateLimiter, MemoryRateLimitBackend, RateLimitRule
+from fast import app
+from src.auth.dependencies import get_auth_rate_limiter
+
+
+@pytest.fixture
+def strict_rate_limiter() -> Iterator[AuthRateLimiter]:
+    rate_limiter = AuthRateLimiter(
+        MemoryRateLimitBackend(1000),
+        ip_rule=RateLimitRule(capacity=3, refill_per_second=0.01),
+        email_rule=RateLimitRule(capacity=2, refill_per_second=0.01),
+    )
+    app.dependency_overrides[get_auth_rate_limiter] = lambda: rate_limiter
+    yield rate_limiter
+    app.dependency_overrides[get_auth_rate_limiter] = lambda: None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_rate_limited_by_ip(
+    unauthorized_client: AsyncClient,
+    strict_rate_limiter: AuthRateLimiter
+):
+    """
+    Тестирование отказа с 429 после исчерпания лимита IP.
+    """
+    headers = {"X-Real-IP": "203.0.113.1"}
+    statuses = [
+        (await unauthorized_client.post(
+            "/auth/login", json={"email": f"user{index}@localhost.com", "password": "AnyPassword"},
+            headers=headers,
+        )).status_code
+        for index in range(4)
+    ]
+    assert statuses == [400, 400, 400, 429]
+
+    response = await unauthorized_client.post(
+        "/auth/register", json={"email": "user@localhost.com", "password": "AnyPassword"},
+        headers=headers,
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Лимит другого IP (по X-Real-IP от доверенного прокси) не затронут
+    response = await unauthorized_client.post(
+        "/auth/login", json={"email": "user@localhost.com", "password": "AnyPassword"},
+        headers={"X-Real-IP": "203.0.113.2"},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_rate_limited_by_email(
+    unauthorized_client: AsyncClient,
+    strict_rate_limiter: AuthRateLimiter
+):
+    """
+    Тестирование отказа с 429 после исчерпания лимита email с разных IP.
+    """
+    statuses = [
+        (await unauthorized_client.post(
+            "/auth/login", json={"email": " Target@localhost.com", "password": "AnyPassword"},
+            headers={"X-Real-IP": f"198.51.100.{index}"},
+        )).status_code
+        for index in range(3)
+    ]
+    assert statuses == [400, 400, 429]
@@ -0,0 +1,83 @@
+"""Тестирование обновления токенов."""
+import pytest
+from httpx import AsyncClient
+
+from database.models.users import User
+
+
+async def login(client: AsyncClient, user: User) -> dict:
+    response = await client.post(
+        "/auth/login",
+        json={"email": user.email, "password": "SuperSecretPassword1234"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_rotates_tokens(
+    unauthorized_client: AsyncClient,
+    first_example_user: User
+):
+    """
+    Тестирование обмена токена обновления на новую пару токенов.
+    """
+    tokens = await login(unauthorized_client, first_example_user)
+
+    response = await unauthorized_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed["refresh_token"] != tokens["refresh_token"]
+    assert refreshed["access_token"] != tokens["access_token"]
+
+    response = await unauthorized_client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {refreshed['access_token']}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == first_example_user.id
+
+    # Новый токен обновления тоже можно обменять
+    response = await unauthorized_client.post(
+        "/auth/refresh", json={"refresh_token": refreshed["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_token_reuse_rejected(
+    unauthorized_client: AsyncClient,
+    first_example_user: User
+):
+    """
+    Тестирование отказа при повторном использовании токена обновления.
+    """
+    tokens = await login(unauthorized_client, first_example_user)
+
+    response = await unauthorized_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+    response = await unauthorized_client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Токен обновления уже использован"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_refresh_with_invalid_token(
+    unauthorized_client: AsyncClient,
+    first_example_user: User
+):
+    """
+    Тестирование отказа для токена доступа и некорректного токена.
+    """
+    tokens = await login(unauthorized_client, first_example_user)
+
+    for token in (tokens["access_token"], "not-a-token"):
+        response = await unauthorized_client.post("/auth/refresh", json={"refresh_token": token})
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Неверный токен"}
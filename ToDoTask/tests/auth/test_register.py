@@ -1,4 +1,6 @@
 """Тестирование регистрации пользователя."""
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 
@@ -131,3 +133,46 @@ async def test_register_user_invalid_password(
         assert response.json() == {
             "detail": "Пароль должен состоять минимум из 8 символов."
         }
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_register_email_case_insensitive(unauthorized_client: AsyncClient):
+    """
+    Тестирование того, что email нормализуется и уникален без учёта регистра.
+    """
+    response = await unauthorized_client.post(
+        "/auth/register", json={"email": " Case.User@Example.COM ", "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 201
+    assert response.json()["email"] == "case.user@example.com"
+
+    response = await unauthorized_client.post(
+        "/auth/register", json={"email": "CASE.USER@example.com", "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 409
+
+    # Вход не зависит от регистра email
+    response = await unauthorized_client.post(
+        "/auth/login", json={"email": "Case.User@example.com", "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 200
+
+
+# Регистрации идут параллельно в разных соединениях, а не в точках сохранения одного
+@pytest.mark.commits
+@pytest.mark.asyncio(loop_scope="session")
+async def test_register_concurrent_duplicates(unauthorized_client: AsyncClient):
+    """
+    Тестирование одновременной регистрации одного email: успешна ровно одна.
+    """
+    responses = await asyncio.gather(*(
+        unauthorized_client.post(
+            "/auth/register",
+            json={"email": "CONCURRENT@example.com" if index % 2 else "concurrent@example.com",
+                  "password": "SuperSecretPassword1234"},
+        )
+        for index in range(10)
+    ))
+
+    status_codes = sorted(response.status_code for response in responses)
+    assert status_codes == [201] + [409] * 9
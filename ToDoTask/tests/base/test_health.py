@@ -12,3 +12,28 @@ async def test_health_check(unauthorized_client: AsyncClient):
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_pool_status(unauthorized_client: AsyncClient):
+    """
+    Тестирование эндпоинта /health/pool.
+    """
+    response = await unauthorized_client.get("/health/pool")
+    assert response.status_code == 200
+    assert {"pool_size", "checked_out", "overflow", "wait_seconds_total",
+            "timeouts_total"} <= response.json().keys()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_live_and_ready(unauthorized_client: AsyncClient):
+    """
+    Тестирование эндпоинтов /live и /ready.
+    """
+    response = await unauthorized_client.get("/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+    response = await unauthorized_client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert response.json()["checks"].keys() == {"database", "db_pool", "event_loop", "password_hashing"}
@@ -0,0 +1,36 @@
+"""Тестирование настроек запуска приложения."""
+import pytest
+
+from core.config import SERVER_MAX_REQUESTS, SERVER_MAX_REQUESTS_JITTER
+from launcher import Application, FastWorker, Worker, check_workers, get_options, get_worker_class
+
+
+def test_get_worker_class():
+    """
+    Тестирование выбора воркера uvicorn.
+    """
+    assert get_worker_class(fast_loop=False) is Worker
+    assert get_worker_class(fast_loop=True) in (Worker, FastWorker)
+
+
+def test_application_config():
+    """
+    Тестирование переноса настроек в конфигурацию gunicorn.
+    """
+    application = Application("fast:app", get_options(workers=3, bind="127.0.0.1:8001"))
+
+    assert application.cfg.workers == 3
+    assert application.cfg.bind == ["127.0.0.1:8001"]
+    assert application.cfg.max_requests == SERVER_MAX_REQUESTS
+    assert application.cfg.max_requests_jitter == SERVER_MAX_REQUESTS_JITTER
+    assert issubclass(application.cfg.worker_class, Worker)
+
+
+def test_check_workers_requires_shared_revocation_store():
+    """
+    Тестирование отказа запускать несколько воркеров с хранилищем отзыва в памяти.
+    """
+    check_workers(1, revocation_backend="memory")
+    check_workers(4, revocation_backend="redis")
+    with pytest.raises(ValueError):
+        check_workers(4, revocation_backend="memory")
@@ -0,0 +1,59 @@
+"""Тестирование метрик приложения."""
+import os
+import subprocess
+import sys
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import CollectorRegistry, multiprocess
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metrics(unauthorized_client: AsyncClient):
+    """
+    Тестирование эндпоинта /metrics.
+    """
+    response = await unauthorized_client.get("/health")
+    assert response.status_code == 200
+
+    response = await unauthorized_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/health"}' in body
+    for gauge in ("db_pool_checked_out", "db_pool_overflow", "password_hashing_queued"):
+        assert f"\n{gauge} " in body
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metrics_route_template(new_user_client: AsyncClient):
+    """
+    Тестирование того, что метка маршрута - шаблон пути, а не сам путь.
+    """
+    response = await new_user_client.get("/todos/999999999")
+    assert response.status_code == 404
+
+    body = (await new_user_client.get("/metrics")).text
+    assert 'route="/todos/{todo_id}",status="404"' in body
+    assert "/todos/999999999" not in body
+
+
+def test_metrics_multiprocess(tmp_path):
+    """
+    Тестирование суммирования метрик нескольких процессов через общий каталог.
+    """
+    script = "from core.metrics import observe_request; observe_request('GET', '/health', 200, 0.01)"
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", script], env=env, check=True)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+    assert registry.get_sample_value(
+        "http_requests_total", {"method": "GET", "route": "/health", "status": "200"}
+    ) == 2
+    assert registry.get_sample_value(
+        "http_request_duration_seconds_count", {"method": "GET", "route": "/health"}
+    ) == 2
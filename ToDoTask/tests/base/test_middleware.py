@@ -0,0 +1,32 @@
+"""Тестирование middleware приложения."""
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_invalid_host(unauthorized_client: AsyncClient):
+    """
+    Тестирование отклонения запроса с недопустимым Host.
+    """
+    response = await unauthorized_client.get("/health", headers={"Host": "example.com"})
+    assert response.status_code == 400
+    assert response.text == "Invalid host header"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_request_id(unauthorized_client: AsyncClient):
+    """
+    Тестирование передачи и генерации ID запроса.
+    """
+    response = await unauthorized_client.get("/health", headers={"X-Request-ID": "req-123"})
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+    # Некорректный ID заменяется сгенерированным
+    response = await unauthorized_client.get("/health", headers={"X-Request-ID": "bad id\t"})
+    assert response.headers["X-Request-ID"] != "bad id\t"
+    assert len(response.headers["X-Request-ID"]) == 32
+
+    response = await unauthorized_client.get("/health")
+    assert len(response.headers["X-Request-ID"]) == 32
@@ -0,0 +1,34 @@
+"""Тестирование JSON ответов приложения."""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from core.responses import FastJSONResponse
+from schemas.users import UserResponseSchema
+
+
+def test_fast_json_response_renders_schema_and_data():
+    """
+    Тестирование сериализации схемы через pydantic-core и данных через orjson.
+    """
+    user = UserResponseSchema(id=1, email="user@localhost.com",
+                              created_at=datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    assert FastJSONResponse(user).body == user.model_dump_json().encode()
+    assert json.loads(FastJSONResponse({"detail": "Ошибка", 1: None}).body) == {
+        "detail": "Ошибка", "1": None,
+    }
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_validation_error_response(unauthorized_client: AsyncClient):
+    """
+    Тестирование ответа на ошибку валидации запроса.
+    """
+    response = await unauthorized_client.post("/auth/login", json={"email": "user@localhost.com"})
+
+    assert response.status_code == 422
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"detail": "'password' Field required"}
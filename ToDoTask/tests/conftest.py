@@ -1,57 +1,193 @@
-"""Конфигурационный файл для тестов."""
-from typing import AsyncGenerator
-
+"""Конфигурационный файл для тестов.
+
+Схема тестовой базы (POSTGRES_TEST_DB) строится один раз за запуск, и база
+служит шаблоном: каждый воркер pytest-xdist (и запуск без xdist) получает
+свою копию через CREATE DATABASE ... TEMPLATE, поэтому тесты можно
+запускать параллельно (`pytest -n auto`). Каждый тест выполняется в
+транзакции отдельного соединения, сессии приложения работают в её точках
+сохранения, а после теста транзакция откатывается. Тесты с маркером
+`commits` (например, проверяющие гонки нескольких соединений) работают
+с пулом и фиксируют данные в базе воркера.
+"""
+import os
+import uuid
+from typing import AsyncGenerator, Callable, Generator
+
+import pytest
 import pytest_asyncio
 from asgi_lifespan import LifespanManager
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, \
+from sqlalchemy import create_engine as create_sync_engine, make_url, text
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, \
                                     AsyncConnection, AsyncSession, AsyncTransaction
 
 
+from core.cache import CacheBackend, MemoryCacheBackend
 from core.config import ASYNC_DATABASE_TEST_URL
-from database.database import get_db
+from core.container import container
+from database.database import create_engine, get_db, get_sessionmaker
 from database.models.base import DefaultBase
 from database.models.users import User 
+from database.session import LazySession
 from services.users import get_user_service
+from src.auth.dependencies import get_auth_rate_limiter
 from fast import app
 
 
+# ID воркера pytest-xdist ("gw0", "gw1", ...), без xdist - "main"
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
 # ----------------------------------------------------------------------
-# Конфигурация тестовой базы данных для FAST API сервера
-@pytest_asyncio.fixture(scope="session", autouse=True)
-async def async_engine() -> AsyncGenerator[AsyncEngine, None]:
-    yield create_async_engine(ASYNC_DATABASE_TEST_URL, echo=False, future=True)
+# Шаблон и копии тестовой базы данных
+def get_sync_url(database: str | None = None) -> URL:
+    url: URL = make_url(ASYNC_DATABASE_TEST_URL).set(drivername="postgresql+psycopg2")
+    return url.set(database=database) if database is not None else url
 
 
-@pytest_asyncio.fixture(scope="session", autouse=True)
-async def async_session_local(
-    async_engine: AsyncEngine
-) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
-    yield async_sessionmaker(autocommit=False, autoflush=False, bind=async_engine)
+def execute_admin(*statements: str) -> None:
+    # CREATE/DROP DATABASE выполняются вне транзакции из служебной базы postgres
+    engine = create_sync_engine(get_sync_url("postgres"), isolation_level="AUTOCOMMIT")
+    try:
+        with engine.connect() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+    finally:
+        engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="session", autouse=True)
-async def setup_database(async_engine: AsyncEngine):
-    async with async_engine.begin() as conn:
-        await conn.run_sync(DefaultBase.metadata.drop_all)
-        await conn.run_sync(DefaultBase.metadata.create_all)
+def clone_template_database(name: str) -> str:
+    """Создание копии шаблонной базы, возвращает URL asyncpg копии."""
+    template: str | None = make_url(ASYNC_DATABASE_TEST_URL).database
+    execute_admin(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)',
+                  f'CREATE DATABASE "{name}" TEMPLATE "{template}"')
+    return make_url(ASYNC_DATABASE_TEST_URL).set(database=name).render_as_string(hide_password=False)
 
-    yield
 
-    # async with async_engine.begin() as conn:
-        # await conn.run_sync(DefaultBase.metadata.drop_all)
+def drop_database(name: str) -> None:
+    execute_admin(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
 
 
-# Функциия для получения асинрхонной сессии к тестовой базе данных
+def pytest_configure(config: pytest.Config) -> None:
+    # Шаблон строится один раз: в основном процессе xdist или в запуске без xdist
+    if hasattr(config, "workerinput"):
+        return
+
+    engine = create_sync_engine(get_sync_url())
+    try:
+        DefaultBase.metadata.drop_all(engine)
+        DefaultBase.metadata.create_all(engine)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def clone_database() -> Generator[Callable[[str], str], None, None]:
+    """Возвращает функцию создания копии шаблона для текущего воркера (удаляется после тестов)."""
+    names: list[str] = []
+
+    def _clone(name: str) -> str:
+        names.append(f"{name}_{WORKER_ID}")
+        return clone_template_database(names[-1])
+
+    yield _clone
+
+    for name in names:
+        drop_database(name)
+
+
+# ----------------------------------------------------------------------
+# Конфигурация тестовой базы данных для FAST API сервера
 @pytest_asyncio.fixture(scope="session", autouse=True)
-async def override_get_db(async_session_local: async_sessionmaker[AsyncSession]):
+async def async_engine(clone_database: Callable[[str], str]) -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_engine(clone_database(str(make_url(ASYNC_DATABASE_TEST_URL).database)), echo=False)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_session_local(
+    async_engine: AsyncEngine
+) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Фабрика сессий на соединениях пула, данные фиксируются в базе воркера."""
+    yield async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False,
+                             bind=async_engine)
+
+
+def override_database(session_local: async_sessionmaker[AsyncSession]) -> None:
     # Причина вложенности кроется в ошибке, возникающей из-за аннотации.
     # Нельзя овверайдить функцию с переданным аргументов, аннотация которого = async_sessionmaker[AsyncSession]
     # Так как async_sessionmaker[AsyncSession] is not a valid Pydantic Field
     async def _get_test_db():
-        async with async_session_local() as db:
+        db = LazySession(session_local)
+        try:
             yield db
+        finally:
+            await db.close()
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_sessionmaker] = lambda: session_local
+
+
+# Функциия для получения асинрхонной сессии к тестовой базе данных
+# вне тестов (в фикстурах уровня сессии и lifespan приложения)
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def override_get_db(shared_session_local: async_sessionmaker[AsyncSession]):
+    override_database(shared_session_local)
+    # Тесты регистрируют и авторизуют много пользователей с одного адреса,
+    # ограничение частоты проверяется отдельно в tests/auth/test_rate_limit.py
+    app.dependency_overrides[get_auth_rate_limiter] = lambda: None
+
+
+# Соединение теста с транзакцией, откатываемой после теста
+@pytest_asyncio.fixture(autouse=True)
+async def db_connection(
+    request: pytest.FixtureRequest, async_engine: AsyncEngine
+) -> AsyncGenerator[AsyncConnection | None, None]:
+    if request.node.get_closest_marker("commits") is not None:
+        yield None
+        return
+
+    async with async_engine.connect() as connection:
+        transaction: AsyncTransaction = await connection.begin()
+        try:
+            yield connection
+        finally:
+            await transaction.rollback()
+
+
+@pytest_asyncio.fixture
+async def async_session_local(
+    db_connection: AsyncConnection | None,
+    shared_session_local: async_sessionmaker[AsyncSession]
+) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Фабрика сессий теста: commit фиксирует точку сохранения в транзакции теста."""
+    if db_connection is None:
+        yield shared_session_local
+        return
+
+    yield async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False,
+                             bind=db_connection, join_transaction_mode="create_savepoint")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def isolate_database(
+    async_session_local: async_sessionmaker[AsyncSession],
+    shared_session_local: async_sessionmaker[AsyncSession]
+):
+    override_database(async_session_local)
+    yield
+    override_database(shared_session_local)
+
+
+# Сброс общего кэша после теста: откаченные данные не должны отдаваться из кэша
+@pytest_asyncio.fixture(autouse=True)
+async def reset_caches():
+    yield
+    cache_backend: CacheBackend | None = container.__dict__.get("cache_backend")
+    if isinstance(cache_backend, MemoryCacheBackend):
+        cache_backend.values.clear()
+        cache_backend.versions.clear()
 
 # ----------------------------------------------------------------------
 
@@ -93,7 +229,7 @@ async def session(
 @pytest_asyncio.fixture(scope="session")
 async def session_no_rollback(connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
     """Фикстура для создания асинхронной сессии базы данных без отката транзакции."""
-    async_session = AsyncSession(bind=connection)
+    async_session = AsyncSession(bind=connection, expire_on_commit=False)
     try:
         yield async_session
     finally:
@@ -141,7 +277,7 @@ async def first_example_user(session_no_rollback: AsyncSession) -> User:
 @pytest_asyncio.fixture(scope="session")
 async def first_example_user_client(
     unauthorized_client: AsyncClient,
-    base_client: AsyncClient,
+    first_example_user: User,
 ) -> AsyncGenerator[AsyncClient, None]:
     """Возвращает AsyncClient первого пользователя."""
 
@@ -149,12 +285,35 @@ async def first_example_user_client(
     response = await unauthorized_client.post(
         "/auth/login",
         json={
-            "email": "first_example_user@localhost.com",
+            "email": first_example_user.email,
             "password": "SuperSecretPassword1234",
         },
     )
 
-    authorized_client = base_client
-    authorized_client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
-
-    yield authorized_client
+    # Отдельный клиент, чтобы заголовок авторизации не попал в unauthorized_client
+    async with AsyncClient(transport=ASGITransport(app=app),
+                    base_url="http://127.0.0.1:8000",
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {response.json()['access_token']}",
+                    }) as authorized_client:
+        yield authorized_client
+
+
+# Асинхронный тестовый клиент для нового пользователя без данных
+@pytest_asyncio.fixture
+async def new_user_client(unauthorized_client: AsyncClient) -> AsyncGenerator[AsyncClient, None]:
+    """Возвращает AsyncClient нового зарегистрированного пользователя."""
+    email = f"user_{uuid.uuid4().hex}@localhost.com"
+    password = "SuperSecretPassword1234"
+
+    await unauthorized_client.post("/auth/register", json={"email": email, "password": password})
+    response = await unauthorized_client.post("/auth/login", json={"email": email, "password": password})
+
+    async with AsyncClient(transport=ASGITransport(app=app),
+                    base_url="http://127.0.0.1:8000",
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {response.json()['access_token']}",
+                    }) as authorized_client:
+        yield authorized_client
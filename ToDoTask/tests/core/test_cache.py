@@ -0,0 +1,175 @@
+"""Тестирование кэшей."""
+import asyncio
+
+import pytest
+
+from core.cache import LRUCache, MemoryCacheBackend, RedisCacheBackend, RedisError, \
+    SingleFlight, TodoListCache
+from core.config import REDIS_URL
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """
+    Тестирование вытеснения давно не использованных записей.
+    """
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("first", 1)
+    cache.set("second", 2)
+
+    # Обращение делает запись "first" самой свежей
+    assert cache.get("first") == 1
+    cache.set("third", 3)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+    assert cache.get("third") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_lru_cache_expires_entries():
+    """
+    Тестирование истечения срока жизни записей.
+    """
+    now: list[float] = [1000.0]
+    cache: LRUCache[str, int] = LRUCache(maxsize=10, ttl=5, clock=lambda: now[0])
+    cache.set("default_ttl", 1)
+    cache.set("explicit_expiration", 2, expires_at=1010.0)
+
+    now[0] = 1005.0
+    assert cache.get("default_ttl") is None
+    assert cache.get("explicit_expiration") == 2
+
+    now[0] = 1010.0
+    assert cache.get("explicit_expiration") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_single_flight_coalesces_concurrent_loads():
+    """
+    Тестирование объединения одновременных загрузок одного ключа.
+    """
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def load() -> bytes:
+        calls.append("load")
+        await release.wait()
+        return b"value"
+
+    waiters = [asyncio.create_task(single_flight.do("key", load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [b"value"] * 10
+    assert calls == ["load"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_single_flight_propagates_errors():
+    """
+    Тестирование передачи ошибки загрузки всем ожидающим.
+    """
+    single_flight = SingleFlight()
+
+    async def load() -> bytes:
+        await asyncio.sleep(0)
+        raise ValueError("load failed")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", load) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_single_flight_survives_leader_cancellation():
+    """
+    Тестирование того, что отмена загружающего запроса не отменяет ожидающих.
+    """
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def load() -> bytes:
+        calls.append("load")
+        await release.wait()
+        return b"value"
+
+    leader = asyncio.create_task(single_flight.do("key", load))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(single_flight.do("key", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*followers) == [b"value"] * 3
+    # Загрузку повторил только один из ожидающих
+    assert calls == ["load", "load"]
+
+
+async def check_todo_list_cache(cache: TodoListCache):
+    """Общая проверка кэша списка задач для любого бэкенда."""
+    loads: list[int] = []
+
+    async def load() -> bytes:
+        loads.append(1)
+        return f"page-{len(loads)}".encode()
+
+    params = {"is_done": None, "limit": 20}
+
+    assert await cache.get_or_load(1, params, load) == b"page-1"
+    assert await cache.get_or_load(1, params, load) == b"page-1"
+    # Другие параметры и другой пользователь - другие ключи
+    assert await cache.get_or_load(1, {**params, "limit": 10}, load) == b"page-2"
+    assert await cache.get_or_load(2, params, load) == b"page-3"
+
+    # Изменение задач пользователя сбрасывает только его страницы
+    await cache.invalidate(1)
+    assert await cache.get_or_load(1, params, load) == b"page-4"
+    assert await cache.get_or_load(2, params, load) == b"page-3"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_list_cache_memory_backend():
+    """
+    Тестирование кэша списка задач в памяти процесса.
+    """
+    cache = TodoListCache(MemoryCacheBackend(maxsize=100), ttl=60)
+    await check_todo_list_cache(cache)
+    assert cache.stats() == {"hits": 2, "misses": 4}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_memory_backend_lost_version_does_not_reuse_old_pages():
+    """
+    Тестирование того, что вытесненная версия не возвращает старые страницы.
+    """
+    backend = MemoryCacheBackend(maxsize=100)
+    version = await backend.incr_version("todos:1:version")
+    backend.versions.clear()
+
+    assert await backend.get_version("todos:1:version") > version
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_list_cache_redis_backend():
+    """
+    Тестирование кэша списка задач в Redis.
+    """
+    backend = RedisCacheBackend(REDIS_URL)
+    try:
+        try:
+            await backend.redis.ping()
+        except RedisError:
+            pytest.skip("Redis недоступен")
+
+        await backend.redis.delete("todos:1:version", "todos:2:version")
+        await check_todo_list_cache(TodoListCache(backend, ttl=60))
+    finally:
+        await backend.close()
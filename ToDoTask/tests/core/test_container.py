@@ -0,0 +1,68 @@
+"""Тестирование контейнера зависимостей."""
+import gc
+import os
+import tracemalloc
+import weakref
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from core.container import container
+from services.users import get_user_service
+
+
+# Количество имитируемых запросов в нагрузочном тесте памяти
+SOAK_TEST_REQUESTS = int(os.getenv("SOAK_TEST_REQUESTS", 100_000))
+# Допустимый прирост памяти за весь нагрузочный тест
+SOAK_TEST_MAX_GROWTH_BYTES = 256 * 1024
+
+
+def test_user_service_shares_singletons():
+    """
+    Тестирование того, что сервисы создаются на запрос, а общие объекты - один раз.
+    """
+    first_service = get_user_service(AsyncSession())
+    second_service = get_user_service(AsyncSession())
+
+    assert first_service is not second_service
+    assert first_service.db is not second_service.db
+    assert first_service.hashing_pool is second_service.hashing_pool
+    assert first_service.jwt_keys is second_service.jwt_keys
+
+
+def test_user_service_does_not_retain_session(async_engine: AsyncEngine):
+    """
+    Тестирование того, что после запроса сессия не удерживается в памяти.
+    """
+    session = AsyncSession(bind=async_engine)
+    session_ref = weakref.ref(session)
+
+    get_user_service(session)
+    del session
+    gc.collect()
+
+    assert session_ref() is None
+
+
+def test_user_service_memory_is_flat(async_engine: AsyncEngine):
+    """
+    Нагрузочный тест памяти: сборка сервисов на каждый запрос не накапливает объекты.
+    """
+    def simulate_requests(count: int) -> None:
+        for _ in range(count):
+            get_user_service(AsyncSession(bind=async_engine))
+
+    # Прогрев: создание общих объектов и внутренних кэшей SQLAlchemy
+    container.jwt_keys
+    simulate_requests(1_000)
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        simulate_requests(SOAK_TEST_REQUESTS)
+        gc.collect()
+        end_size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert end_size - start_size < SOAK_TEST_MAX_GROWTH_BYTES
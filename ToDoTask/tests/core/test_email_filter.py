@@ -0,0 +1,107 @@
+"""Тестирование фильтра зарегистрированных email."""
+import asyncio
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import MemoryCacheBackend
+from core.container import container
+from core.email_filter import BloomFilter, EmailFilter, EMAIL_FILTER_VERSION_KEY
+from database.models.users import User
+
+
+def test_bloom_filter_false_positive_rate():
+    """
+    Тестирование отсутствия ложноотрицательных ответов и доли ложных срабатываний.
+    """
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    for index in range(10_000):
+        bloom.add(f"user{index}@localhost.com")
+
+    assert all(f"user{index}@localhost.com" in bloom for index in range(10_000))
+    false_positives = sum(f"missing{index}@localhost.com" in bloom for index in range(10_000))
+    assert false_positives / 10_000 < 0.02
+    assert bloom.expected_false_positive_rate() == pytest.approx(0.01, rel=0.2)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_email_filter_syncs_users_of_other_workers(
+    async_session_local: async_sessionmaker[AsyncSession]
+):
+    """
+    Тестирование дочитывания пользователя, зарегистрированного другим воркером.
+    """
+    now = [0.0]
+    backend = MemoryCacheBackend(100)
+    email_filter = EmailFilter(backend, capacity=1000, error_rate=0.01, sync_interval=60,
+                               clock=lambda: now[0])
+    email = f"{uuid.uuid4().hex}@localhost.com"
+
+    await email_filter.start(async_session_local)
+    try:
+        assert await email_filter.might_exist(email) is False
+
+        # Другой воркер регистрирует пользователя и увеличивает версию
+        async with async_session_local() as db:
+            db.add(User(email=email, password_hash="hash"))
+            await db.commit()
+        assert await email_filter.might_exist(email) is False
+        await backend.incr_version(EMAIL_FILTER_VERSION_KEY)
+
+        assert await email_filter.might_exist(email) is True
+    finally:
+        await email_filter.stop()
+
+    assert email_filter.stats()["negatives"] == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_unknown_email_rejected_by_filter(unauthorized_client: AsyncClient):
+    """
+    Тестирование отказа во входе по незарегистрированному email без поиска в базе.
+    """
+    email = f"{uuid.uuid4().hex}@localhost.com"
+    negatives = container.email_filter.stats()["negatives"]
+
+    response = await unauthorized_client.post(
+        "/auth/login", json={"email": email, "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Пользователь не найден"}
+    assert container.email_filter.stats()["negatives"] == negatives + 1
+
+    # Зарегистрированный email фильтр пропускает сразу после регистрации
+    response = await unauthorized_client.post(
+        "/auth/register", json={"email": email.upper(), "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 201
+    response = await unauthorized_client.post(
+        "/auth/login", json={"email": email, "password": "SuperSecretPassword1234"}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_email_filter_background_sync(async_session_local: async_sessionmaker[AsyncSession]):
+    """
+    Тестирование фонового дочитывания пользователей без обращения запросов к базе.
+    """
+    backend = MemoryCacheBackend(100)
+    email_filter = EmailFilter(backend, capacity=1000, error_rate=0.01, sync_interval=0.01)
+    email = f"{uuid.uuid4().hex}@localhost.com"
+
+    await email_filter.start(async_session_local)
+    try:
+        async with async_session_local() as db:
+            db.add(User(email=email, password_hash="hash"))
+            await db.commit()
+
+        for _ in range(100):
+            if email in email_filter.bloom:
+                break
+            await asyncio.sleep(0.01)
+        assert email in email_filter.bloom
+    finally:
+        await email_filter.stop()
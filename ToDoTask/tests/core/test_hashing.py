@@ -0,0 +1,138 @@
+"""Тестирование пула хеширования паролей."""
+import asyncio
+import threading
+
+import pytest
+from argon2 import PasswordHasher
+
+from core.errors import ErrorWithStatus
+from core.hashing import PasswordHashingPool, get_password_hasher, needs_rehash
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hashing_pool_hash_and_verify():
+    """
+    Тестирование хеширования и проверки пароля через пул.
+    """
+    pool = PasswordHashingPool("thread", workers=1, queue_size=1)
+    try:
+        password_hash = await pool.hash_password("SuperSecretPassword1234")
+
+        assert await pool.verify_password("SuperSecretPassword1234", password_hash) is True
+        assert await pool.verify_password("WrongPassword", password_hash) is False
+        assert pool.stats()["completed_total"] == 3
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hashing_pool_rejects_when_queue_is_full():
+    """
+    Тестирование отказа с 503 при переполнении очереди пула.
+    """
+    pool = PasswordHashingPool("thread", workers=1, queue_size=1)
+    release = threading.Event()
+    try:
+        # Первая задача занимает воркер, вторая ожидает в очереди
+        running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert pool.stats()["busy"] == 1
+        assert pool.stats()["queued"] == 1
+
+        with pytest.raises(ErrorWithStatus) as exc_info:
+            await pool.run(release.wait)
+        assert exc_info.value.status_code == 503
+        assert pool.stats()["rejected_total"] == 1
+
+        release.set()
+        await asyncio.gather(*running)
+        assert pool.stats()["busy"] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hashing_pool_keeps_slot_of_cancelled_request():
+    """
+    Тестирование того, что отменённый запрос не освобождает место в пуле,
+    пока его задача выполняется, а задача из очереди отменяется.
+    """
+    pool = PasswordHashingPool("thread", workers=1, queue_size=1)
+    release = threading.Event()
+    try:
+        running = asyncio.create_task(pool.run(release.wait))
+        queued = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        # Как при разрыве соединения клиентами
+        running.cancel()
+        queued.cancel()
+        await asyncio.gather(running, queued, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        stats = pool.stats()
+        assert stats["busy"] == 1
+        assert stats["queued"] == 0
+        assert stats["cancelled_total"] == 1
+
+        release.set()
+        for _ in range(100):
+            if pool.stats()["busy"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.stats()["busy"] == 0
+        assert pool.stats()["completed_total"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hashing_pool_rejects_while_cancelled_task_runs():
+    """
+    Тестирование отказа с 503, пока выполняется задача отменённого запроса.
+    """
+    pool = PasswordHashingPool("thread", workers=1, queue_size=0)
+    release = threading.Event()
+    try:
+        running = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+
+        with pytest.raises(ErrorWithStatus) as exc_info:
+            await pool.run(release.wait)
+        assert exc_info.value.status_code == 503
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_hashing_pool_counts_failures():
+    """
+    Тестирование учёта задач, завершившихся ошибкой.
+    """
+    pool = PasswordHashingPool("thread", workers=1, queue_size=0)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            await pool.run(divmod, 1, 0)
+
+        assert pool.stats()["failed_total"] == 1
+        assert pool.stats()["completed_total"] == 0
+        assert pool.stats()["busy"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_needs_rehash():
+    """
+    Тестирование определения хешей с устаревшими параметрами.
+    """
+    outdated_hasher = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1)
+
+    assert needs_rehash(get_password_hasher().hash("SuperSecretPassword1234")) is False
+    assert needs_rehash(outdated_hasher.hash("SuperSecretPassword1234")) is True
+    assert needs_rehash("not-a-hash") is True
@@ -0,0 +1,68 @@
+"""Тестирование логирования."""
+import io
+import json
+import threading
+
+import pytest
+import structlog
+
+from core.logger import ACCESS_LOG_EVENT, EventSampler, QueueLogWriter
+
+
+def test_event_sampler():
+    """
+    Тестирование прореживания частых событий.
+    """
+    sampler = EventSampler({ACCESS_LOG_EVENT: 0.25}, random_func=iter([0.1, 0.5, 0.9]).__next__)
+
+    assert sampler(None, "info", {"event": ACCESS_LOG_EVENT}) == {"event": ACCESS_LOG_EVENT}
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "info", {"event": ACCESS_LOG_EVENT})
+    # Ошибки и события без доли записи не прореживаются
+    assert sampler(None, "error", {"event": ACCESS_LOG_EVENT})
+    assert sampler(None, "info", {"event": "other"})
+
+
+def test_queue_log_writer():
+    """
+    Тестирование записи логов в JSON фоновым потоком.
+    """
+    stream = io.StringIO()
+    writer = QueueLogWriter(stream, maxsize=100)
+    for index in range(10):
+        writer.write({"event": "Событие", "index": index})
+    writer.close()
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"event": "Событие", "index": index} for index in range(10)
+    ]
+    assert writer.dropped == 0
+
+
+def test_queue_log_writer_drops_when_full():
+    """
+    Тестирование того, что при переполнении очереди записи отбрасываются без ожидания.
+    """
+    released = threading.Event()
+    started = threading.Event()
+
+    class BlockingStream(io.StringIO):
+        def write(self, text: str) -> int:
+            started.set()
+            released.wait(5)
+            return super().write(text)
+
+    stream = BlockingStream()
+    writer = QueueLogWriter(stream, maxsize=2)
+    writer.write({"event": "first"})
+    assert started.wait(5)
+
+    # Поток записи занят выводом первой записи, в очереди помещаются две
+    for index in range(5):
+        writer.write({"event": "next", "index": index})
+    assert writer.dropped == 3
+
+    released.set()
+    writer.close()
+    assert len(stream.getvalue().splitlines()) == 3
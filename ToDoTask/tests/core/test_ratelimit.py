@@ -0,0 +1,50 @@
+"""Тестирование бэкендов ограничения частоты запросов."""
+import pytest
+
+from core.cache import RedisError
+from core.config import REDIS_URL
+from core.ratelimit import MemoryRateLimitBackend, RedisRateLimitBackend, RateLimitRule
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_memory_backend_refills_tokens():
+    """
+    Тестирование расхода и пополнения запаса запросов.
+    """
+    now = [100.0]
+    backend = MemoryRateLimitBackend(10, clock=lambda: now[0])
+    rule = RateLimitRule(capacity=2, refill_per_second=0.5)
+
+    assert await backend.acquire("key", rule) == 0
+    assert await backend.acquire("key", rule) == 0
+    assert await backend.acquire("key", rule) == pytest.approx(2.0)
+
+    now[0] += 1
+    assert await backend.acquire("key", rule) == pytest.approx(1.0)
+    now[0] += 1
+    assert await backend.acquire("key", rule) == 0
+    # Запас других ключей не расходуется
+    assert await backend.acquire("other", rule) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redis_backend_limits_tokens():
+    """
+    Тестирование token bucket в Redis.
+    """
+    backend = RedisRateLimitBackend(REDIS_URL)
+    try:
+        try:
+            await backend.redis.ping()
+        except RedisError:
+            pytest.skip("Redis недоступен")
+
+        await backend.redis.delete("ratelimit:test")
+        rule = RateLimitRule(capacity=2, refill_per_second=0.5)
+
+        assert await backend.acquire("ratelimit:test", rule) == 0
+        assert await backend.acquire("ratelimit:test", rule) == 0
+        assert await backend.acquire("ratelimit:test", rule) == pytest.approx(2.0, abs=0.1)
+        assert 0 < await backend.redis.pttl("ratelimit:test") <= 5000
+    finally:
+        await backend.close()
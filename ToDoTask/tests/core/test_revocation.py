@@ -0,0 +1,54 @@
+"""Тестирование хранилищ отозванных токенов."""
+import time
+import uuid
+
+import pytest
+
+from core.cache import RedisError
+from core.config import REDIS_URL
+from core.revocation import MemoryRevocationStore, RedisRevocationStore
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_memory_store_purges_expired_buckets():
+    """
+    Тестирование отзыва токенов и удаления истёкших корзин.
+    """
+    now = [1000.0]
+    store = MemoryRevocationStore(bucket_seconds=60, clock=lambda: now[0])
+    first_jti, second_jti = uuid.uuid4().hex, uuid.uuid4().hex
+
+    assert await store.revoke(first_jti, expires_at=1030) is True
+    assert await store.revoke(first_jti, expires_at=1030) is False
+    assert await store.revoke(second_jti, expires_at=1500) is True
+    assert await store.is_revoked(first_jti, expires_at=1030) is True
+    assert await store.is_revoked(uuid.uuid4().hex, expires_at=1030) is False
+    assert len(store.buckets) == 2
+
+    # Корзина удаляется целиком, когда истекают все токены в ней
+    now[0] = 1080
+    store.purge()
+    assert len(store.buckets) == 1
+    assert await store.is_revoked(second_jti, expires_at=1500) is True
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redis_store_revokes_once():
+    """
+    Тестирование отзыва токенов в Redis.
+    """
+    store = RedisRevocationStore(REDIS_URL, bucket_seconds=60)
+    try:
+        try:
+            await store.redis.ping()
+        except RedisError:
+            pytest.skip("Redis недоступен")
+
+        jti, expires_at = uuid.uuid4().hex, time.time() + 30
+
+        assert await store.revoke(jti, expires_at) is True
+        assert await store.revoke(jti, expires_at) is False
+        assert await store.is_revoked(jti, expires_at) is True
+        assert 0 < await store.redis.ttl(store._key(store._bucket(expires_at))) <= 90
+    finally:
+        await store.close()
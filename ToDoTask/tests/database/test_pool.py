@@ -0,0 +1,52 @@
+"""Тестирование пула соединений с базой данных."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from core.config import ASYNC_DATABASE_TEST_URL
+from database.database import create_engine, get_connect_args
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_pool_stats():
+    """
+    Тестирование метрик выдачи соединений и таймаутов пула.
+    """
+    engine = create_engine(ASYNC_DATABASE_TEST_URL, echo=False,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 1
+            assert stats["checkouts_total"] == 1
+
+            # Единственное соединение занято, второе дождаться нельзя
+            with pytest.raises(PoolTimeoutError):
+                await engine.connect()
+
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1
+        assert stats["timeouts_total"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_pgbouncer_mode():
+    """
+    Тестирование работы без кэша подготовленных выражений в режиме PgBouncer.
+    """
+    connect_args = get_connect_args(pgbouncer_mode=True)
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+    engine = create_engine(ASYNC_DATABASE_TEST_URL, echo=False, connect_args=connect_args)
+    try:
+        async with engine.connect() as connection:
+            for value in range(3):
+                assert (await connection.execute(text("SELECT CAST(:value AS integer)"), {"value": value})).scalar() == value
+    finally:
+        await engine.dispose()
@@ -0,0 +1,85 @@
+"""Тестирование ленивой сессии базы данных."""
+from typing import AsyncGenerator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from database.database import get_db
+from database.models.todos import TodoItem
+from database.models.users import User
+from database.session import LazySession
+from fast import app
+
+
+# Счётчики пула видны только для сессий на соединениях пула
+@pytest.mark.commits
+@pytest.mark.asyncio(loop_scope="session")
+async def test_lazy_session_checks_out_on_first_query_and_releases(
+    async_engine: AsyncEngine,
+    async_session_local: async_sessionmaker[AsyncSession],
+    new_user_client: AsyncClient
+):
+    """
+    Тестирование выдачи соединения при первом запросе и его возврата в пул.
+    """
+    email = (await new_user_client.get("/auth/me")).json()["email"]
+    checked_out: int = async_engine.pool.stats()["checked_out"]
+
+    db = LazySession(async_session_local)
+    try:
+        assert not db.is_opened
+        assert not db.in_transaction()
+        # Отпускание ещё не созданной сессии ничего не делает
+        await db.release()
+        assert not db.is_opened
+
+        user: User | None = await db.scalar(select(User).where(User.email == email))
+        assert user is not None
+        assert async_engine.pool.stats()["checked_out"] == checked_out + 1
+
+        await db.release()
+        assert async_engine.pool.stats()["checked_out"] == checked_out
+        # Загруженные значения доступны и после возврата соединения
+        assert user.email == email
+
+        # Несохранённые изменения не теряются: соединение не отпускается
+        db.add(TodoItem(owner_id=user.id, title="Задача до commit"))
+        await db.flush()
+        await db.release()
+        assert db.in_transaction()
+        await db.rollback()
+    finally:
+        await db.close()
+
+    assert async_engine.pool.stats()["checked_out"] == checked_out
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached_list_does_not_open_session(
+    async_session_local: async_sessionmaker[AsyncSession],
+    new_user_client: AsyncClient
+):
+    """
+    Тестирование того, что ответ из кэша не создаёт сессию базы данных.
+    """
+    sessions: list[LazySession] = []
+    get_test_db = app.dependency_overrides[get_db]
+
+    async def _get_recorded_db() -> AsyncGenerator[LazySession, None]:
+        db = LazySession(async_session_local)
+        sessions.append(db)
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    app.dependency_overrides[get_db] = _get_recorded_db
+    try:
+        assert (await new_user_client.get("/todos")).status_code == 200
+        assert (await new_user_client.get("/todos")).status_code == 200
+    finally:
+        app.dependency_overrides[get_db] = get_test_db
+
+    assert [db.is_opened for db in sessions] == [True, False]
@@ -0,0 +1,76 @@
+"""Тестирование пакетных операций с задачами."""
+import pytest
+from httpx import AsyncClient
+
+from core.config import TODO_BATCH_MAX_SIZE
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_batch_operations(new_user_client: AsyncClient):
+    """
+    Тестирование пакетного создания, обновления и удаления задач.
+    """
+    # Пакетное создание
+    response = await new_user_client.post("/todos:batch", json={"items": [
+        {"title": "Первая", "due_date": "2025-06-01"},
+        {"title": "Вторая", "description": "Описание"},
+        {"title": "Третья", "is_done": True},
+    ]})
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [201, 201, 201]
+    assert [result["todo"]["title"] for result in results] == ["Первая", "Вторая", "Третья"]
+    ids = [result["id"] for result in results]
+
+    # Пакетное обновление: у каждой задачи свой набор полей, одна задача не существует
+    response = await new_user_client.patch("/todos:batch", json={"items": [
+        {"id": ids[0], "is_done": True, "due_date": None},
+        {"id": ids[1], "title": "Вторая (изменена)"},
+        {"id": ids[2], "description": "Новое описание", "is_done": False},
+        {"id": 2 ** 31 - 1, "title": "Чужая"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [200, 200, 200, 404]
+
+    first, second, third = (result["todo"] for result in results[:3])
+    assert (first["title"], first["is_done"], first["due_date"]) == ("Первая", True, None)
+    assert (second["title"], second["description"], second["is_done"]) == \
+        ("Вторая (изменена)", "Описание", False)
+    assert (third["title"], third["description"], third["is_done"]) == \
+        ("Третья", "Новое описание", False)
+
+    # Пакетное удаление
+    response = await new_user_client.request("DELETE", "/todos:batch", json={
+        "ids": [ids[0], ids[1], 2 ** 31 - 1]
+    })
+    assert response.status_code == 200
+    assert [result["status_code"] for result in response.json()["results"]] == [204, 204, 404]
+
+    response = await new_user_client.get("/todos")
+    assert [todo["id"] for todo in response.json()["items"]] == [ids[2]]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("method, url, payload, detail", [
+    ("POST", "/todos:batch", {"items": []}, "Пакет не может быть пустым"),
+    ("POST", "/todos:batch", {"items": [{"title": "Задача"}] * (TODO_BATCH_MAX_SIZE + 1)},
+     f"Размер пакета не может превышать {TODO_BATCH_MAX_SIZE}"),
+    ("PATCH", "/todos:batch", {"items": [{"id": 1, "is_done": True}, {"id": 1, "title": "Задача"}]},
+     "ID задач в пакете не должны повторяться"),
+    ("PATCH", "/todos:batch", {"items": [{"id": 1, "title": None}]}, "'title' не может быть null"),
+    ("DELETE", "/todos:batch", {"ids": []}, "Пакет не может быть пустым"),
+])
+async def test_todo_batch_invalid_payload(
+    new_user_client: AsyncClient,
+    method: str,
+    url: str,
+    payload: dict[str, object],
+    detail: str
+):
+    """
+    Тестирование проверки пакета целиком до внесения изменений.
+    """
+    response = await new_user_client.request(method, url, json=payload)
+    assert response.status_code == 422
+    assert response.json() == {"detail": detail}
@@ -0,0 +1,69 @@
+"""Тестирование выгрузки задач."""
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from services.todos import get_todo_service
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_todos(new_user_client: AsyncClient, export_format: str):
+    """
+    Тестирование потоковой выгрузки задач.
+    """
+    response = await new_user_client.post("/todos:batch", json={"items": [
+        {"title": f"Задача {index}", "due_date": "2025-06-01" if index % 2 else None}
+        for index in range(30)
+    ]})
+    created = [result["todo"] for result in response.json()["results"]]
+
+    response = await new_user_client.get("/todos/export", params={"format": export_format})
+    assert response.status_code == 200
+
+    if export_format == "csv":
+        assert response.headers["content-type"].startswith("text/csv")
+        exported = list(csv.DictReader(io.StringIO(response.text)))
+        assert [int(row["id"]) for row in exported] == [todo["id"] for todo in created]
+        assert [row["due_date"] for row in exported] == [todo["due_date"] or "" for todo in created]
+    else:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert exported == created
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_todos_without_token(unauthorized_client: AsyncClient):
+    """
+    Тестирование выгрузки задач без токена.
+    """
+    response = await unauthorized_client.get("/todos/export")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_export_todos_by_chunks(
+    new_user_client: AsyncClient,
+    async_session_local: async_sessionmaker[AsyncSession]
+):
+    """
+    Тестирование выгрузки порциями серверного курсора.
+    """
+    items = [{"title": f"Задача {index}"} for index in range(20)]
+    response = await new_user_client.post("/todos:batch", json={"items": items})
+    assert response.status_code == 201
+
+    user_id = (await new_user_client.get("/auth/me")).json()["id"]
+
+    async with async_session_local() as session:
+        todo_service = get_todo_service(session)
+        chunks = [chunk async for chunk in todo_service.export_todos(user_id, fetch_size=7)]
+
+    lines = b"".join(chunks).splitlines()
+    assert len(lines) == 20
+    # Каждая порция строк отдаётся отдельной частью ответа
+    assert len(chunks) == 3
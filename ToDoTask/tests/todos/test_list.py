@@ -0,0 +1,143 @@
+"""Тестирование списка задач."""
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+
+async def create_todos(client: AsyncClient) -> list[dict[str, Any]]:
+    """Создание набора задач с разными сроками и статусами."""
+    todos: list[dict[str, Any]] = []
+    for index in range(25):
+        response = await client.post("/todos", json={
+            "title": f"Задача {index}",
+            "is_done": index % 2 == 0,
+            # Каждая пятая задача без срока, остальные - с повторяющимися сроками
+            "due_date": None if index % 5 == 0 else f"2025-06-{index % 3 + 1:02d}",
+        })
+        todos.append(response.json())
+
+    return todos
+
+
+def expected_order(todos: list[dict[str, Any]]) -> list[int]:
+    """Ожидаемый порядок выдачи: по сроку (без срока - в конце), затем по ID."""
+    return [todo["id"] for todo in sorted(
+        todos, key=lambda todo: (todo["due_date"] is None, todo["due_date"] or "", todo["id"])
+    )]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_list_todos_by_cursor(new_user_client: AsyncClient):
+    """
+    Тестирование постраничной выдачи по курсору.
+    """
+    todos = await create_todos(new_user_client)
+
+    received_ids: list[int] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        params: dict[str, Any] = {"limit": 10}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await new_user_client.get("/todos", params=params)
+        assert response.status_code == 200
+
+        received_ids.extend(todo["id"] for todo in response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert received_ids == expected_order(todos)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_list_todos_by_page(new_user_client: AsyncClient):
+    """
+    Тестирование режима совместимости page/limit.
+    """
+    todos = await create_todos(new_user_client)
+    order = expected_order(todos)
+
+    for page in (1, 2, 3):
+        response = await new_user_client.get("/todos", params={"page": page, "limit": 10})
+        assert response.status_code == 200
+        assert [todo["id"] for todo in response.json()["items"]] == order[(page - 1) * 10:page * 10]
+
+    response = await new_user_client.get("/todos", params={"page": 4, "limit": 10})
+    assert response.json() == {"items": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("filters", [
+    {"is_done": True},
+    {"is_done": False},
+    {"due_date": "2025-06-02"},
+    {"is_done": False, "due_date": "2025-06-03"},
+])
+async def test_list_todos_with_filters(new_user_client: AsyncClient, filters: dict[str, Any]):
+    """
+    Тестирование фильтрации списка задач.
+    """
+    todos = await create_todos(new_user_client)
+    matching = [todo for todo in todos if all(todo[key] == value for key, value in filters.items())]
+
+    received_ids: list[int] = []
+    cursor: str | None = None
+    while True:
+        params: dict[str, Any] = {"limit": 3, **filters}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await new_user_client.get("/todos", params=params)
+        received_ids.extend(todo["id"] for todo in response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    assert received_ids == expected_order(matching)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("params, detail", [
+    ({"cursor": "not-a-cursor"}, "Некорректный курсор"),
+    ({"cursor": "eyJkIjpudWxsLCJpIjoxfQ", "page": 2}, "Нельзя одновременно передавать cursor и page"),
+    ({"limit": 1000}, "'limit' Input should be less than or equal to 100"),
+])
+async def test_list_todos_invalid_params(
+    new_user_client: AsyncClient,
+    params: dict[str, Any],
+    detail: str
+):
+    """
+    Тестирование некорректных параметров списка задач.
+    """
+    response = await new_user_client.get("/todos", params=params)
+    assert response.status_code == 422
+    assert response.json() == {"detail": detail}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_list_todos_cache_is_invalidated_on_write(new_user_client: AsyncClient):
+    """
+    Тестирование сброса кэша списка задач при изменении задач.
+    """
+    response = await new_user_client.post("/todos", json={"title": "Первая"})
+    todo_id = response.json()["id"]
+
+    response = await new_user_client.get("/todos")
+    assert [todo["title"] for todo in response.json()["items"]] == ["Первая"]
+
+    await new_user_client.patch(f"/todos/{todo_id}", json={"title": "Изменённая"})
+    response = await new_user_client.get("/todos")
+    assert [todo["title"] for todo in response.json()["items"]] == ["Изменённая"]
+
+    await new_user_client.post("/todos", json={"title": "Вторая"})
+    response = await new_user_client.get("/todos")
+    assert [todo["title"] for todo in response.json()["items"]] == ["Изменённая", "Вторая"]
+
+    await new_user_client.delete(f"/todos/{todo_id}")
+    response = await new_user_client.get("/todos")
+    assert [todo["title"] for todo in response.json()["items"]] == ["Вторая"]
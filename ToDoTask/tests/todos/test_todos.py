@@ -0,0 +1,92 @@
+"""Тестирование CRUD операций задач."""
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_crud(new_user_client: AsyncClient):
+    """
+    Тестирование создания, получения, обновления и удаления задачи.
+    """
+    # Создание задачи
+    response = await new_user_client.post(
+        "/todos", json={"title": "Купить молоко", "due_date": "2025-06-01"}
+    )
+    assert response.status_code == 201
+    todo = response.json()
+    assert todo["title"] == "Купить молоко"
+    assert todo["description"] is None
+    assert todo["is_done"] is False
+    assert todo["due_date"] == "2025-06-01"
+
+    # Получение задачи
+    response = await new_user_client.get(f"/todos/{todo['id']}")
+    assert response.status_code == 200
+    assert response.json() == todo
+
+    # Частичное обновление задачи
+    response = await new_user_client.patch(f"/todos/{todo['id']}", json={"is_done": True})
+    assert response.status_code == 200
+    assert response.json()["is_done"] is True
+    assert response.json()["title"] == "Купить молоко"
+
+    # Полное обновление задачи
+    response = await new_user_client.put(
+        f"/todos/{todo['id']}", json={"title": "Купить хлеб", "description": "Белый"}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Купить хлеб"
+    assert response.json()["description"] == "Белый"
+    assert response.json()["is_done"] is False
+    assert response.json()["due_date"] is None
+
+    # Удаление задачи
+    response = await new_user_client.delete(f"/todos/{todo['id']}")
+    assert response.status_code == 204
+
+    response = await new_user_client.get(f"/todos/{todo['id']}")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Задача не найдена"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_invalid_data(new_user_client: AsyncClient):
+    """
+    Тестирование создания и обновления задачи с некорректными данными.
+    """
+    response = await new_user_client.post("/todos", json={"description": "Без заголовка"})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "'title' Field required"}
+
+    response = await new_user_client.post("/todos", json={"title": "Задача"})
+    todo_id = response.json()["id"]
+
+    response = await new_user_client.patch(f"/todos/{todo_id}", json={"title": None})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "'title' не может быть null"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_of_another_user(
+    new_user_client: AsyncClient,
+    first_example_user_client: AsyncClient
+):
+    """
+    Тестирование доступа к задаче другого пользователя.
+    """
+    response = await first_example_user_client.post("/todos", json={"title": "Чужая задача"})
+    todo_id = response.json()["id"]
+
+    assert (await new_user_client.get(f"/todos/{todo_id}")).status_code == 404
+    assert (await new_user_client.patch(f"/todos/{todo_id}", json={"is_done": True})).status_code == 404
+    assert (await new_user_client.delete(f"/todos/{todo_id}")).status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_todo_without_token(unauthorized_client: AsyncClient):
+    """
+    Тестирование доступа к задачам без токена.
+    """
+    assert (await unauthorized_client.get("/todos")).status_code == 401
+    assert (await unauthorized_client.post("/todos", json={"title": "Задача"})).status_code == 401
+    assert (await unauthorized_client.get("/todos/1")).status_code == 401